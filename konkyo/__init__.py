@@ -21,9 +21,14 @@ def create_entity(ent_class: Type[E], pos: tuple, *args,
     if ent_class is not Entity and '__init__' in ent_class.__dict__:
         raise ValueError(f'the class { ent_class.__name__ } is '
                          'not allowed to override the __init__ method.')
-    entity: E = ent_class(pos=pos, scene=scene, name=name)
-    entity.on_spawn(*args, **kwargs)
-    return entity
+    entity = scene.pool.acquire(ent_class)
+    if entity is None:
+        entity = ent_class(pos=pos, scene=scene, name=name)
+        entity.on_spawn(*args, **kwargs)
+    else:
+        entity._reuse(pos, name)
+        entity.on_acquire(*args, **kwargs)
+    return cast(E, entity)
 
 
 def create_component(cmp_class: Type[T], pos: tuple, *args,
@@ -57,14 +62,19 @@ def create_component(cmp_class: Type[T], pos: tuple, *args,
                                        ' a {}'.format(cmp_class.__name__))
         comp_args['scene'] = scene
 
-    component: T = cmp_class(**comp_args)
-    component.on_spawn(*args, **kwargs)
+    component = scene.pool.acquire(cmp_class) if scene is not None else None
+    if component is None:
+        component = cmp_class(**comp_args)
+        component.on_spawn(*args, **kwargs)
+    else:
+        component._reuse(pos, name, parent)
+        component.on_acquire(*args, **kwargs)
 
     if parent is not None:
         # add it to the parent's children
         parent.children.append(component)
 
-    return component
+    return cast(T, component)
 
 
 def collect_components(obj: Union[Entity, Component],
@@ -78,7 +88,6 @@ def collect_components(obj: Union[Entity, Component],
     Returns:
         List[Component]: a flat list of components
     """
-    components: List[Component] = []
     if isinstance(obj, Entity):
         root = obj.root_component
     elif isinstance(obj, Component):
@@ -87,10 +96,5 @@ def collect_components(obj: Union[Entity, Component],
         raise ValueError('can only collect components from '
                          'components or entities')
 
-    if include_self: components.append(root)
-
-    for child in root.children:
-        components.append(child)
-        components += collect_components(child, False)
-
-    return components
+    flat = root.flatten()
+    return list(flat) if include_self else list(flat[1:])
@@ -0,0 +1,104 @@
+"""
+Contains a builder that packs image assets into texture atlases.
+"""
+
+from __future__ import annotations
+
+from typing import List, Union
+
+from pyglet.gl import (glBindTexture, glTexParameteri, GL_TEXTURE_2D,
+                       GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER,
+                       GL_NEAREST)
+from pyglet.image import Texture
+from pyglet.image.atlas import TextureBin
+
+from konkyo.asset.image import ImageAsset
+from konkyo.asset.tileset import TilesetAsset
+
+
+class TextureAtlasBuilder:
+    """
+    Packs multiple image and tileset assets into a few large textures.
+
+    Once built, every added asset is re-pointed to its region of an atlas
+    (and every tileset re-slices its tiles from that region), so sprites
+    created from those assets all share the same texture and can be drawn
+    with a single texture bind.
+
+    Example:
+        builder = TextureAtlasBuilder()
+        builder.add(player_tileset, font_tileset, background_image)
+        builder.build()
+    """
+
+    def __init__(self, width: int = 2048, height: int = 2048,
+                 border: int = 1):
+        """
+        Create an atlas builder.
+
+        Args:
+            width (int, optional): the width of each atlas texture
+            height (int, optional): the height of each atlas texture
+            border (int, optional): the amount of blank pixels to leave
+                around each image, preventing neighbours from bleeding in
+        """
+        self.width = width
+        self.height = height
+        self.border = border
+
+        # the assets to pack
+        self._sources: List[ImageAsset] = []
+
+        # the atlas textures created by the last build
+        self.textures: List[Texture] = []
+
+    def add(self, *sources: Union[ImageAsset, TilesetAsset]):
+        """
+        Add image or tileset assets to be packed.
+
+        Args:
+            sources (ImageAsset): the assets to pack
+        """
+        for source in sources:
+            if not isinstance(source, ImageAsset):
+                raise ValueError('can only pack image or tileset assets')
+            if source not in self._sources:
+                self._sources.append(source)
+
+    def build(self) -> List[Texture]:
+        """
+        Pack all added assets and re-point them to their atlas regions.
+
+        Assets that are larger than an atlas texture are left untouched.
+
+        Returns:
+            List[Texture]: the atlas textures that were created
+        """
+        texture_bin = TextureBin(self.width, self.height)
+        max_w = texture_bin.texture_width - self.border * 2
+        max_h = texture_bin.texture_height - self.border * 2
+
+        # packing the tallest images first wastes the least space
+        sources = sorted(self._sources,
+                         key=lambda source: source.pyglet_image.height,
+                         reverse=True)
+
+        for source in sources:
+            image = source.pyglet_image
+            if image.width > max_w or image.height > max_h:
+                continue
+
+            source.pyglet_image = texture_bin.add(image, border=self.border)
+            if isinstance(source, TilesetAsset):
+                source._load_tiles()
+
+        self.textures = [atlas.texture for atlas in texture_bin.atlases]
+
+        # set the "nearest" filter once per atlas texture
+        for texture in self.textures:
+            glBindTexture(GL_TEXTURE_2D, texture.id)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        return self.textures
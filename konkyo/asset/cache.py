@@ -0,0 +1,178 @@
+"""
+Contains an on-disk cache of decoded tilesets.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from typing import Optional, Tuple
+
+from pyglet.image import ImageData
+
+from konkyo.asset.image import decode_image
+from konkyo.asset.tileset import TilesetAsset
+
+
+# magic, version, sheet width, sheet height, tile width, tile height,
+# amount of region values
+_header = struct.Struct('<4s6I')
+
+_MAGIC = b'KNKT'
+_VERSION = 1
+
+
+class TilesetCache:
+    """
+    Stores decoded tilesets as raw RGBA pixels in a directory.
+
+    The first time a tileset is loaded, its image is decoded as usual and
+    written to the cache together with its tile positions. Later loads
+    memory-map the cached file instead, skipping PNG decoding entirely.
+
+    Cache files are keyed by the source path, its modification time and the
+    tile size, so editing an image (or loading it with another tile size)
+    simply creates a new cache file.
+    """
+
+    def __init__(self, directory: str = '.cache/tilesets'):
+        """
+        Create a tileset cache.
+
+        Args:
+            directory (str, optional): the directory to store cache files in.
+                It is created when the first file is written.
+        """
+        self.directory = directory
+
+    def get_cache_path(self, path: str, tile_width: int,
+                       tile_height: int) -> str:
+        """
+        Return the path of the cache file for a tileset.
+
+        Args:
+            path (str): the path to the source image
+            tile_width (int): the width of each tile
+            tile_height (int): the height of each tile
+        """
+        key = '{}|{}|{}x{}'.format(os.path.abspath(path),
+                                   os.stat(path).st_mtime_ns,
+                                   tile_width, tile_height)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.bin')
+
+    def load_image_data(self, path: str, tile_width: int,
+                        tile_height: int = None
+                        ) -> Tuple[ImageData, Optional[array]]:
+        """
+        Return the decoded pixels and tile positions of a tileset, reading
+        them from the cache if possible and decoding the image otherwise.
+
+        This never touches OpenGL, so it can be called from any thread.
+
+        Args:
+            path (str): the path to the source image
+            tile_width (int): the width of each tile
+            tile_height (int, optional): the height of each tile
+
+        Returns:
+            Tuple[ImageData, array]: the sheet and the tile positions (None
+                when the tileset was not cached yet)
+        """
+        tile_height = tile_width if tile_height is None else tile_height
+        cache_path = self.get_cache_path(path, tile_width, tile_height)
+
+        cached = self._read(cache_path)
+        if cached is not None:
+            return cached
+
+        return decode_image(path), None
+
+    def load(self, path: str, tile_width: int,
+             tile_height: int = None) -> TilesetAsset:
+        """
+        Load a tileset through the cache.
+
+        Like `load_image_data()`, this never touches OpenGL.
+
+        Args:
+            path (str): the path to the source image
+            tile_width (int): the width of each tile
+            tile_height (int, optional): the height of each tile
+        """
+        tile_height = tile_width if tile_height is None else tile_height
+        image, regions = self.load_image_data(path, tile_width, tile_height)
+
+        tileset = TilesetAsset(image, tile_width, tile_height, regions)
+        if regions is None:
+            self.store(path, tileset)
+        return tileset
+
+    def store(self, path: str, tileset: TilesetAsset):
+        """
+        Write a tileset to the cache.
+
+        Args:
+            path (str): the path to the image the tileset was loaded from
+            tileset (TilesetAsset): the tileset, which must not have been
+                packed into an atlas
+        """
+        cache_path = self.get_cache_path(path, tileset.width, tileset.height)
+
+        image = tileset.pyglet_image.get_image_data()
+        pitch = image.width * 4
+        pixels = image.get_data('RGBA', pitch)
+        regions = tileset._regions
+
+        header = _header.pack(_MAGIC, _VERSION, image.width, image.height,
+                              tileset.width, tileset.height, len(regions))
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # write to a temporary file first so that a half-written file is
+        # never picked up by another process
+        temp_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+        with open(temp_path, 'wb') as file:
+            file.write(header)
+            file.write(array('I', regions).tobytes())
+            file.write(pixels)
+        os.replace(temp_path, cache_path)
+
+    def _read(self, cache_path: str
+              ) -> Optional[Tuple[ImageData, array]]:
+        """
+        Map a cache file, returning None if it is missing or invalid.
+        """
+        try:
+            file = open(cache_path, 'rb')
+        except FileNotFoundError:
+            return None
+
+        with file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _header.size:
+                return None
+
+            # copy-on-write, so the pixels can be wrapped without copying
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, width, height, _, _, count = \
+            _header.unpack_from(mapped)
+
+        pixels_offset = _header.size + count * 4
+        pixels_size = width * height * 4
+        if (magic != _MAGIC or version != _VERSION
+                or size != pixels_offset + pixels_size):
+            mapped.close()
+            return None
+
+        regions = array('I')
+        regions.frombytes(mapped[_header.size:pixels_offset])
+
+        pixels = (ctypes.c_ubyte * pixels_size).from_buffer(mapped,
+                                                            pixels_offset)
+        return ImageData(width, height, 'RGBA', pixels, width * 4), regions
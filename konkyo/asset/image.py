@@ -2,7 +2,44 @@
 Contains image-related assets.
 """
 
-from pyglet.image import AbstractImage, TileableTexture, load
+from pyglet.image import AbstractImage, ImageData, TileableTexture, load
+
+
+def decode_image(path: str) -> ImageData:
+    """
+    Decode an image file into RGBA pixels without uploading it to the GPU.
+
+    This never touches OpenGL, so it can be called from any thread.
+
+    Args:
+        path (str): the path to the image
+
+    Returns:
+        ImageData: the decoded image
+    """
+    image = load(path).get_image_data()
+    pitch = image.width * 4
+    return ImageData(image.width, image.height, 'RGBA',
+                     image.get_data('RGBA', pitch), pitch)
+
+
+def get_uv_rect(image: AbstractImage) -> tuple:
+    """
+    Return the area of its texture that an image covers.
+
+    Images that are not textures (or texture regions) cover their whole
+    texture once uploaded.
+
+    Args:
+        image (AbstractImage): the image
+
+    Returns:
+        tuple: the (u0, v0, u1, v1) texture coordinates of the image
+    """
+    tex_coords = getattr(image, 'tex_coords', None)
+    if tex_coords is None:
+        return (0.0, 0.0, 1.0, 1.0)
+    return (tex_coords[0], tex_coords[1], tex_coords[6], tex_coords[7])
 
 
 class ImageAsset():
@@ -18,6 +55,9 @@ class ImageAsset():
             path_or_image (str): the path to the image
         """
         self.pyglet_image: AbstractImage = None
+
+        # the tileset this image was sliced from, if any
+        self.sheet = None
         if type(path_or_image) is str:
             self.pyglet_image = load(path_or_image)
         elif isinstance(path_or_image, AbstractImage):
@@ -25,6 +65,13 @@ class ImageAsset():
         else:
             raise ValueError('image must be a path or a pyglet image')
 
+    @property
+    def uv_rect(self) -> tuple:
+        """
+        The (u0, v0, u1, v1) texture coordinates this image covers.
+        """
+        return get_uv_rect(self.pyglet_image)
+
 
 class TileableImageAsset():
     """
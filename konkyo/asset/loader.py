@@ -0,0 +1,181 @@
+"""
+Contains a loader that decodes assets in the background.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Deque, Optional, Tuple
+
+from konkyo.asset.image import ImageAsset, decode_image
+from konkyo.asset.tileset import TilesetAsset
+
+if TYPE_CHECKING:
+    from konkyo.asset.cache import TilesetCache
+
+
+class AssetLoader:
+    """
+    Loads image assets without blocking the main loop.
+
+    Images are decoded on a pool of worker threads. Decoded images are then
+    uploaded to the GPU on the main thread by `update()`, which is called
+    once per frame by the game and uploads at most `upload_budget` bytes per
+    call. Each load returns a Future that is resolved (and whose callbacks
+    run) on the main thread once the asset is ready to use, or once loading
+    it failed.
+    """
+
+    def __init__(self, workers: int = 4,
+                 upload_budget: int = 4 * 1024 * 1024,
+                 upload: bool = True, cache: TilesetCache = None):
+        """
+        Create an asset loader.
+
+        Args:
+            workers (int, optional): the amount of decoding threads.
+                Defaults to 4.
+            upload_budget (int, optional): the amount of bytes to upload to
+                the GPU per frame. At least one image is uploaded per frame.
+                Defaults to 4 MiB.
+            upload (bool, optional): if false, images are never uploaded to
+                the GPU (such as in headless games). Defaults to True.
+            cache (TilesetCache, optional): if given, tilesets are read from
+                (and written to) this cache instead of being decoded
+        """
+        self.upload_budget = upload_budget
+        self.upload = upload
+        self.cache = cache
+
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix='konkyo-loader')
+
+        # decodes in flight, in the order they were requested
+        self._pending: Deque[Tuple[Future, Future]] = deque()
+
+    def _submit(self, decode: Callable[[], ImageAsset],
+                callback: Callable[[Future], None] = None) -> Future:
+        result: Future = Future()
+        if callback is not None:
+            # the callback gets the future, so that it is told of errors too
+            result.add_done_callback(callback)
+
+        decoded = self._executor.submit(decode)
+        self._pending.append((decoded, result))
+        return result
+
+    def load_image(self, path: str,
+                   callback: Callable[[Future], None] = None) -> Future:
+        """
+        Load an image in the background.
+
+        Args:
+            path (str): the path to the image
+            callback (Callable, optional): called with the future once it
+                is resolved; `future.result()` raises if loading failed
+
+        Returns:
+            Future: resolves to the ImageAsset
+        """
+        return self._submit(lambda: ImageAsset(decode_image(path)), callback)
+
+    def load_tileset(self, path: str, tile_width: int,
+                     tile_height: int = None,
+                     callback: Callable[[Future], None] = None
+                     ) -> Future:
+        """
+        Load a tileset in the background.
+
+        Args:
+            path (str): the path to the image
+            tile_width (int): the width of each tile
+            tile_height (int, optional): the height of each tile
+            callback (Callable, optional): called with the future once it
+                is resolved; `future.result()` raises if loading failed
+
+        Returns:
+            Future: resolves to the TilesetAsset
+        """
+        def decode() -> TilesetAsset:
+            if self.cache is not None:
+                return self.cache.load(path, tile_width, tile_height)
+            return TilesetAsset(decode_image(path), tile_width, tile_height)
+
+        return self._submit(decode, callback)
+
+    @property
+    def pending(self) -> int:
+        """The amount of assets that are still loading."""
+        return len(self._pending)
+
+    def update(self):
+        """
+        Upload decoded images and resolve their futures.
+
+        This must be called from the main thread. Images are finished in the
+        order they were requested, until the upload budget is used up.
+        """
+        uploaded = 0
+
+        while self._pending and uploaded < self.upload_budget:
+            decoded, result = self._pending[0]
+            if not decoded.done():
+                break
+            self._pending.popleft()
+            uploaded += self._finish(decoded, result)
+
+    def wait(self, future: Future):
+        """
+        Finish a load now, blocking until it is decoded.
+
+        Loads requested before it are finished first, ignoring the upload
+        budget. This must be called from the main thread.
+
+        Args:
+            future (Future): a future returned by this loader
+
+        Returns:
+            the loaded asset
+        """
+        while not future.done() and self._pending:
+            decoded, result = self._pending.popleft()
+            wait((decoded,))
+            self._finish(decoded, result)
+        return future.result()
+
+    def _finish(self, decoded: Future, result: Future) -> int:
+        """
+        Upload a decoded image and resolve its future.
+
+        Returns:
+            int: the amount of bytes uploaded
+        """
+        error: Optional[BaseException] = decoded.exception()
+        if error is not None:
+            result.set_exception(error)
+            return 0
+
+        asset: ImageAsset = decoded.result()
+        uploaded = 0
+        if self.upload:
+            image = asset.pyglet_image
+            try:
+                image.get_texture()
+            except Exception as e:
+                result.set_exception(e)
+                return 0
+            uploaded = image.width * image.height * 4
+
+        result.set_result(asset)
+        return uploaded
+
+    def shutdown(self):
+        """
+        Stop the worker threads. Pending loads are cancelled.
+        """
+        for decoded, result in self._pending:
+            decoded.cancel()
+            result.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False)
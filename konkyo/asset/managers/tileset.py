@@ -1,35 +1,192 @@
+from __future__ import annotations
 
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict
+
+from konkyo.asset.loader import AssetLoader
 from konkyo.asset.tileset import TilesetAsset
 
+if TYPE_CHECKING:
+    from konkyo.asset.cache import TilesetCache
+
 
 class TilesetManager:
     """
     Stores multiple tilesets for easy access and to minimize
     loading the same tileset multiple times.
+
+    Tilesets are reference counted by the objects using them (see
+    `TilesetAsset.acquire()`). Once the memory used by all loaded tilesets
+    exceeds `max_bytes`, the least recently used tilesets that are no longer
+    referenced are unloaded. This is checked whenever a tileset is loaded
+    or released, including releases made directly on the tileset.
     """
 
-    def __init__(self):
-        self._tilesets = dict()
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024,
+                 default_size: int = 16, loader: AssetLoader = None,
+                 cache: TilesetCache = None):
+        """
+        Create a tileset manager.
+
+        Args:
+            max_bytes (int, optional): the amount of texture memory (in bytes)
+                loaded tilesets may use before unused ones are unloaded.
+                Defaults to 256 MiB.
+            default_size (int, optional): the tile size used when a tileset
+                is loaded without one. Defaults to 16.
+            loader (AssetLoader, optional): the loader used by
+                `load_async()`, usually `game.loader`
+            cache (TilesetCache, optional): if given, `load()` reads
+                tilesets from (and writes them to) this cache
+        """
+        self.max_bytes = max_bytes
+        self.default_size = default_size
+        self.loader = loader
+        self.cache = cache
+
+        # tilesets being loaded in the background
+        self._loading: Dict[str, Future] = {}
+
+        # loaded tilesets, from least to most recently used
+        self._tilesets: 'OrderedDict[str, TilesetAsset]' = OrderedDict()
+
+        # the memory (in bytes) used by all loaded tilesets
+        self.memory_used: int = 0
 
     def _get_path(self, name: str):
         return 'assets/{}.png'.format(name)
 
-    def load(self, name: str, size: int):
+    def load(self, name: str, size: int = None) -> TilesetAsset:
         """
         Load a tileset.
 
         Args:
             name (str): the name of the tileset
-            size (int): the width and height of each tile
+            size (int, optional): the width and height of each tile
+        """
+        if name in self._loading:
+            # finish the background load instead of loading it twice
+            self.loader.wait(self._loading[name])
+
+        tileset = self._tilesets.get(name)
+        if tileset is None:
+            size = self.default_size if size is None else size
+            path = self._get_path(name)
+            if self.cache is not None:
+                tileset = self.cache.load(path, size)
+            else:
+                tileset = TilesetAsset(path, size)
+            self._add(name, tileset)
+        else:
+            self._tilesets.move_to_end(name)
+        return tileset
+
+    def load_async(self, name: str, size: int = None) -> Future:
+        """
+        Load a tileset in the background.
+
+        Loading the same tileset again before it is done returns the same
+        future.
+
+        Args:
+            name (str): the name of the tileset
+            size (int, optional): the width and height of each tile
+
+        Returns:
+            Future: resolves to the TilesetAsset once it is stored
+        """
+        assert self.loader is not None, 'this manager has no asset loader'
+
+        if name in self._tilesets:
+            future: Future = Future()
+            future.set_result(self.load(name, size))
+            return future
+
+        if name in self._loading:
+            return self._loading[name]
+
+        def on_loaded(future: Future):
+            del self._loading[name]
+            if (not future.cancelled() and future.exception() is None
+                    and name not in self._tilesets):
+                self._add(name, future.result())
+
+        size = self.default_size if size is None else size
+        future = self.loader.load_tileset(self._get_path(name), size)
+        self._loading[name] = future
+        future.add_done_callback(on_loaded)
+        return future
+
+    def _add(self, name: str, tileset: TilesetAsset):
+        """
+        Store a loaded tileset, unloading unused ones if over budget.
         """
-        if name not in self._tilesets:
-            self._tilesets[name] = TilesetAsset(self._get_path(name), size)
+        # collect before storing it, so the new tileset is never unloaded
+        self.memory_used += tileset.memory_size
+        self.collect()
+        self._tilesets[name] = tileset
+        tileset.manager = self
 
-    def get(self, name: str) -> TilesetAsset:
+    def get(self, name: str, size: int = None) -> TilesetAsset:
         """
         Return a tileset, loading it if it wasn't already.
 
         Args:
             name (str): the name of the tileset
+            size (int, optional): the width and height of each tile
+        """
+        return self.load(name, size)
+
+    def acquire(self, name: str, size: int = None) -> TilesetAsset:
         """
-        return self._tilesets[name]
+        Return a tileset and mark it as used, so it is never unloaded
+        until it is released.
+
+        Args:
+            name (str): the name of the tileset
+            size (int, optional): the width and height of each tile
+        """
+        tileset = self.load(name, size)
+        tileset.acquire()
+        return tileset
+
+    def release(self, name: str):
+        """
+        Mark a tileset as no longer used by the caller.
+
+        Args:
+            name (str): the name of the tileset
+        """
+        # releasing the last reference lets the tileset collect
+        self._tilesets[name].release()
+
+    def unload(self, name: str):
+        """
+        Unload a tileset, even if it is still referenced.
+
+        Args:
+            name (str): the name of the tileset
+        """
+        tileset = self._tilesets.pop(name)
+        self.memory_used -= tileset.memory_size
+        tileset.manager = None
+        tileset.unload()
+
+    def collect(self):
+        """
+        Unload the least recently used unreferenced tilesets until the
+        memory used is within budget.
+        """
+        if self.memory_used <= self.max_bytes:
+            return
+
+        for name, tileset in list(self._tilesets.items()):
+            if tileset.ref_count == 0:
+                self.unload(name)
+                if self.memory_used <= self.max_bytes:
+                    break
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tilesets
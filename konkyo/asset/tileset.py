@@ -2,58 +2,134 @@
 from __future__ import annotations
 
 import pyglet
+from array import array
+from pyglet.image import TextureRegion
 from konkyo.asset.image import ImageAsset
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from konkyo.asset.managers.tileset import TilesetManager
     from konkyo.scene import Scene
 
 
 class TilesetAsset(ImageAsset):
 
-    def __init__(self, path: str, tile_width: int, tile_height: int = None):
+    def __init__(self, path: str, tile_width: int, tile_height: int = None,
+                 regions: array = None):
         """
         Loads an image as a sprite sheet.
 
+        Tiles are sliced from the sheet when they are first accessed.
+
             :param str path: The path to the image
             :param int w:    The width of each sprite
             :param int h:    The height of each sprite
+            :param array regions: The precomputed tile positions, if any
         """
         super().__init__(path)
 
-        # the list of subimages
-        self.tiles: List[ImageAsset] = []
-
         # if height is not given, use same value as width
         tile_height = tile_width if tile_height is None else tile_height
 
         self._height, self._width = tile_height, tile_width
+
+        # the (x, y) position of every tile in the sheet, flattened
+        self._regions: array = (self._compute_regions() if regions is None
+                                else regions)
+
+        # tiles that have been sliced so far, by index
+        self._tiles: Dict[int, ImageAsset] = {}
+
+        # the texture of the sheet, created when the first tile is sliced
+        self._texture = None
+
+        # the amount of objects (such as sprites) using this tileset
+        self.ref_count: int = 0
+
+        # the manager storing this tileset, told when it is no longer used
+        self.manager: Optional[TilesetManager] = None
+
+    def _compute_regions(self) -> array:
+        """
+        Compute the position of every tile in the sheet.
+
+        Tiles are numbered from the top-left of the sheet, row by row.
+        """
+        tile_width, tile_height = self._width, self._height
         width, height = self.pyglet_image.width, self.pyglet_image.height
 
+        regions = array('I')
         for j in range(height // tile_height - 1, -1, -1):
             for i in range(0, width // tile_width):
+                regions.append(i * tile_width)
+                regions.append(j * tile_height)
 
-                tile = self.pyglet_image.get_region(
-                    i * tile_width, j * tile_height,  # position of tile
-                    tile_width, tile_height           # size of tile
-                )
+        return regions
 
-                # set texture parameter to use "nearest" filter
-                tile.get_texture()
-                pyglet.gl.glTexParameteri(
-                    pyglet.gl.GL_TEXTURE_2D,
-                    pyglet.gl.GL_TEXTURE_MAG_FILTER,
-                    pyglet.gl.GL_NEAREST
-                )
+    def _get_texture(self):
+        """
+        Return the texture of the sheet, creating it on first use.
+        """
+        if self._texture is None:
+            texture = self.pyglet_image.get_texture()
+
+            # set texture parameters to use "nearest" filter once per sheet
+            gl = pyglet.gl
+            gl.glBindTexture(texture.target, texture.id)
+            gl.glTexParameteri(texture.target,
+                               gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+            gl.glTexParameteri(texture.target,
+                               gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+            gl.glBindTexture(texture.target, 0)
+
+            self._texture = texture
+        return self._texture
+
+    def _slice_tile(self, idx: int):
+        """
+        Return the texture region of a tile.
+        """
+        regions = self._regions
+        return self._get_texture().get_region(
+            regions[idx * 2], regions[idx * 2 + 1],  # position of tile
+            self._width, self._height                # size of tile
+        )
 
-                self.tiles.append(ImageAsset(tile))
+    def _load_tiles(self):
+        """
+        Re-slice the tiles that were already created.
+
+        This is called whenever the sheet image is replaced, such as when
+        it is packed into a texture atlas. Existing tiles are updated in place
+        so that references to them stay valid.
+        """
+        self._texture = None
+        for idx, tile in self._tiles.items():
+            tile.pyglet_image = self._slice_tile(idx)
+
+    @property
+    def tiles(self) -> List[ImageAsset]:
+        """
+        A list of every tile in this tileset.
+
+        This slices every tile, prefer `get_tile()` to access a few tiles.
+        """
+        return [self.get_tile(i) for i in range(self.length)]
+
+    @property
+    def regions(self) -> array:
+        """
+        The (x, y) position (in pixels) of every tile in the sheet,
+        flattened.
+        """
+        return self._regions
 
     @property
     def length(self):
         """
         Return the amount of tiles in this tileset.
         """
-        return len(self.tiles)
+        return len(self._regions) // 2
 
     @property
     def height(self):
@@ -67,7 +143,63 @@ class TilesetAsset(ImageAsset):
 
     def get_tile(self, key) -> ImageAsset:
         """ Retrieves an image from this sheet by index. """
-        return self.tiles[key]
+        if isinstance(key, slice):
+            return [self.get_tile(i) for i in range(*key.indices(self.length))]
+
+        length = self.length
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError('tile index out of range')
+
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._tiles[key] = ImageAsset(self._slice_tile(key))
+            tile.sheet = self
+        return tile
+
+    @property
+    def memory_size(self) -> int:
+        """
+        The size (in bytes) of this tileset's sheet as an RGBA texture.
+        """
+        return self.pyglet_image.width * self.pyglet_image.height * 4
+
+    def acquire(self):
+        """
+        Mark this tileset as being used by one more object.
+        """
+        self.ref_count += 1
+
+    def release(self):
+        """
+        Mark this tileset as being used by one less object.
+
+        Once no object uses it, its manager (if any) may unload it to stay
+        within its memory budget.
+        """
+        assert self.ref_count > 0, 'tileset was released too many times'
+        self.ref_count -= 1
+        if self.ref_count == 0 and self.manager is not None:
+            self.manager.collect()
+
+    def unload(self):
+        """
+        Free the sheet texture and all tiles sliced from it.
+
+        Textures shared with other assets (such as texture atlases) are
+        left alone. The tileset must not be used afterwards.
+        """
+        texture = self._texture
+        if texture is not None and not isinstance(texture, TextureRegion):
+            # Pyglet 2 has no `delete()`, and frees textures once they are
+            # garbage collected instead
+            delete = getattr(texture, 'delete', None)
+            if delete is not None:
+                delete()
+
+        self._texture = None
+        self._tiles.clear()
 
     def __getitem__(self, key) -> ImageAsset:
         """ Retrieves a sprite from this sprite sheet by index. """
@@ -80,4 +212,5 @@ class TilesetAsset(ImageAsset):
         Returns:
             List[ImageAsset]: a list of images
         """
-        yield from self.tiles
+        for i in range(self.length):
+            yield self.get_tile(i)
@@ -10,6 +10,22 @@ if typing.TYPE_CHECKING:
     from konkyo.game import Game
     from konkyo.scene import Scene
 
+# the binding point of the WindowBlock uniform block used by every shader
+WINDOW_BLOCK_BINDING = 0
+
+# the size (in bytes) of the WindowBlock uniform block (projection and view)
+WINDOW_BLOCK_SIZE = 2 * glm.sizeof(glm.mat4)
+
+# the WindowBlock of every camera (created when a camera is first armed)
+_window_blocks: typing.Optional[GLUniformSlots] = None
+
+
+def _get_window_blocks() -> GLUniformSlots:
+    global _window_blocks
+    if _window_blocks is None:
+        _window_blocks = GLUniformSlots(WINDOW_BLOCK_SIZE)
+    return _window_blocks
+
 
 class Camera:
     """
@@ -22,25 +38,50 @@ class Camera:
         """
         self._scene = None
 
+        # increases whenever the projection or view matrix changes
+        self.version: int = 0
+
+        # this camera's slot of the shared WindowBlock buffer
+        self._slot: typing.Optional[int] = None
+
+        # the (buffer generation, version) last uploaded to the slot
+        self._uploaded: typing.Optional[tuple] = None
+
     def arm(self):
         """
         Arm this camera.
 
         This method will modify the projection used by OpenGL.
         Any future draw calls will be rendered using this camera's projection
+
+        Every camera keeps its matrices in its own range of a shared uniform
+        buffer. They are only uploaded when they changed (see `version`);
+        otherwise arming a camera only binds its range.
         """
-        try:
-            proj = self.projection
-            view = self.view
-            buffer = GLUniformBuffer(1)
-
-            with buffer:
-                # overwrite first and second parts of buffer
-                buffer.sub_data(0,                    proj)
-                buffer.sub_data(glm.sizeof(glm.mat4), view)
-        except AttributeError:
+        if self._scene is None:
             raise AttributeError('must bind a scene first')
 
+        blocks = _get_window_blocks()
+        if self._slot is None:
+            self._slot = blocks.acquire()
+
+        state = (blocks.generation, self.version)
+        if state != self._uploaded:
+            offset = blocks.offset(self._slot)
+            with blocks.buffer as buffer:
+                buffer.sub_data(offset, self.projection)
+                buffer.sub_data(offset + glm.sizeof(glm.mat4), self.view)
+            self._uploaded = state
+
+        blocks.bind(self._slot, WINDOW_BLOCK_BINDING)
+
+    def invalidate(self):
+        """
+        Mark the projection or view matrix as changed, so that it is uploaded
+        the next time this camera is armed.
+        """
+        self.version += 1
+
     @property
     def projection(self) -> glm.mat4:
         """
@@ -48,6 +89,14 @@ class Camera:
         """
         raise NotImplementedError('not implemented')
 
+    @property
+    def rect(self) -> typing.Optional[tuple]:
+        """
+        Retrieve the (x0, y0, x1, y1) rectangle of the world visible through
+        this camera, or None if it is unknown.
+        """
+        return None
+
     @property
     def view(self) -> glm.mat4:
         """
@@ -82,11 +131,13 @@ class OrthoCamera(Camera):
     """
 
     def __init__(self, focus: tuple = (0, 0), zoom: float = 1.0):
+        super().__init__()
         self.zoom: float = zoom
         self._focus: Vector = Vector(focus)
 
         self._projection = glm.mat4(1.0)
         self._view = glm.mat4(1.0)
+        self._rect: typing.Optional[tuple] = None
 
     @property
     def focus(self) -> Vector:
@@ -111,11 +162,17 @@ class OrthoCamera(Camera):
         )
 
         self._projection = glm.ortho(*x_range, *y_range, -1, 1)
+        self._rect = (x_range[0], y_range[0], x_range[1], y_range[1])
+        self.invalidate()
 
     @property
     def projection(self):
         return self._projection
 
+    @property
+    def rect(self) -> typing.Optional[tuple]:
+        return self._rect
+
     @property
     def view(self):
         return self._view
@@ -138,22 +195,31 @@ class HUDCamera(Camera):
     """
 
     def __init__(self, zoom: float = 1.0):
+        super().__init__()
         self._zoom = zoom
         self._projection = glm.mat4(1.0)
         self._view = glm.mat4(1.0)
+        self._rect: typing.Optional[tuple] = None
 
     def bind_scene(self, scene: Scene):
         super().bind_scene(scene)
+        self._rect = (0, 0, scene.game.width / self._zoom,
+                      scene.game.height / self._zoom)
         self._projection = glm.ortho(
-            0, scene.game.width / self._zoom,
-            0, scene.game.height / self._zoom,
+            self._rect[0], self._rect[2],
+            self._rect[1], self._rect[3],
             -1, 1
         )
+        self.invalidate()
 
     @property
     def projection(self):
         return self._projection
 
+    @property
+    def rect(self) -> typing.Optional[tuple]:
+        return self._rect
+
     @property
     def view(self):
         return self._view
@@ -20,8 +20,10 @@ class FpsDisplay(BatchComponent):
         self._timer += delta
         if self._timer >= 1:
 
-            if delta > 0:
-                fps = str(round(1.0 / delta, 2))
+            # use the frame delta, as ticks may run at a fixed rate
+            frame_delta = self.scene.game.last_delta
+            if frame_delta > 0:
+                fps = str(round(1.0 / frame_delta, 2))
             else:
                 fps = str(0.0)
             self.text.text = f'FPS: { fps }'
@@ -104,6 +104,13 @@ class Shape2D(BatchComponent):
             new_points.append(point[1] + self.position.y)
         return new_points
 
+    @property
+    def bounds(self) -> tuple:
+        points = self.translated_points
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return (min(xs), min(ys), max(xs), max(ys))
+
     def flatten_points(self, points: list) -> list:
         """
         Get points of this shape as a flat list.
@@ -120,11 +127,19 @@ class Shape2D(BatchComponent):
         # points = self.translated_flat_points
         # print(points)
         # self.vertex_list.set_attribute_data(0, points)
-        self.vertex_list.vertices[:] = self.translated_flat_points
+        if self.is_visible and not self.is_culled:
+            self.vertex_list.vertices[:] = self.translated_flat_points
 
     def on_position_change(self):
         self.update_points()
 
+    def on_set_visible(self):
+        self.update_points()
+
+    def on_set_hidden(self):
+        # collapse every point into one so nothing is drawn
+        self.vertex_list.vertices[:] = [0] * (self.num_points * 2)
+
     def on_destroy(self):
         self.vertex_list.delete()
 
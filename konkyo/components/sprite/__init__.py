@@ -2,3 +2,4 @@
 from konkyo.components.sprite._sprite import Sprite
 from konkyo.components.sprite._sprite_text import SpriteText
 from konkyo.components.sprite._animations import AnimatedSprite
+from konkyo.components.sprite._sprite_pool import SpritePool, SpriteHandle
@@ -47,6 +47,7 @@ class AnimatedSprite(BatchComponent):
         """
         self._raw_frames = frames
         self.frames = [AnimationFrame(*tup) for tup in self._raw_frames]
+        self._acquire_frames(self.frames)
 
         # configure Sprite to display first frame
         self.sprite = self.create_component(Sprite, self.position,
@@ -65,6 +66,28 @@ class AnimatedSprite(BatchComponent):
 
         self.restart()
 
+    # the child sprite is pooled (or recreated) separately, so reusing an
+    # animated sprite is the same as spawning it
+    on_acquire = on_spawn
+
+    def on_release(self):
+        # the child sprite hides itself when it is released
+        self._release_frames(self.frames)
+
+    def on_destroy(self):
+        self._release_frames(self.frames)
+
+    @staticmethod
+    def _acquire_frames(frames: List[AnimationFrame]):
+        # keep the tilesets of every frame loaded, not only the one shown
+        for frame in frames:
+            Sprite._acquire_sheet(frame.image)
+
+    @staticmethod
+    def _release_frames(frames: List[AnimationFrame]):
+        for frame in frames:
+            Sprite._release_sheet(frame.image)
+
     @property
     def current_frame(self) -> AnimationFrame:
 
@@ -73,8 +96,11 @@ class AnimatedSprite(BatchComponent):
     def set_animation(self, frames: List[AnimationFrame]):
 
         if frames is not self._raw_frames:
+            old_frames = self.frames
             self._raw_frames = frames
             self.frames = [AnimationFrame(*tup) for tup in self._raw_frames]
+            self._acquire_frames(self.frames)
+            self._release_frames(old_frames)
             self.restart()
 
     def restart(self, starting_frame: int = 0):
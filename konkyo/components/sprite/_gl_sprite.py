@@ -6,14 +6,15 @@ from typing import TYPE_CHECKING, Optional
 
 from konkyo.utils.gl import *
 from konkyo.objects.component import BatchComponent
-from pyglet.graphics.shader import Shader, ShaderProgram
+from konkyo.graphics import shaders
+from pyglet.graphics.shader import ShaderProgram
 from konkyo.structs.vector import Vector
 
 if TYPE_CHECKING:
     from konkyo.asset.image import ImageAsset
 
 
-vert = Shader("""#version 420 core
+vertex_source = """#version 420 core
     in vec4 position;
     in vec4 color;
     in vec2 uv;
@@ -35,9 +36,9 @@ vert = Shader("""#version 420 core
         frag_color = color;
         frag_uv = uv;
     }
-""", 'vertex')
+"""
 
-frag = Shader("""#version 420 core
+fragment_source = """#version 420 core
     in vec4 frag_color;
     in vec2 frag_uv;
 
@@ -49,14 +50,19 @@ frag = Shader("""#version 420 core
     {
         out_color = texture(tex, frag_uv) * frag_color;
     }
-""", 'fragment')
+"""
 
-program = ShaderProgram(vert, frag)
+
+def get_program() -> ShaderProgram:
+    """
+    Return the sprite shader program, compiling it on first use.
+    """
+    return shaders.get_program(vertex_source, fragment_source)
 
 
 class SpriteGroup(pyglet.graphics.Group):
     def __init__(self, image: ImageAsset):
-        super().__init__(program)
+        super().__init__(get_program())
         self.image = image
 
     def set_state(self):
@@ -1,5 +1,9 @@
 
-from pyglet.graphics.shader import Shader, ShaderProgram
+from typing import Optional
+
+from pyglet.graphics.shader import ShaderProgram
+
+from konkyo.graphics.shaders import get_program
 
 vertex_source = """#version 420 core
 
@@ -67,8 +71,18 @@ fragment_source = """#version 420 core
     }
 """
 
-_vert_shader = Shader(vertex_source, 'vertex')
-_frag_shader = Shader(fragment_source, 'fragment')
 
-def make_program():
-    return ShaderProgram(_vert_shader, _frag_shader)
+# the palette sprite program, once linked
+_program: Optional[ShaderProgram] = None
+
+
+def make_program() -> ShaderProgram:
+    """
+    Return the palette sprite program.
+
+    The program is linked once and shared by every palette sprite.
+    """
+    global _program
+    if _program is None:
+        _program = get_program(vertex_source, fragment_source)
+    return _program
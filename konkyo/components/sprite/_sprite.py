@@ -3,12 +3,14 @@ from __future__ import annotations
 import pyglet
 
 from typing import TYPE_CHECKING, Optional
+from weakref import WeakValueDictionary
 
 from konkyo.components.shapes import Box2D
 from konkyo.objects.component import BatchComponent
 from konkyo.structs.vector import Vector
 import konkyo.utils.gl as gl
 from konkyo.graphics.palette import ColorPalette
+from konkyo.asset.image import get_uv_rect
 from konkyo.components.sprite._shaders import make_program
 
 if TYPE_CHECKING:
@@ -17,23 +19,58 @@ if TYPE_CHECKING:
 
 
 class _SpriteGroup(pyglet.sprite.SpriteGroup):
-    def __init__(self, image: ImageAsset, palette):
-        super().__init__(image.pyglet_image.get_texture(),
-                         pyglet.gl.GL_SRC_ALPHA,
-                         pyglet.gl.GL_ONE_MINUS_SRC_ALPHA,
-                         make_program())
+    """
+    A group that draws a texture through a color palette.
+
+    Groups are interned; use `_SpriteGroup.get()` so that every sprite with
+    the same texture, palette, blend mode and program shares one group, and
+    so costs only one state change when the batch is drawn.
+    """
+    _groups: WeakValueDictionary = WeakValueDictionary()
+
+    def __init__(self, texture, palette: ColorPalette,
+                 blend_src: int, blend_dest: int, program: ShaderProgram):
+        super().__init__(texture, blend_src, blend_dest, program)
+        self.img_texture = texture
         self.palette = palette
-        self.set_image(image)
-
-    def set_image(self, image: ImageAsset):
-        self.img_texture = image.pyglet_image.get_texture()
+        self._key = self._make_key(texture, palette, blend_src, blend_dest,
+                                   program)
 
+        # force nearest filter
         gl.glBindTexture(gl.GL_TEXTURE_2D, self.img_texture.id)
         gl.glTexParameteri(gl.GL_TEXTURE_2D,
                            gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
         gl.glTexParameteri(gl.GL_TEXTURE_2D,
                            gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
 
+    @staticmethod
+    def _make_key(texture, palette: ColorPalette, blend_src: int,
+                  blend_dest: int, program: ShaderProgram) -> tuple:
+        return (texture.id, palette.id.value, blend_src, blend_dest,
+                id(program))
+
+    @classmethod
+    def get(cls, image: ImageAsset, palette: ColorPalette,
+            blend_src: int = pyglet.gl.GL_SRC_ALPHA,
+            blend_dest: int = pyglet.gl.GL_ONE_MINUS_SRC_ALPHA
+            ) -> _SpriteGroup:
+        """
+        Return the group for an image and palette, creating it if needed.
+
+        Args:
+            image (ImageAsset): the image to draw
+            palette (ColorPalette): the palette to draw the image with
+        """
+        texture = image.pyglet_image.get_texture()
+        program = make_program()
+        key = cls._make_key(texture, palette, blend_src, blend_dest, program)
+
+        group = cls._groups.get(key)
+        if group is None:
+            group = cls(texture, palette, blend_src, blend_dest, program)
+            cls._groups[key] = group
+        return group
+
     def set_state(self):
         self.program.use_program()
 
@@ -44,7 +81,7 @@ class _SpriteGroup(pyglet.sprite.SpriteGroup):
         gl.glBindTexture(gl.GL_TEXTURE_2D, self.palette.id)
 
         gl.glEnable(gl.GL_BLEND)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glBlendFunc(self.blend_src, self.blend_dest)
 
     def unset_state(self):
         gl.glDisable(gl.GL_BLEND)
@@ -52,6 +89,14 @@ class _SpriteGroup(pyglet.sprite.SpriteGroup):
 
         self.program.stop_program()
 
+    def __eq__(self, other) -> bool:
+        return (self.__class__ is other.__class__
+                and self._key == other._key
+                and self.parent == other.parent)
+
+    def __hash__(self) -> int:
+        return hash((self._key, self.parent))
+
 
 class Sprite(BatchComponent):
 
@@ -67,7 +112,9 @@ class Sprite(BatchComponent):
                 as a color table for this sprite
         """
 
+        self._image_asset = image
         self._image = image.pyglet_image
+        self._acquire_sheet(image)
 
         anchor = anchor or (0, 0)
 
@@ -78,22 +125,22 @@ class Sprite(BatchComponent):
         print('using anchor {}, {}'.format(self._anchor_x, self._anchor_y))
 
         self._layer = layer
-        batch = self.scene.batch.pyglet_batch
+        headless = self.scene.batch.headless
 
         self.palette = palette
-        if self.palette:
-            self._group = _SpriteGroup(image, self.palette)
+        instanced = self.scene.batch.instancing is not None
+        if self.palette and not headless and not instanced:
+            self._group = _SpriteGroup.get(image, self.palette)
         else:
             self._group = None
 
-        self._sprite = pyglet.sprite.Sprite(
-            img=self._image,
-            batch=batch,
-            group=self._group
-        )
+        self._sprite = self.scene.batch.sprite(self._image, self._group,
+                                               palette=self.palette,
+                                               layer=layer)
 
-        # force nearest filter
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self._image.get_texture().id)
+        if not headless:
+            # force nearest filter
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self._image.get_texture().id)
         self.color = color
 
         if scale != 1:
@@ -108,28 +155,38 @@ class Sprite(BatchComponent):
         self._wireframe = None
 
         self.update_position()
+        self.update_tex_coords()
 
     @property
     def shaders(self) -> ShaderProgram:
         """
         Get the shader program used by this sprite.
+
+        Programs are shared between sprites, so uniforms set on it apply
+        to every sprite using the same program.
         """
         return self._sprite._group.program
 
     @property
     def image(self) -> ImageAsset:
-        return self._image
+        return self._image_asset
 
     @image.setter
     def image(self, image: ImageAsset):
-        self._image = image
+        self._acquire_sheet(image)
+        self._release_sheet(self._image_asset)
+        self._image_asset = image
+        self._image = image.pyglet_image
         # self._image.pyglet_image.anchor_x = self._anchor_x
         # self._image.pyglet_image.anchor_y = self._anchor_y
         if self._group:
-            self._group.set_image(image)
+            # switch to the shared group for the new texture
+            self._group = _SpriteGroup.get(image, self.palette)
+            self._sprite.group = self._group
         else:
             self._sprite.image = image.pyglet_image
         self.update_tex_coords()
+        self.update_bounds()
 
     @property
     def width(self) -> int:
@@ -139,6 +196,13 @@ class Sprite(BatchComponent):
     def height(self) -> int:
         return self._sprite.height
 
+    @property
+    def bounds(self) -> tuple:
+        pos = self._adjusted_position
+        x0, x1 = sorted((pos.x, pos.x + self.width))
+        y0, y1 = sorted((pos.y, pos.y + self.height))
+        return (x0, y0, x1, y1)
+
     @property
     def color(self) -> tuple:
         return self._sprite.color
@@ -160,18 +224,34 @@ class Sprite(BatchComponent):
             self.is_visible = True
 
     def set_tex_coords(self, s: tuple, t: tuple):
+        """
+        Set the texture coordinates of this sprite.
+
+        Coordinates are relative to the sprite's image, where (0, 1) spans
+        the whole image, even if the image is a region of a larger texture
+        such as a tileset sheet or a texture atlas.
+
+        Args:
+            s (tuple): the horizontal start and end coordinates
+            t (tuple): the vertical start and end coordinates
+        """
         assert isinstance(s, tuple) and isinstance(t, tuple)
         self._s = s
         self._t = t
         self.update_tex_coords()
 
     def update_tex_coords(self):
-        s, t = self._s, self._t
+        # map our image-relative coordinates to the image's texture region
+        u0, v0, u1, v1 = get_uv_rect(self._image)
+        du, dv = u1 - u0, v1 - v0
+        s0, s1 = u0 + self._s[0] * du, u0 + self._s[1] * du
+        t0, t1 = v0 + self._t[0] * dv, v0 + self._t[1] * dv
+
         self._sprite._vertex_list.tex_coords[:] = [
-            s[0], t[0], 0,
-            s[1], t[0], 0,
-            s[1], t[1], 0,
-            s[0], t[1], 0,
+            s0, t0, 0,
+            s1, t0, 0,
+            s1, t1, 0,
+            s0, t1, 0,
         ]
 
     def flip_x(self, flipped: Optional[bool] = None):
@@ -216,6 +296,7 @@ class Sprite(BatchComponent):
         self._sprite.scale_x = n
         self._sprite.scale_y = n
         self.update_position()
+        self.update_bounds()
 
     def set_scale_x(self, n: float):
         """
@@ -223,6 +304,7 @@ class Sprite(BatchComponent):
         """
         self._sprite.scale_x = n
         self.update_position()
+        self.update_bounds()
 
     def set_scale_y(self, n: float):
         """
@@ -230,6 +312,7 @@ class Sprite(BatchComponent):
         """
         self._sprite.scale_y = n
         self.update_position()
+        self.update_bounds()
 
     def on_position_change(self):
         self.update_position()
@@ -240,6 +323,58 @@ class Sprite(BatchComponent):
     def on_set_hidden(self):
         self._sprite.visible = False
 
+    @staticmethod
+    def _acquire_sheet(image: ImageAsset):
+        # keep the tileset of our image loaded while we use it
+        sheet = getattr(image, 'sheet', None)
+        if sheet is not None:
+            sheet.acquire()
+
+    @staticmethod
+    def _release_sheet(image: ImageAsset):
+        sheet = getattr(image, 'sheet', None)
+        if sheet is not None:
+            sheet.release()
+
+    def on_acquire(self, image: ImageAsset, scale: float = 1, layer: int = 0,
+                   color: tuple = (255, 255, 255),
+                   palette: ColorPalette = None, anchor: tuple = None):
+        """
+        Reuse this sprite (and its vertex list) for a new image.
+
+        Set `pooled = True` on a subclass to recycle its sprites.
+        """
+        if palette is not self.palette:
+            # the sprite's group depends on its palette, so start over
+            self.on_destroy()
+            self.on_spawn(image, scale, layer, color, palette, anchor)
+            return
+
+        self.image = image
+
+        anchor = anchor or (0, 0)
+        self._anchor_x = int(self._image.width * anchor[0])
+        self._anchor_y = int(self._image.height * anchor[1])
+
+        if layer != self._layer and self.scene.batch.instancing is not None:
+            self._sprite.layer = layer
+        self._layer = layer
+        self.color = color
+        self._sprite.update(scale=scale, scale_x=1, scale_y=1)
+
+        self.is_flipped_x = False
+        self.is_flipped_y = False
+        self._s, self._t = (0, 1), (0, 1)
+        self._wireframe = None
+
+        self.is_visible = True
+        self.update_position()
+        self.update_tex_coords()
+
+    def on_release(self):
+        self.is_visible = False
+
     def on_destroy(self):
+        self._release_sheet(self._image_asset)
         self._sprite.delete()
 
@@ -0,0 +1,285 @@
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+import pyglet
+
+from konkyo.objects.component import BatchComponent
+from konkyo.structs.vector import Vector, VectorArray
+from konkyo.components.sprite._gl_sprite import SpriteGroup
+from konkyo.utils.gl import copy_array
+
+if TYPE_CHECKING:
+    from konkyo.asset.image import ImageAsset
+
+
+class SpriteHandle:
+    """
+    A reference to one sprite in a SpritePool.
+
+    Setting a field writes straight into the pool's arrays; the vertex data
+    is rebuilt once per frame for the whole pool.
+    """
+    __slots__ = ('pool', 'index')
+
+    def __init__(self, pool: SpritePool, index: int):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def position(self) -> Vector:
+        """ The position of the sprite relative to the pool. """
+        x, y = self.pool.positions.data[self.index].tolist()
+        return Vector.of(x, y)
+
+    @position.setter
+    def position(self, position: tuple):
+        self.pool.positions.data[self.index] = tuple(position)
+        self.pool.invalidate()
+
+    @property
+    def scale(self) -> Vector:
+        """ The (x, y) scale of the sprite. """
+        x, y = self.pool.scales[self.index].tolist()
+        return Vector.of(x, y)
+
+    @scale.setter
+    def scale(self, scale):
+        self.pool.scales[self.index] = scale
+        self.pool.invalidate()
+
+    @property
+    def color(self) -> tuple:
+        """ The (r, g, b, a) color of the sprite, from 0 to 1. """
+        return tuple(self.pool.colors[self.index].tolist())
+
+    @color.setter
+    def color(self, color: tuple):
+        self.pool.colors[self.index, :len(color)] = color
+        self.pool.invalidate()
+
+    @property
+    def visible(self) -> bool:
+        return bool(self.pool.visible[self.index])
+
+    @visible.setter
+    def visible(self, visible: bool):
+        self.pool.visible[self.index] = visible
+        self.pool.invalidate()
+
+    def set_image(self, image: ImageAsset):
+        """
+        Show another image, which must be a region of the pool's texture
+        (such as a tile of the pool's tileset).
+
+        Args:
+            image (ImageAsset): the image to show
+        """
+        self.pool._set_image(self.index, image)
+
+    def release(self):
+        """
+        Return this sprite to the pool. The handle must not be used
+        afterwards.
+        """
+        self.pool.release(self)
+
+
+class SpritePool(BatchComponent):
+    """
+    Draws many sprites that share one texture using a single vertex list.
+
+    Sprites are not components; their fields are stored in numpy arrays
+    (positions, scales, colors, texture coordinates and visibility) which
+    are written to the vertex list in one go before the scene is drawn.
+    Use `spawn()` to get a handle to a free sprite, or change the arrays
+    directly for bulk updates (calling `invalidate()` afterwards).
+
+    Positions are relative to the pool's position.
+    """
+
+    def on_spawn(self, image: ImageAsset, capacity: int):
+        """
+        Create a sprite pool.
+
+        Args:
+            image (ImageAsset): the texture shared by every sprite (usually
+                a tileset)
+            capacity (int): the maximum amount of sprites
+        """
+        assert capacity > 0, 'capacity must be higher than 0'
+
+        self.image = image
+        self.capacity = capacity
+
+        # per-sprite fields
+        self.positions: VectorArray = VectorArray(capacity)
+        self.scales: np.ndarray = np.ones((capacity, 2), dtype=np.float32)
+        self.colors: np.ndarray = np.ones((capacity, 4), dtype=np.float32)
+        self.visible: np.ndarray = np.ones(capacity, dtype=bool)
+
+        # the (width, height) and (u0, v0, u1, v1) of each sprite's image
+        self.sizes: np.ndarray = np.empty((capacity, 2), dtype=np.float32)
+        self.uv_rects: np.ndarray = np.empty((capacity, 4), dtype=np.float32)
+        self.sizes[:] = (image.pyglet_image.width, image.pyglet_image.height)
+        self.uv_rects[:] = image.uv_rect
+
+        # true for sprites that were spawned and not released yet
+        self.alive: np.ndarray = np.zeros(capacity, dtype=bool)
+
+        # free sprite indices (the lowest index is used first)
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+        # true if the vertex data is out of date
+        self._stale = False
+
+        # headless scenes give a null vertex list, which only stores data
+        headless = self.scene.batch.headless
+        indices = (np.arange(capacity, dtype=np.uint32)[:, None] * 4
+                   + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32))
+        self._vertex_list = self.scene.batch.add_indexed(
+            capacity * 4, pyglet.gl.GL_TRIANGLES, indices.ravel().tolist(),
+            'position3f', 'color4f', 'uv2f',
+            group=None if headless else SpriteGroup(image)
+        )
+
+        # vertex data, laid out as the vertex list expects
+        self._vertices = np.zeros((capacity, 4, 3), dtype=np.float32)
+        self._vertex_colors = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._vertex_uvs = np.zeros((capacity, 4, 2), dtype=np.float32)
+
+    # -------------------------------------------------------------------------
+    # Sprites
+    # -------------------------------------------------------------------------
+
+    def spawn(self, pos: tuple = (0, 0), image: ImageAsset = None,
+              scale: float = 1, color: tuple = (1, 1, 1, 1)) -> SpriteHandle:
+        """
+        Show a sprite from the pool.
+
+        Args:
+            pos (tuple, optional): the position relative to the pool
+            image (ImageAsset, optional): a region of the pool's texture.
+                Defaults to the whole texture.
+            scale (float, optional): the scale of the sprite
+            color (tuple, optional): the (r, g, b, a) color of the sprite
+
+        Returns:
+            SpriteHandle: a handle to the sprite
+        """
+        if not self._free:
+            raise IndexError('sprite pool is full')
+        index = self._free.pop()
+
+        self.alive[index] = True
+        self.visible[index] = True
+        self.positions.data[index] = tuple(pos)
+        self.scales[index] = scale
+        self.colors[index] = 1
+        self.colors[index, :len(color)] = color
+        self._set_image(index, self.image if image is None else image)
+
+        return SpriteHandle(self, index)
+
+    def release(self, handle: SpriteHandle):
+        """
+        Hide a sprite and return it to the pool.
+
+        Args:
+            handle (SpriteHandle): the sprite to release
+        """
+        index = handle.index
+        assert handle.pool is self and self.alive[index], (
+            'sprite was already released')
+
+        self.alive[index] = False
+        self._free.append(index)
+        self._stale = True
+
+    def _set_image(self, index: int, image: ImageAsset):
+        self.sizes[index] = (image.pyglet_image.width,
+                             image.pyglet_image.height)
+        self.uv_rects[index] = image.uv_rect
+        self._stale = True
+
+    @property
+    def count(self) -> int:
+        """ The amount of sprites in use. """
+        return self.capacity - len(self._free)
+
+    def invalidate(self):
+        """
+        Rebuild the vertex data before the next frame is drawn.
+
+        Call this after changing the arrays directly.
+        """
+        self._stale = True
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def _write_vertices(self):
+        """
+        Write every sprite to the vertex list.
+        """
+        origin = self.position
+        pos = self.positions.data
+
+        # hidden and released sprites collapse into empty quads
+        shown = (self.visible & self.alive & self.is_visible)[:, None]
+        size = self.sizes * self.scales * shown
+
+        x0 = pos[:, 0] + origin.x
+        y0 = pos[:, 1] + origin.y
+        x1 = x0 + size[:, 0]
+        y1 = y0 + size[:, 1]
+
+        vertices = self._vertices
+        vertices[:, 0, 0] = x0
+        vertices[:, 0, 1] = y0
+        vertices[:, 1, 0] = x1
+        vertices[:, 1, 1] = y0
+        vertices[:, 2, 0] = x1
+        vertices[:, 2, 1] = y1
+        vertices[:, 3, 0] = x0
+        vertices[:, 3, 1] = y1
+
+        u0, v0, u1, v1 = self.uv_rects.T
+        uvs = self._vertex_uvs
+        uvs[:, 0, 0] = u0
+        uvs[:, 0, 1] = v0
+        uvs[:, 1, 0] = u1
+        uvs[:, 1, 1] = v0
+        uvs[:, 2, 0] = u1
+        uvs[:, 2, 1] = v1
+        uvs[:, 3, 0] = u0
+        uvs[:, 3, 1] = v1
+
+        self._vertex_colors[:] = self.colors[:, None, :]
+
+        vertex_list = self._vertex_list
+        copy_array(vertex_list.position, vertices)
+        copy_array(vertex_list.color, self._vertex_colors)
+        copy_array(vertex_list.uv, uvs)
+
+    def on_pre_render(self):
+        if self._stale and self._vertex_list is not None:
+            self._write_vertices()
+        self._stale = False
+
+    def on_position_change(self):
+        self._stale = True
+
+    def on_set_visible(self):
+        self._stale = True
+
+    def on_set_hidden(self):
+        self._stale = True
+
+    def on_destroy(self):
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+            self._vertex_list = None
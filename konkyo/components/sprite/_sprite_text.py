@@ -60,6 +60,7 @@ class SpriteText(BatchComponent):
 
         # the sprite sheet currently in use
         self.sheet: TilesetAsset = tileset
+        self.sheet.acquire()
 
         # the layer to draw this text
         self.layer: int = layer
@@ -127,6 +128,9 @@ class SpriteText(BatchComponent):
         # shift all sprites up to align (0, 0) at bottom left
         self.position += (0, (self.sheet.width + self.lineHeight) * -line)
 
+    def on_destroy(self):
+        self.sheet.release()
+
     def on_set_visible(self):
 
         for sprite in self.sprites:
@@ -1,6 +1,4 @@
 
-import pyglet
-
 from konkyo.objects.component import BatchComponent
 
 
@@ -9,12 +7,11 @@ class Text(BatchComponent):
     def on_spawn(self, text: str = ''):
 
         # FIXME: text spawning at z = -1?
-        self.pyglet_text = pyglet.text.Label(
+        self.pyglet_text = self.scene.batch.label(
             text,
             font_name='Consolas',
             font_size=12,
-            x=self.position.x, y=self.position.y,
-            batch=self.scene.batch.pyglet_batch
+            x=self.position.x, y=self.position.y
         )
         self.text = text
 
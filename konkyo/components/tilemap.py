@@ -0,0 +1,369 @@
+"""Contains a component that draws large grids of tiles."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from math import floor
+from typing import TYPE_CHECKING, Dict, Set, Tuple
+
+import numpy as np
+import pyglet
+
+from konkyo.asset.image import get_uv_rect
+from konkyo.components.sprite._gl_sprite import SpriteGroup
+from konkyo.objects.component import BatchComponent
+from konkyo.utils.gl import copy_array
+
+if TYPE_CHECKING:
+    from konkyo.asset.tileset import TilesetAsset
+
+# the (column, row) of a chunk
+ChunkKey = Tuple[int, int]
+
+# the tile index of empty cells
+EMPTY = -1
+
+
+class TileMap(BatchComponent):
+    """
+    Draws a grid of tiles from a tileset, split into square chunks.
+
+    Each chunk has its own vertex list, which is only created once the
+    chunk comes into the camera's view and only rebuilt when its tiles
+    change, so maps can be much larger than the screen. Chunks that leave
+    the view are collapsed rather than deleted, and the `cache_size` most
+    recently hidden ones are kept so that scrolling back reuses them.
+
+    Tiles are stored in `tiles`, a numpy array of tile indices indexed by
+    `[row, column]`, where row 0 is the bottom row. Cells set to `EMPTY`
+    (-1) are not drawn. The position of the map is its bottom-left corner.
+    """
+
+    def on_spawn(self, tileset: TilesetAsset, tiles, chunk_size: int = 16,
+                 color: tuple = (1, 1, 1, 1), cache_size: int = 64):
+        """
+        Create a tile map.
+
+        Args:
+            tileset (TilesetAsset): the tileset to draw tiles from
+            tiles: a 2D array (or nested lists) of tile indices
+            chunk_size (int, optional): the width and height (in tiles) of
+                a chunk. Defaults to 16.
+            color (tuple, optional): the (r, g, b, a) color of every tile,
+                from 0 to 1. Defaults to white.
+            cache_size (int, optional): the amount of chunks out of view
+                whose vertex lists are kept. Defaults to 64.
+        """
+        assert chunk_size > 0, 'chunk size must be higher than 0'
+        assert cache_size >= 0, 'cache size must not be negative'
+
+        self.tileset = tileset
+        self.tiles: np.ndarray = np.array(tiles, dtype=np.int32, ndmin=2)
+        self.chunk_size = chunk_size
+        self.color = tuple(color)
+        self.cache_size = cache_size
+
+        # the size (in pixels) of a tile
+        self.tile_width: int = tileset.width
+        self.tile_height: int = tileset.height
+
+        # the (u0, v0, u1, v1) texture coordinates of every tile
+        self._uvs: np.ndarray = self._compute_uvs()
+
+        # the vertex lists of chunks in view
+        self._chunks: Dict[ChunkKey, object] = {}
+
+        # the collapsed vertex lists of chunks out of view, from least to
+        # most recently hidden
+        self._hidden_chunks: 'OrderedDict[ChunkKey, object]' = OrderedDict()
+
+        # the vertex positions every built chunk was last written with, to
+        # restore collapsed chunks without rebuilding them
+        self._vertices: Dict[ChunkKey, np.ndarray] = {}
+
+        # chunks whose tiles changed since they were last built
+        self._dirty_chunks: Set[ChunkKey] = set()
+
+        headless = self.scene.batch.headless
+        self._group = None if headless else SpriteGroup(tileset)
+
+        tileset.acquire()
+
+    def _compute_uvs(self) -> np.ndarray:
+        """
+        Compute the texture coordinates of every tile in the tileset.
+        """
+        tileset = self.tileset
+        image = tileset.pyglet_image
+        u0, v0, u1, v1 = get_uv_rect(image)
+
+        # tile positions are relative to the sheet, which may itself be a
+        # region of a larger texture
+        du = (u1 - u0) / image.width
+        dv = (v1 - v0) / image.height
+        regions = np.array(tileset.regions, dtype=np.float32).reshape(-1, 2)
+
+        uvs = np.empty((len(regions), 4), dtype=np.float32)
+        uvs[:, 0] = u0 + regions[:, 0] * du
+        uvs[:, 1] = v0 + regions[:, 1] * dv
+        uvs[:, 2] = uvs[:, 0] + tileset.width * du
+        uvs[:, 3] = uvs[:, 1] + tileset.height * dv
+        return uvs
+
+    # -------------------------------------------------------------------------
+    # Tiles
+    # -------------------------------------------------------------------------
+
+    @property
+    def rows(self) -> int:
+        return self.tiles.shape[0]
+
+    @property
+    def columns(self) -> int:
+        return self.tiles.shape[1]
+
+    @property
+    def chunk_count(self) -> Tuple[int, int]:
+        """ The amount of (columns, rows) of chunks. """
+        size = self.chunk_size
+        return (-(-self.columns // size), -(-self.rows // size))
+
+    def get_tile(self, column: int, row: int) -> int:
+        """
+        Return the tile index of a cell.
+
+        Args:
+            column (int): the column of the cell
+            row (int): the row of the cell, from the bottom
+        """
+        return int(self.tiles[row, column])
+
+    def set_tile(self, column: int, row: int, tile: int):
+        """
+        Change the tile of a cell.
+
+        Args:
+            column (int): the column of the cell
+            row (int): the row of the cell, from the bottom
+            tile (int): the tile index, or `EMPTY`
+        """
+        self.tiles[row, column] = tile
+        size = self.chunk_size
+        self._dirty_chunks.add((column // size, row // size))
+
+    def set_tiles(self, column: int, row: int, tiles):
+        """
+        Change the tiles of a rectangle of cells.
+
+        Args:
+            column (int): the left column of the rectangle
+            row (int): the bottom row of the rectangle
+            tiles: a 2D array of tile indices, indexed by `[row, column]`
+        """
+        tiles = np.array(tiles, dtype=np.int32, ndmin=2)
+        rows, columns = tiles.shape
+        self.tiles[row:row + rows, column:column + columns] = tiles
+        self.invalidate(column, row, column + columns, row + rows)
+
+    def invalidate(self, column0: int = 0, row0: int = 0,
+                   column1: int = None, row1: int = None):
+        """
+        Rebuild the chunks covering a rectangle of cells before the next
+        frame is drawn. Defaults to the whole map.
+
+        Call this after changing `tiles` directly. If the tileset's texture
+        changed, call `refresh_uvs()` instead.
+
+        Args:
+            column0 (int, optional): the left column of the rectangle
+            row0 (int, optional): the bottom row of the rectangle
+            column1 (int, optional): the column after the right edge
+            row1 (int, optional): the row after the top edge
+        """
+        column1 = self.columns if column1 is None else column1
+        row1 = self.rows if row1 is None else row1
+
+        size = self.chunk_size
+        for cx in range(column0 // size, -(-column1 // size)):
+            for cy in range(row0 // size, -(-row1 // size)):
+                self._dirty_chunks.add((cx, cy))
+
+    def refresh_uvs(self):
+        """
+        Recompute the texture coordinates of every tile, and rebuild every
+        chunk before the next frame is drawn.
+
+        Call this after the tileset's texture changed (such as when it is
+        packed into an atlas).
+        """
+        self._uvs = self._compute_uvs()
+        self.invalidate()
+
+    # -------------------------------------------------------------------------
+    # Chunks
+    # -------------------------------------------------------------------------
+
+    @property
+    def visible_chunks(self) -> Set[ChunkKey]:
+        """
+        The chunks within the camera's view.
+        """
+        if not self.is_visible or self.is_culled:
+            return set()
+
+        columns, rows = self.chunk_count
+        rect = self.scene.camera.rect
+        if rect is None:
+            return {(cx, cy) for cx in range(columns) for cy in range(rows)}
+
+        origin = self.position
+        chunk_w = self.chunk_size * self.tile_width
+        chunk_h = self.chunk_size * self.tile_height
+        cx0 = max(floor((rect[0] - origin.x) / chunk_w), 0)
+        cy0 = max(floor((rect[1] - origin.y) / chunk_h), 0)
+        cx1 = min(floor((rect[2] - origin.x) / chunk_w), columns - 1)
+        cy1 = min(floor((rect[3] - origin.y) / chunk_h), rows - 1)
+
+        return {(cx, cy) for cx in range(cx0, cx1 + 1)
+                for cy in range(cy0, cy1 + 1)}
+
+    def build_chunk(self, key: ChunkKey) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the vertex positions and texture coordinates of a chunk.
+
+        Empty cells collapse into empty quads.
+
+        Args:
+            key (ChunkKey): the (column, row) of the chunk
+
+        Returns:
+            the (tiles, 4, 3) positions and (tiles, 4, 2) texture
+            coordinates, with tiles ordered row by row
+        """
+        size = self.chunk_size
+        column0, row0 = key[0] * size, key[1] * size
+        block = self.tiles[row0:row0 + size, column0:column0 + size]
+        rows, columns = np.indices(block.shape)
+
+        origin = self.position
+        shown = (block >= 0).ravel()
+        x0 = origin.x + (column0 + columns.ravel()) * self.tile_width
+        y0 = origin.y + (row0 + rows.ravel()) * self.tile_height
+        x1 = x0 + self.tile_width * shown
+        y1 = y0 + self.tile_height * shown
+
+        vertices = np.zeros((block.size, 4, 3), dtype=np.float32)
+        vertices[:, 0, 0] = x0
+        vertices[:, 0, 1] = y0
+        vertices[:, 1, 0] = x1
+        vertices[:, 1, 1] = y0
+        vertices[:, 2, 0] = x1
+        vertices[:, 2, 1] = y1
+        vertices[:, 3, 0] = x0
+        vertices[:, 3, 1] = y1
+
+        u0, v0, u1, v1 = self._uvs[np.where(shown, block.ravel(), 0)].T
+        uvs = np.empty((block.size, 4, 2), dtype=np.float32)
+        uvs[:, 0, 0] = u0
+        uvs[:, 0, 1] = v0
+        uvs[:, 1, 0] = u1
+        uvs[:, 1, 1] = v0
+        uvs[:, 2, 0] = u1
+        uvs[:, 2, 1] = v1
+        uvs[:, 3, 0] = u0
+        uvs[:, 3, 1] = v1
+
+        return vertices, uvs
+
+    def _show_chunk(self, key: ChunkKey):
+        vertex_list = self._hidden_chunks.pop(key, None)
+        if vertex_list is None:
+            vertex_list = self._create_chunk(key)
+            self._dirty_chunks.add(key)
+        elif key not in self._dirty_chunks:
+            copy_array(vertex_list.position, self._vertices[key])
+        self._chunks[key] = vertex_list
+
+    def _create_chunk(self, key: ChunkKey):
+        size = self.chunk_size
+        block = self.tiles[key[1] * size:(key[1] + 1) * size,
+                           key[0] * size:(key[0] + 1) * size]
+        count = block.size
+        indices = (np.arange(count, dtype=np.uint32)[:, None] * 4
+                   + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32))
+        vertex_list = self.scene.batch.add_indexed(
+            count * 4, pyglet.gl.GL_TRIANGLES, indices.ravel().tolist(),
+            'position3f', 'color4f', 'uv2f',
+            group=self._group
+        )
+        colors = np.empty((count * 4, 4), dtype=np.float32)
+        colors[:] = self.color
+        copy_array(vertex_list.color, colors)
+        return vertex_list
+
+    def _write_chunk(self, key: ChunkKey):
+        vertex_list = self._chunks[key]
+        vertices, uvs = self.build_chunk(key)
+        copy_array(vertex_list.position, vertices)
+        copy_array(vertex_list.uv, uvs)
+        self._vertices[key] = vertices
+
+    def _hide_chunk(self, key: ChunkKey):
+        vertex_list = self._chunks.pop(key)
+
+        # collapse every vertex into one so nothing is drawn
+        copy_array(vertex_list.position, np.zeros_like(self._vertices[key]))
+
+        hidden = self._hidden_chunks
+        hidden[key] = vertex_list
+        while len(hidden) > self.cache_size:
+            self._delete_chunk(*hidden.popitem(last=False))
+
+    def _delete_chunk(self, key: ChunkKey, vertex_list):
+        vertex_list.delete()
+        del self._vertices[key]
+        self._dirty_chunks.discard(key)
+
+    # -------------------------------------------------------------------------
+    # Events
+    # -------------------------------------------------------------------------
+
+    def on_pre_render(self):
+        visible = self.visible_chunks
+        shown = self._chunks.keys()
+
+        # show chunks first, so hiding others never evicts them
+        hidden = shown - visible
+        for key in visible - shown:
+            self._show_chunk(key)
+        for key in hidden:
+            self._hide_chunk(key)
+        for key in self._dirty_chunks & shown:
+            self._write_chunk(key)
+
+        # hidden chunks are rebuilt once they are shown again
+        self._dirty_chunks.intersection_update(self._hidden_chunks)
+
+    @property
+    def bounds(self) -> tuple:
+        x, y = self.position
+        return (x, y, x + self.columns * self.tile_width,
+                y + self.rows * self.tile_height)
+
+    def on_position_change(self):
+        self._dirty_chunks.update(self._chunks)
+        self._dirty_chunks.update(self._hidden_chunks)
+
+    def on_set_visible(self):
+        pass
+
+    def on_set_hidden(self):
+        # chunks are hidden on the next frame (see `visible_chunks`)
+        pass
+
+    def on_destroy(self):
+        for chunks in (self._chunks, self._hidden_chunks):
+            for key, vertex_list in chunks.items():
+                self._delete_chunk(key, vertex_list)
+            chunks.clear()
+        self.tileset.release()
@@ -10,6 +10,8 @@ from konkyo.camera import Camera, OrthoCamera, HUDCamera
 from konkyo.components.debug import FpsDisplay
 from konkyo.components.console import Console
 from konkyo.graphics import BatchRenderer
+from konkyo.asset.loader import AssetLoader
+from konkyo.profiler import Profiler
 from konkyo.utils.gl import *
 
 
@@ -38,12 +40,84 @@ class _FrameTimer:
         return self._delta
 
 
+class _FixedTimestep:
+    """
+    Splits elapsed frame time into a whole number of fixed-size ticks.
+    """
+
+    def __init__(self, tick_rate: float, max_substeps: int):
+        assert tick_rate > 0, 'tick rate must be higher than 0'
+        assert max_substeps > 0, 'max substeps must be higher than 0'
+
+        # the length (in seconds) of a single tick
+        self.step: float = 1.0 / tick_rate
+
+        # the maximum amount of ticks to run in a single frame
+        self.max_substeps: int = max_substeps
+
+        # time elapsed that has not been simulated yet
+        self._accum: float = 0.0
+
+    def advance(self, delta: float) -> int:
+        """
+        Add elapsed time and return the amount of ticks to simulate.
+
+        If more than `max_substeps` ticks are owed, the extra time is dropped
+        so that a long frame cannot cause an ever growing backlog of ticks.
+
+        Args:
+            delta (float): the time (in seconds) since the last frame
+        """
+        self._accum += delta
+
+        steps = int(self._accum // self.step)
+        if steps > self.max_substeps:
+            steps = self.max_substeps
+            self._accum %= self.step
+        else:
+            self._accum -= steps * self.step
+
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """
+        The fraction (between 0 and 1) of a tick that has elapsed since
+        the last simulated tick.
+        """
+        return self._accum / self.step
+
+
 class Game:
     """
     Manages the main game loop and gamestates.
+
+    A headless game has no window and renders nothing; it only updates its
+    scenes. On machines without a display, Pyglet's shadow window must also
+    be disabled before importing konkyo, either with
+    `pyglet.options['shadow_window'] = False` or by setting the environment
+    variable `PYGLET_SHADOW_WINDOW=0`.
     """
 
-    def __init__(self, *, width, height):
+    def __init__(self, *, width, height, tick_rate: float = None,
+                 max_substeps: int = 5, headless: bool = False,
+                 profile: bool = False):
+        """
+        Create a game.
+
+        Args:
+            width (int): the width of the window
+            height (int): the height of the window
+            tick_rate (float, optional): if given, scenes are updated at this
+                fixed rate (in ticks per second) independently of how often
+                frames are rendered. Defaults to one update per frame.
+            max_substeps (int, optional): the maximum amount of fixed ticks
+                to run in a single frame. Defaults to 5.
+            headless (bool, optional): if true, run without a window or any
+                rendering. Defaults to False.
+            profile (bool, optional): if true, record frame timings in
+                `profiler`. Defaults to False.
+        """
         # the currently loaded gamestate
         self.state: GameState = GameState(self)
 
@@ -60,9 +134,35 @@ class Game:
         # the time elapsed since the last frame
         self.last_delta: float = 0
 
-        self.window = pyglet.window.Window(width=width,
-                                           height=height,
-                                           vsync=False)
+        # the fixed tick scheduler (None to update once per frame)
+        self._timestep: typing.Optional[_FixedTimestep] = None
+        if tick_rate is not None:
+            self._timestep = _FixedTimestep(tick_rate, max_substeps)
+
+        # how far (between 0 and 1) the rendered frame is between the last
+        # tick and the next one; use this to interpolate positions
+        self.alpha: float = 1.0
+
+        # if true, scenes are updated but never rendered
+        self.headless: bool = headless
+
+        self.window: typing.Optional[pyglet.window.Window] = None
+        if not headless:
+            self.window = pyglet.window.Window(width=width,
+                                               height=height,
+                                               vsync=False)
+
+        # decodes assets in the background (textures are never uploaded in
+        # headless games)
+        self.loader: AssetLoader = AssetLoader(upload=not headless)
+
+        # records where the time of every frame goes (None unless profiling)
+        self.profiler: typing.Optional[Profiler] = (
+            Profiler() if profile else None)
+
+        # debug components (not created in headless games)
+        self.fps_disp: typing.Optional[FpsDisplay] = None
+        self.console: typing.Optional[Console] = None
 
         self._closed = False
 
@@ -72,7 +172,10 @@ class Game:
         """
         Logs a message into an internal console.
         """
-        self.console.log(message)
+        if self.console is None:
+            print(message)
+        else:
+            self.console.log(message)
 
     def create_scene(self,
                    scene_class: typing.Type[Scene] = None,
@@ -101,8 +204,13 @@ class Game:
         Args:
             delta (float): change in time from the last frame
         """
+        profiler = self.profiler
         for scene in self.scenes:
-            scene.render()
+            if profiler is None:
+                scene.render()
+            else:
+                with profiler.section('render: ' + scene.name):
+                    scene.render()
 
     def update_all_scenes(self, delta: float):
         """Update all scenes.
@@ -110,18 +218,74 @@ class Game:
         Args:
             delta (float): change in time from the last tick
         """
+        profiler = self.profiler
         for scene in self.scenes:
-            scene.update(delta)
+            if profiler is None:
+                scene.update(delta)
+            else:
+                with profiler.section('update: ' + scene.name):
+                    scene.update(delta)
+        self.flush_commands()
+
+    def flush_commands(self):
+        """Apply the spawns and destroys queued by every scene."""
+        for scene in self.scenes:
+            scene.flush_commands()
+
+    @property
+    def state_changes(self) -> int:
+        """The amount of batch state changes made by the last frame."""
+        return sum(scene.batch.state_changes for scene in self.scenes)
+
+    def tick(self, delta: float):
+        """Run the updates owed for a frame.
+
+        Without a tick rate, this updates all scenes once using the frame
+        delta. With a tick rate, this updates all scenes zero or more times
+        using the fixed tick length and sets `alpha` for interpolation.
+
+        Args:
+            delta (float): change in time from the last frame
+        """
+        self.last_delta = delta
+
+        if self._timestep is None:
+            self.update_all_scenes(delta)
+            return
+
+        step = self._timestep.step
+        for _ in range(self._timestep.advance(delta)):
+            self.update_all_scenes(step)
+
+        self.alpha = self._timestep.alpha
+
+    @property
+    def tick_length(self) -> typing.Optional[float]:
+        """The length (in seconds) of a fixed tick, or None if unused."""
+        if self._timestep is None:
+            return None
+        return self._timestep.step
+
+    def stop(self):
+        """Stop the main game loop, closing the window if there is one."""
+        self._closed = True
+        self.loader.shutdown()
+        if self.window is not None:
+            self.window.close()
 
     def start(self):
         """Open the main window and start the main game loop."""
 
+        if self.headless:
+            self._run_headless()
+            return
+
         pyglet.image.Texture.default_min_filter = pyglet.gl.GL_NEAREST
         pyglet.image.Texture.default_mag_filter = pyglet.gl.GL_NEAREST
 
         print('starting game...')
 
-        # manually bind WindowBlock buffer to 0
+        # manually bind WindowBlock buffer to 0 (until a camera is armed)
         GLUniformBuffer(1).set_binding_point(0)
 
         # add fps and console objects
@@ -134,25 +298,24 @@ class Game:
         def on_key_press(symbol, modifiers):
 
             if symbol is pyglet.window.key.ESCAPE:
-                self._closed = True
-                self.window.close()
+                self.stop()
 
             self.input.set_key(symbol, True)
 
-            [[
-                entity.on_key_press(symbol, modifiers)
-                for entity in scene.entities
-            ] for scene in self.scenes]
+            for scene in self.scenes:
+                with scene.deferred():
+                    for entity in scene.entities:
+                        entity.on_key_press(symbol, modifiers)
 
         @self.window.event
         def on_key_release(symbol, modifiers):
 
             self.input.set_key(symbol, False)
 
-            [[
-                entity.on_key_release(symbol, modifiers)
-                for entity in scene.entities
-            ] for scene in self.scenes]
+            for scene in self.scenes:
+                with scene.deferred():
+                    for entity in scene.entities:
+                        entity.on_key_release(symbol, modifiers)
 
         print('rendering %d scenes:' % len(self.scenes))
         for scene in self.scenes:
@@ -174,24 +337,72 @@ class Game:
         #         ("vertices2f", (0, 0, 0, 600, 100, 600, 100, 0)),
         #         ("colors3f", (1.0, 1.0, 1.0) * 4))
 
+        profiler = self.profiler
+
         while not self._closed:
 
             timer.tick()
+            if profiler is not None:
+                profiler.end_frame()
+                profiler.begin_frame()
 
             # fire any pyglet events
+            events_start = time.perf_counter()
             pyglet.clock.tick()
             self.window.switch_to()
             self.window.dispatch_events()
+            self.flush_commands()
+            if profiler is not None:
+                profiler.record('events', events_start, time.perf_counter())
 
             self.window.clear()
 
+            # finish any assets loaded in the background
+            self.loader.update()
+
             # update and render scenes
-            self.update_all_scenes(timer.delta)
+            self.tick(timer.delta)
             self.render_all_scenes()
             self._on_update(timer.delta)
             # batch.draw()
 
+            flip_start = time.perf_counter()
             self.window.flip()
+            if profiler is not None:
+                profiler.record('flip', flip_start, time.perf_counter())
+
+    def _run_headless(self):
+        """Run the game loop without a window or rendering.
+
+        With a tick rate, every iteration simulates exactly one tick without
+        waiting for real time to pass, so simulations run as fast as the CPU
+        allows. Otherwise, scenes are updated with the real frame delta.
+        """
+        print('starting headless game...')
+
+        timer = _FrameTimer()
+        step = self.tick_length
+        profiler = self.profiler
+
+        while not self._closed:
+
+            timer.tick()
+            if profiler is not None:
+                profiler.end_frame()
+                profiler.begin_frame()
+            self.loader.update()
+
+            if step is None:
+                self.tick(timer.delta)
+                self._on_update(timer.delta)
+            else:
+                self.last_delta = step
+                self.update_all_scenes(step)
+                self._on_update(step)
+
+            # nothing is rendered, so resolve moved components here
+            for scene in self.scenes:
+                scene.resolve_transforms()
 
     def event_listener(self, fn):
         self._on_update = fn
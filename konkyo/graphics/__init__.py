@@ -3,13 +3,14 @@ Contains classes relating to batch rendering using Pyglet.
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 import pyglet
 
 import glm
 from konkyo.utils.gl import *
-from konkyo.graphics.shaders import program
+from konkyo.graphics.shaders import get_program
+from konkyo.graphics.instancing import InstancedRenderer
 
 if TYPE_CHECKING:
     from konkyo.scene import Scene
@@ -42,18 +43,42 @@ class BatchRenderer:
     """
     A wrapper for Pyglet's Batch and OrderedGroup classes.
     """
-    def __init__(self, scene: Scene = None, group_count: int = 10):
+    # true for renderers that draw nothing (see `konkyo.graphics.null`)
+    headless = False
+
+    def __init__(self, scene: Scene = None, group_count: int = 10,
+                 instancing: bool = False):
         """
         Initialize a BatchRenderer.
+
+        Args:
+            scene (Scene, optional): the scene to render
+            group_count (int, optional): unused
+            instancing (bool, optional): if true, sprites are drawn as
+                instances (see `konkyo.graphics.instancing`). Defaults to
+                False.
         """
         self.pyglet_batch: pyglet.graphics.Batch = pyglet.graphics.Batch()
 
+        # draws instanced sprites (None if sprites are batched)
+        self.instancing: Optional[InstancedRenderer] = None
+        if instancing:
+            self.instancing = InstancedRenderer()
+
         if scene is None:
             width, height = 100, 100
         else:
             width, height = scene.game.width, scene.game.height
 
-        self._group = ShaderGroup(program, (0, width, 0, height))
+        self._group = ShaderGroup(get_program(), (0, width, 0, height))
+
+        # the amount of group state changes made by the last render; this is
+        # counted from the draw list of Pyglet's batch, which is private, and
+        # stays 0 if a Pyglet version does not have one
+        self.state_changes: int = 0
+
+        # the draw list `state_changes` was counted from
+        self._counted_draw_list = None
 
         # self.pyglet_groups: List[pyglet.graphics.OrderedGroup] = []
 
@@ -65,20 +90,51 @@ class BatchRenderer:
         Render this batch.
         """
         self.pyglet_batch.draw()
-
-    def add(self, count, mode, *data):
+        if self.instancing is not None:
+            self.instancing.render()
+
+        # the draw list is only rebuilt when groups change, so only
+        # recount state changes when it does
+        draw_list = getattr(self.pyglet_batch, '_draw_list', None)
+        if draw_list is not None and draw_list is not self._counted_draw_list:
+            self._counted_draw_list = draw_list
+            self.state_changes = sum(
+                1 for fn in draw_list
+                if getattr(fn, '__name__', None) == 'set_state'
+            )
+
+    def add(self, count, mode, *data, group=None):
         return self.pyglet_batch.add(
-            count, mode, self._group, *data)
+            count, mode, group or self._group, *data)
 
-    def add_indexed(self, count, mode, indices, *data):
+    def add_indexed(self, count, mode, indices, *data, group=None):
         return self.pyglet_batch.add_indexed(
-            count, mode, self._group, indices, *data)
+            count, mode, group or self._group, indices, *data)
 
     def group(self, order: int):
         return pyglet.graphics.Group(order=order)
 
     def get_sprite_group(self, image):
-        return SpriteShaderGroup(image.get_texture(), program)
+        return SpriteShaderGroup(image.get_texture(), get_program())
+
+    def sprite(self, img, group=None, palette=None,
+               layer: int = 0) -> pyglet.sprite.Sprite:
+        """
+        Create a Pyglet sprite in this batch.
+
+        If instancing is enabled, an instanced sprite (which ignores the
+        group, but is drawn on the given layer) is returned instead.
+        """
+        if self.instancing is not None:
+            return self.instancing.sprite(img, palette, layer)
+        return pyglet.sprite.Sprite(img=img, batch=self.pyglet_batch,
+                                    group=group)
+
+    def label(self, text: str = '', **kwargs) -> pyglet.text.Label:
+        """
+        Create a Pyglet label in this batch.
+        """
+        return pyglet.text.Label(text, batch=self.pyglet_batch, **kwargs)
 
     # @property
     # def groups(self) -> List[pyglet.graphics.Group]:
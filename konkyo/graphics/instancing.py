@@ -0,0 +1,563 @@
+"""
+Contains an instanced sprite renderer.
+
+Instead of four vertices (and six indices) per sprite, every sprite is a
+single instance record, and one unit quad is drawn once per record with
+`glDrawArraysInstanced`. Records are stored in numpy arrays laid out exactly
+like the GL instance buffer, so uploading them is a single copy.
+
+Instancing is enabled per scene (see `Scene.use_instancing`); scenes
+without it use the regular batched sprites.
+"""
+from __future__ import annotations
+
+from ctypes import byref, c_float, c_void_p
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from konkyo.utils.gl import *
+from konkyo.asset.image import get_uv_rect
+from konkyo.graphics.shaders import get_program
+
+if TYPE_CHECKING:
+    from pyglet.image import AbstractImage
+    from konkyo.graphics.palette import ColorPalette
+
+
+# the fields of an instance record, with their amount of floats
+INSTANCE_LAYOUT: Tuple[Tuple[str, int], ...] = (
+    ('translate', 2),    # the position of the sprite's origin
+    ('scale', 2),        # the size (in pixels) of the sprite
+    ('rotation', 1),     # the clockwise rotation (in degrees)
+    ('uv_rect', 4),      # the (u0, v0, u1, v1) texture region
+    ('color', 4),        # the (r, g, b, a) color, from 0 to 1
+    ('palette_row', 1),  # the palette row to use (-1 for no palette)
+)
+
+# the packed numpy layout of an instance record (14 floats, 56 bytes)
+INSTANCE_DTYPE = np.dtype([
+    (name, np.float32, (size,)) if size > 1 else (name, np.float32)
+    for name, size in INSTANCE_LAYOUT
+])
+
+# the default value of each field
+_DEFAULT_INSTANCE = ((0, 0), (1, 1), 0, (0, 0, 1, 1), (1, 1, 1, 1), -1)
+
+
+vertex_source = """#version 420 core
+    layout(location = 0) in vec2 position;
+    layout(location = 1) in vec2 translate;
+    layout(location = 2) in vec2 scale;
+    layout(location = 3) in float rotation;
+    layout(location = 4) in vec4 uv_rect;
+    layout(location = 5) in vec4 color;
+    layout(location = 6) in float palette_row;
+
+    out vec4 vertex_color;
+    out vec2 texture_coords;
+    flat out float vertex_palette_row;
+
+    layout(binding = 0) uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    void main()
+    {
+        float angle = -radians(rotation);
+        mat2 m_rotation = mat2(cos(angle), sin(angle),
+                               -sin(angle), cos(angle));
+        vec2 world = translate + m_rotation * (position * scale);
+
+        gl_Position = window.projection * window.view * vec4(world, 0.0, 1.0);
+        texture_coords = mix(uv_rect.xy, uv_rect.zw, position);
+        vertex_color = color;
+        vertex_palette_row = palette_row;
+    }
+"""
+
+fragment_source = """#version 420 core
+    in vec4 vertex_color;
+    in vec2 texture_coords;
+    flat in float vertex_palette_row;
+
+    out vec4 final_colors;
+
+    layout(binding = 0) uniform sampler2D sprite_texture;
+    layout(binding = 1) uniform sampler2D palette_texture;
+
+    void main()
+    {
+        vec4 color = texture(sprite_texture, texture_coords);
+        if (vertex_palette_row < 0.0)
+        {
+            final_colors = color * vertex_color;
+        }
+        else
+        {
+            float rows = float(textureSize(palette_texture, 0).y);
+            vec2 uv = vec2(color.x, (vertex_palette_row + 0.5) / rows);
+            final_colors = texture(palette_texture, uv) * vertex_color;
+        }
+    }
+"""
+
+
+class InstanceBuffer:
+    """
+    A growable array of instance records.
+
+    Records are kept packed at the start of the array (removing one moves
+    the last record into its place), so the first `len(buffer)` records can
+    be uploaded and drawn as they are. Records are referred to by ids,
+    which stay valid until they are removed.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Create an instance buffer.
+
+        Args:
+            capacity (int, optional): the initial amount of records
+        """
+        self.data: np.ndarray = np.zeros(capacity, dtype=INSTANCE_DTYPE)
+
+        # the id of the record in each row, and the row of each id
+        self._ids: List[int] = []
+        self._rows: Dict[int, int] = {}
+        self._next_id: int = 0
+
+        # true if the records changed since the last upload
+        self.dirty: bool = False
+
+    @property
+    def capacity(self) -> int:
+        return len(self.data)
+
+    @property
+    def records(self) -> np.ndarray:
+        """ A view of the records in use. """
+        return self.data[:len(self._ids)]
+
+    def add(self, record: tuple = _DEFAULT_INSTANCE) -> int:
+        """
+        Add a record.
+
+        Args:
+            record (tuple, optional): the value of every field, in the order
+                of `INSTANCE_LAYOUT`
+
+        Returns:
+            int: the id of the record
+        """
+        row = len(self._ids)
+        if row == len(self.data):
+            data = np.zeros(row * 2, dtype=INSTANCE_DTYPE)
+            data[:row] = self.data
+            self.data = data
+
+        instance_id = self._next_id
+        self._next_id += 1
+
+        self._ids.append(instance_id)
+        self._rows[instance_id] = row
+        self.data[row] = record
+        self.dirty = True
+        return instance_id
+
+    def set(self, instance_id: int, record: tuple):
+        """
+        Replace every field of a record.
+
+        Args:
+            instance_id (int): the id of the record
+            record (tuple): the value of every field
+        """
+        self.data[self._rows[instance_id]] = record
+        self.dirty = True
+
+    def get(self, instance_id: int) -> np.void:
+        """
+        Return a record. Its fields can be changed in place, after which
+        `dirty` must be set.
+
+        Args:
+            instance_id (int): the id of the record
+        """
+        return self.data[self._rows[instance_id]]
+
+    def remove(self, instance_id: int):
+        """
+        Remove a record.
+
+        Args:
+            instance_id (int): the id of the record
+        """
+        row = self._rows.pop(instance_id)
+        last_id = self._ids.pop()
+        if last_id != instance_id:
+            # move the last record into the hole
+            self.data[row] = self.data[len(self._ids)]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self.dirty = True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class InstanceBatch:
+    """
+    Draws the instance records of one texture (and palette) on one layer
+    with a single draw call.
+    """
+
+    def __init__(self, texture, palette: ColorPalette = None, layer: int = 0):
+        self.texture = texture
+        self.palette = palette
+        self.layer = layer
+        self.buffer = InstanceBuffer()
+        self.program = get_program(vertex_source, fragment_source)
+
+        self._vao = GLuint()
+        glGenVertexArrays(1, byref(self._vao))
+        glBindVertexArray(self._vao)
+
+        # the unit quad, drawn as a triangle strip
+        quad = (c_float * 8)(0, 0, 1, 0, 0, 1, 1, 1)
+        self._quad_vbo = GLuint()
+        glGenBuffers(1, byref(self._quad_vbo))
+        glBindBuffer(GL_ARRAY_BUFFER, self._quad_vbo)
+        glBufferData(GL_ARRAY_BUFFER, sizeof(quad), quad, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 0, c_void_p(0))
+
+        # the instance records, one per sprite
+        self._instance_vbo = GLuint()
+        glGenBuffers(1, byref(self._instance_vbo))
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+
+        stride = INSTANCE_DTYPE.itemsize
+        for location, (name, size) in enumerate(INSTANCE_LAYOUT, 1):
+            offset = INSTANCE_DTYPE.fields[name][1]
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE,
+                                  stride, c_void_p(offset))
+            glVertexAttribDivisor(location, 1)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        buffer = self.buffer
+        count = len(buffer)
+        if count == 0:
+            return
+
+        glBindVertexArray(self._vao)
+
+        if buffer.dirty:
+            records = buffer.records
+            glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+            glBufferData(GL_ARRAY_BUFFER, records.nbytes,
+                         records.ctypes.data, GL_DYNAMIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            buffer.dirty = False
+
+        self.program.use_program()
+
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.texture.id)
+        if self.palette is not None:
+            glActiveTexture(GL_TEXTURE1)
+            glBindTexture(GL_TEXTURE_2D, self.palette.id)
+            glActiveTexture(GL_TEXTURE0)
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        glDrawArraysInstanced(GL_TRIANGLE_STRIP, 0, 4, count)
+
+        glDisable(GL_BLEND)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glBindVertexArray(0)
+        self.program.stop_program()
+
+    def delete(self):
+        glDeleteBuffers(1, byref(self._quad_vbo))
+        glDeleteBuffers(1, byref(self._instance_vbo))
+        glDeleteVertexArrays(1, byref(self._vao))
+
+
+class InstancedRenderer:
+    """
+    Draws instanced sprites, using one draw call per texture, palette and
+    layer.
+
+    Layers are drawn from lowest to highest, but only order instanced
+    sprites among themselves: every instanced sprite is drawn after the
+    scene's batched shapes and text, whatever their layers.
+
+    A sprite's `palette_row` picks the row of its palette texture to look
+    colors up in. `ColorPalette` textures have a single row, so it only
+    matters for taller palette textures.
+    """
+
+    def __init__(self):
+        self._batches: Dict[tuple, InstanceBatch] = {}
+
+        # every batch, from the lowest layer to the highest
+        self._ordered: List[InstanceBatch] = []
+
+    def get_batch(self, texture, palette: ColorPalette = None,
+                  layer: int = 0) -> InstanceBatch:
+        """
+        Return the batch for a texture, palette and layer, creating it if
+        needed.
+        """
+        key = (layer, texture.id,
+               None if palette is None else palette.id.value)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = InstanceBatch(texture, palette,
+                                                       layer)
+            self._ordered = sorted(self._batches.values(),
+                                   key=lambda batch: batch.layer)
+        return batch
+
+    def sprite(self, img: AbstractImage, palette: ColorPalette = None,
+               layer: int = 0, palette_row: int = 0) -> InstancedSprite:
+        """
+        Create an instanced sprite.
+
+        Args:
+            img (AbstractImage): the image of the sprite
+            palette (ColorPalette, optional): the palette to draw it with
+            layer (int, optional): the layer to draw it on. Defaults to 0.
+            palette_row (int, optional): the row of the palette texture to
+                use. Defaults to 0.
+        """
+        return InstancedSprite(self, img, palette, layer, palette_row)
+
+    def render(self):
+        for batch in self._ordered:
+            batch.draw()
+
+
+class _TexCoords:
+    """
+    Accepts the 12 texture coordinates of a sprite's four vertices (as
+    written to a vertex list) and stores them as a uv rect.
+    """
+    __slots__ = ('sprite',)
+
+    def __init__(self, sprite: InstancedSprite):
+        self.sprite = sprite
+
+    def __setitem__(self, index, values):
+        self.sprite._uv_rect = (values[0], values[1], values[6], values[7])
+        self.sprite._write()
+
+
+class _InstanceVertexList:
+    """
+    Lets code written for vertex lists set the texture coordinates of an
+    instanced sprite.
+    """
+    __slots__ = ('tex_coords',)
+
+    def __init__(self, sprite: InstancedSprite):
+        self.tex_coords = _TexCoords(sprite)
+
+
+class InstancedSprite:
+    """
+    A stand-in for `pyglet.sprite.Sprite` that is drawn as one instance
+    record.
+    """
+
+    def __init__(self, renderer: InstancedRenderer, img: AbstractImage,
+                 palette: ColorPalette = None, layer: int = 0,
+                 palette_row: int = 0):
+        self._renderer = renderer
+        self._palette = palette
+        self._palette_row = palette_row
+        self._layer = layer
+        self._image = img
+
+        self._x, self._y = 0, 0
+        self._rotation = 0
+        self._scale, self._scale_x, self._scale_y = 1, 1, 1
+        self._color = (255, 255, 255)
+        self._opacity = 255
+        self._visible = True
+        self._uv_rect = get_uv_rect(img)
+
+        self._vertex_list = _InstanceVertexList(self)
+
+        self._batch: Optional[InstanceBatch] = renderer.get_batch(
+            img.get_texture(), palette, layer)
+        self._group = self._batch
+        self._id: int = self._batch.buffer.add(self._record())
+
+    def _record(self) -> tuple:
+        scale = self._scale if self._visible else 0
+        r, g, b = self._color
+        return (
+            (self._x, self._y),
+            (self._image.width * scale * self._scale_x,
+             self._image.height * scale * self._scale_y),
+            self._rotation,
+            self._uv_rect,
+            (r / 255, g / 255, b / 255, self._opacity / 255),
+            -1 if self._palette is None else self._palette_row,
+        )
+
+    def _write(self):
+        if self._batch is not None:
+            self._batch.buffer.set(self._id, self._record())
+
+    def _update_batch(self):
+        batch = self._renderer.get_batch(self._image.get_texture(),
+                                         self._palette, self._layer)
+        if batch is not self._batch:
+            # move our record to the batch of the new texture or layer
+            self._batch.buffer.remove(self._id)
+            self._batch = self._group = batch
+            self._id = batch.buffer.add(self._record())
+        else:
+            self._write()
+
+    @property
+    def image(self) -> AbstractImage:
+        return self._image
+
+    @image.setter
+    def image(self, img: AbstractImage):
+        self._image = img
+        self._uv_rect = get_uv_rect(img)
+        self._update_batch()
+
+    @property
+    def layer(self) -> int:
+        return self._layer
+
+    @layer.setter
+    def layer(self, layer: int):
+        self._layer = layer
+        self._update_batch()
+
+    @property
+    def palette_row(self) -> int:
+        return self._palette_row
+
+    @palette_row.setter
+    def palette_row(self, palette_row: int):
+        self._palette_row = palette_row
+        self._write()
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @x.setter
+    def x(self, x: float):
+        self._x = x
+        self._write()
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @y.setter
+    def y(self, y: float):
+        self._y = y
+        self._write()
+
+    @property
+    def rotation(self) -> float:
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, rotation: float):
+        self._rotation = rotation
+        self._write()
+
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale: float):
+        self._scale = scale
+        self._write()
+
+    @property
+    def scale_x(self) -> float:
+        return self._scale_x
+
+    @scale_x.setter
+    def scale_x(self, scale_x: float):
+        self._scale_x = scale_x
+        self._write()
+
+    @property
+    def scale_y(self) -> float:
+        return self._scale_y
+
+    @scale_y.setter
+    def scale_y(self, scale_y: float):
+        self._scale_y = scale_y
+        self._write()
+
+    @property
+    def color(self) -> tuple:
+        return self._color
+
+    @color.setter
+    def color(self, color: tuple):
+        self._color = tuple(color[:3])
+        self._write()
+
+    @property
+    def opacity(self) -> int:
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, opacity: int):
+        self._opacity = opacity
+        self._write()
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool):
+        self._visible = visible
+        self._write()
+
+    @property
+    def width(self) -> float:
+        return self._image.width * abs(self._scale_x * self._scale)
+
+    @property
+    def height(self) -> float:
+        return self._image.height * abs(self._scale_y * self._scale)
+
+    def update(self, x=None, y=None, rotation=None, scale=None,
+               scale_x=None, scale_y=None):
+        if x is not None: self._x = x
+        if y is not None: self._y = y
+        if rotation is not None: self._rotation = rotation
+        if scale is not None: self._scale = scale
+        if scale_x is not None: self._scale_x = scale_x
+        if scale_y is not None: self._scale_y = scale_y
+        self._write()
+
+    def delete(self):
+        if self._batch is not None:
+            self._batch.buffer.remove(self._id)
+            self._batch = None
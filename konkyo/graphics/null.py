@@ -0,0 +1,116 @@
+"""
+Contains render backends that draw nothing.
+
+These are used by headless games, where no window or GL context exists.
+They accept the same calls as their Pyglet counterparts so that components
+can be spawned, moved and destroyed without rendering anything.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from konkyo.scene import Scene
+
+
+class NullVertexList:
+    """
+    A vertex list that only stores the data written to it.
+    """
+    def __init__(self, count: int):
+        self.count = count
+
+    def __getattr__(self, name: str) -> list:
+        # create attributes (such as `vertices` or `colors`) on first access
+        # so that slice assignments like `colors[:] = ...` just work
+        if name.startswith('__'):
+            raise AttributeError(name)
+        attribute: list = []
+        setattr(self, name, attribute)
+        return attribute
+
+    def delete(self):
+        pass
+
+
+class NullSprite:
+    """
+    A stand-in for `pyglet.sprite.Sprite`.
+    """
+    def __init__(self, img, group=None):
+        self.image = img
+        self.group = group
+        self._group = group
+        self._vertex_list = NullVertexList(4)
+
+        self.x, self.y = 0, 0
+        self.scale, self.scale_x, self.scale_y = 1, 1, 1
+        self.color = (255, 255, 255)
+        self.opacity = 255
+        self.visible = True
+
+    @property
+    def width(self) -> float:
+        return self.image.width * abs(self.scale_x * self.scale)
+
+    @property
+    def height(self) -> float:
+        return self.image.height * abs(self.scale_y * self.scale)
+
+    def update(self, x=None, y=None, scale=None, scale_x=None, scale_y=None,
+               **kwargs):
+        if x is not None: self.x = x
+        if y is not None: self.y = y
+        if scale is not None: self.scale = scale
+        if scale_x is not None: self.scale_x = scale_x
+        if scale_y is not None: self.scale_y = scale_y
+
+    def delete(self):
+        pass
+
+
+class NullLabel:
+    """
+    A stand-in for `pyglet.text.Label`.
+    """
+    def __init__(self, text: str = '', x: float = 0, y: float = 0, **kwargs):
+        self.text = text
+        self.x, self.y = x, y
+
+    def delete(self):
+        pass
+
+
+class NullBatchRenderer:
+    """
+    A BatchRenderer that never touches OpenGL.
+    """
+    headless = True
+
+    def __init__(self, scene: Scene = None, group_count: int = 10,
+                 instancing: bool = False):
+        self.pyglet_batch = None
+        self.instancing = None
+        self.state_changes: int = 0
+
+    def render(self):
+        pass
+
+    def add(self, count, mode, *data, group=None):
+        return NullVertexList(count)
+
+    def add_indexed(self, count, mode, indices, *data, group=None):
+        return NullVertexList(count)
+
+    def group(self, order: int):
+        return None
+
+    def get_sprite_group(self, image):
+        return None
+
+    def sprite(self, img, group=None, palette=None,
+               layer: int = 0) -> NullSprite:
+        return NullSprite(img, group)
+
+    def label(self, text: str = '', **kwargs) -> NullLabel:
+        return NullLabel(text, **kwargs)
@@ -1,8 +1,14 @@
 """
-Simple shaders used for drawing polygons.
+Simple shaders used for drawing polygons, and a registry of shader programs.
+
+Programs are compiled on first use and cached by their sources, so every
+object using the same sources shares a single linked program.
 """
 
+from typing import Dict, Tuple
+
 from pyglet.gl import *
+from pyglet.graphics.shader import Shader, ShaderProgram
 import pyglet
 import glm
 
@@ -42,7 +48,61 @@ fragment_src = """#version 330 core
     }
 """
 
-_vert_shader = pyglet.graphics.shader.Shader(vertex_src, "vertex")
-_frag_shader = pyglet.graphics.shader.Shader(fragment_src, "fragment")
+# compiled shaders, keyed by (source, shader type)
+_shaders: Dict[Tuple[str, str], Shader] = {}
+
+# linked programs, keyed by (vertex source, fragment source); strings cache
+# their hash, so looking up the same source objects again is cheap
+_programs: Dict[Tuple[str, str], ShaderProgram] = {}
+
+
+def get_shader(source: str, shader_type: str) -> Shader:
+    """
+    Return a compiled shader, compiling it on first use.
+
+    Args:
+        source (str): the GLSL source of the shader
+        shader_type (str): the type of the shader ('vertex' or 'fragment')
+    """
+    key = (source, shader_type)
+    shader = _shaders.get(key)
+    if shader is None:
+        shader = _shaders[key] = Shader(source, shader_type)
+    return shader
+
+
+def get_program(vertex_source: str = vertex_src,
+                fragment_source: str = fragment_src) -> ShaderProgram:
+    """
+    Return a linked shader program, compiling and linking it on first use.
+
+    Compiling requires a GL context, so this is deferred until something is
+    actually rendered. Every call with the same sources returns the same
+    program. Defaults to the polygon shader program.
+
+    Args:
+        vertex_source (str): the GLSL source of the vertex shader
+        fragment_source (str): the GLSL source of the fragment shader
+    """
+    key = (vertex_source, fragment_source)
+    program = _programs.get(key)
+    if program is None:
+        program = _programs[key] = ShaderProgram(
+            get_shader(vertex_source, 'vertex'),
+            get_shader(fragment_source, 'fragment')
+        )
+    return program
+
+
+def program_count() -> int:
+    """
+    Return the amount of shader programs that have been linked.
+    """
+    return len(_programs)
+
 
-program = pyglet.graphics.shader.ShaderProgram(_vert_shader, _frag_shader)
+def __getattr__(name):
+    # keep `from konkyo.graphics.shaders import program` working
+    if name == 'program':
+        return get_program()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
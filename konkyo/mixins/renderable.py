@@ -32,6 +32,21 @@ class BatchRenderable:
     An object that requires a batched draw call from
     a Scene to be rendered.
     """
+    # true if `on_pre_render()` is defined (computed once for every subclass)
+    pre_renders: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.pre_renders = konkyo.utils.is_function_defined(cls.on_pre_render)
+
     def __init__(self, *args, scene: Scene, **kwargs):
         self.scene = scene
         super(BatchRenderable, self).__init__(*args, **kwargs)
+
+    def on_pre_render(self):
+        """
+        Called every frame before the scene's batch is drawn, if defined.
+
+        Use this to write pending changes to vertex lists once per frame.
+        """
+        pass
@@ -1,11 +1,46 @@
 
-from typing import Callable
+from enum import IntEnum
+from typing import Callable, Optional
+
+import konkyo.utils
+
+
+class UpdatePhase(IntEnum):
+    """
+    The phases of a scene update, in the order they run.
+    """
+    PRE_UPDATE = 0
+    UPDATE = 1
+    POST_UPDATE = 2
+    LATE_UPDATE = 3
 
 
 class Scriptable:
     """
     An object that can be updated per tick.
     """
+    # if true, destroyed objects of this class are kept and reused by their
+    # scene's pool (see `konkyo.objects.pool.ObjectPool`); batch components
+    # must then override `on_acquire()` and `on_release()`
+    pooled: bool = False
+
+    # true if `on_update()` is defined (computed once for every subclass)
+    updates: bool = False
+
+    # the phase in which `on_update()` is called
+    update_phase: UpdatePhase = UpdatePhase.UPDATE
+
+    # objects with a higher priority are updated first within their phase
+    update_priority: int = 0
+
+    # the name of the update group, which can be paused as a whole (see
+    # `Scene.set_group_enabled()`)
+    update_group: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.updates = konkyo.utils.is_function_defined(cls.on_update)
+
     def __init__(self, *args, **kwargs):
         super(Scriptable, self).__init__(*args, **kwargs)
 
@@ -32,6 +67,24 @@ class Scriptable:
         """
         pass
 
+    def on_acquire(self, *args, **kwargs):
+        """
+        Called instead of `on_spawn()` when a pooled object is reused.
+
+        It receives the same arguments as `on_spawn()`. By default, this
+        calls `on_spawn()`.
+        """
+        self.on_spawn(*args, **kwargs)
+
+    def on_release(self):
+        """
+        Called instead of `on_destroy()` when a pooled object is destroyed.
+
+        Pooled objects should hide themselves here, keeping any resources
+        they can reuse in `on_acquire()`.
+        """
+        pass
+
     @staticmethod
     def limit_rate(rate: float) -> Callable:
         """
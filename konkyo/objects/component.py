@@ -4,11 +4,13 @@
 from __future__ import annotations
 
 import inspect
-from typing import (List, Optional, Union,
+from collections import deque
+from typing import (Iterable, Iterator, List, Optional, Tuple, Union,
                     Type, TypeVar, Callable, TYPE_CHECKING)
 
 from konkyo.objects.base import GameObject, ScriptableObject
 from konkyo.mixins.nameable import Nameable
+from konkyo.mixins.scriptable import Scriptable
 from konkyo.mixins.renderable import Renderable, BatchRenderable
 from konkyo.structs.vector import Vector
 import konkyo
@@ -17,6 +19,34 @@ if TYPE_CHECKING:
     from konkyo.scene import Scene
 
 
+class _ChildList(list):
+    """
+    A list of child components that tells its owner whenever it changes.
+    """
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: Component, children: Iterable[Component] = ()):
+        super().__init__(children)
+        self._owner = owner
+
+
+def _notify_owner(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._owner._invalidate_order()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear',
+              'sort', 'reverse', '__setitem__', '__delitem__', '__iadd__'):
+    setattr(_ChildList, _name, _notify_owner(_name))
+
+
 class Component(ScriptableObject, Nameable):
     """
     Component is the base class for an object that defines behavior of
@@ -30,38 +60,201 @@ class Component(ScriptableObject, Nameable):
         Create a Component.
 
         Args:
-            pos (tuple): [description]
-            name (str): [description]
-            parent (Component, optional): [description]. Defaults to None.
+            pos (tuple): the initial world position of the component
+            name (str): the name of the component
+            parent (Component, optional): the parent of the component.
+                Defaults to None.
         """
         super().__init__(*args, pos=pos, name=name, **kwargs)
+        self._reset(pos, parent)
+
+    def _reset(self, pos: tuple, parent: Optional[Component]):
+        """
+        Reset the hierarchy and transform of this component.
+        """
+        self._pos = Vector(pos)
         self._parent: Optional[Component] = parent
-        self.children: List[Component] = []
+
+        # the cached depth-first order of this subtree (see `flatten()`)
+        self._flat: Optional[Tuple[Component, ...]] = None
+
+        self.children = []
+
+        # the position relative to the parent (or the world, if no parent)
+        self._local: Vector = (self._pos if parent is None
+                               else self._pos - parent.position)
+
+        # true if the cached world position (`_pos`) is out of date
+        self._dirty: bool = False
+
+        # true if `on_position_change()` will be called by the scene
+        self._pending: bool = False
+
+        # the cached top-most parent (None until first requested)
+        self._root: Optional[Component] = None
+
+        # the scene that resolves this component's transform, if any
+        self._owner_scene: Optional[Scene] = None
+
+    def _reuse(self, pos: tuple, name: str = None,
+               parent: Component = None):
+        """
+        Prepare a pooled component to be spawned again.
+        """
+        self.name = type(self).__name__ if name is None else name
+        self._reset(pos, parent)
 
     def add_component(self, *components: Component):
         """
         Add a child component to this component.
 
+        The components keep their world positions.
+
         Args:
             components (Component): the components to add
 
         """
-        self.children.append(*components)
+        for component in components:
+            component.parent = self
 
     def remove_component(self, *components: Component):
         """
         Remove a child component from this component.
 
+        The components keep their world positions.
+
         Args:
             components (Component): the components to remove
         """
-        self.children.remove(*components)
+        for component in components:
+            self.children.remove(component)
+            component._detach()
 
     def create_component(self, cmp_class: Type[konkyo.T],
                          pos: tuple = (0, 0), *args, **kwargs) -> konkyo.T:
         return konkyo.create_component(cmp_class, pos=pos, parent=self,
                                        *args, **kwargs)
 
+    # -------------------------------------------------------------------------
+    # Hierarchy
+    # -------------------------------------------------------------------------
+
+    @property
+    def children(self) -> List[Component]:
+        """
+        The child components of this component.
+        """
+        return self._children
+
+    @children.setter
+    def children(self, children: Iterable[Component]):
+        self._children = _ChildList(self, children)
+        self._invalidate_order()
+
+    def _invalidate_order(self):
+        """
+        Forget the cached order of every subtree containing this component.
+        """
+        component = self
+        while component is not None:
+            component._flat = None
+            component = component._parent
+
+    def iter_depth_first(self, include_self: bool = True
+                         ) -> Iterator[Component]:
+        """
+        Iterate over this component's subtree, visiting each component
+        before its children.
+
+        Args:
+            include_self (bool, optional): if true, start with this
+                component. Defaults to True.
+        """
+        stack = [self] if include_self else list(reversed(self._children))
+        while stack:
+            component = stack.pop()
+            yield component
+            stack.extend(reversed(component._children))
+
+    def iter_breadth_first(self, include_self: bool = True
+                           ) -> Iterator[Component]:
+        """
+        Iterate over this component's subtree, level by level.
+
+        Args:
+            include_self (bool, optional): if true, start with this
+                component. Defaults to True.
+        """
+        queue = deque([self] if include_self else self._children)
+        while queue:
+            component = queue.popleft()
+            yield component
+            queue.extend(component._children)
+
+    def flatten(self) -> Tuple[Component, ...]:
+        """
+        Return this component and all its descendants in depth-first order.
+
+        The result is cached until a component is added to or removed from
+        the subtree.
+        """
+        flat = self._flat
+        if flat is None:
+            flat = self._flat = tuple(self.iter_depth_first())
+        return flat
+
+    # -------------------------------------------------------------------------
+    # Transforms
+    # -------------------------------------------------------------------------
+
+    def _invalidate(self):
+        """
+        Mark the world position of this component and its children as out of
+        date.
+
+        Positions are recomputed when they are next read, and
+        `on_position_change()` is called once per frame by the scene (see
+        `Scene.resolve_transforms()`) no matter how often a component moved.
+        Components that are not in a scene are notified immediately.
+        """
+        stack = [self]
+        while stack:
+            component = stack.pop()
+
+            # the children of a dirty component are already dirty
+            if component._dirty and component is not self:
+                continue
+            component._dirty = True
+
+            if not component._pending:
+                scene = component._owner_scene
+                if scene is None:
+                    component.on_position_change()
+                else:
+                    component._pending = True
+                    scene._dirty_transforms.append(component)
+
+            stack.extend(component.children)
+
+    def _detach(self):
+        """
+        Clear the parent of this component, keeping its world position.
+        """
+        world = self.position
+        self._parent = None
+        self._local = world
+        self._clear_root()
+
+    def _clear_root(self):
+        """
+        Forget the cached root of this component and its children.
+        """
+        stack = [self]
+        while stack:
+            component = stack.pop()
+            component._root = None
+            stack.extend(component.children)
+
     # -------------------------------------------------------------------------
     # Properties
     # -------------------------------------------------------------------------
@@ -77,17 +270,25 @@ class Component(ScriptableObject, Nameable):
         return self._parent
 
     @parent.setter
-    def parent(self, parent: Component):
+    def parent(self, parent: Optional[Component]):
         """
         Set the parent Component of this Component.
 
+        The component keeps its world position.
+
         Args:
             parent (Component): the new parent Component
         """
-        if parent is not self._parent:  # run only if the parents are different
-            if self._parent is not None and self in self._parent.children:
-                parent.children.remove(self)  # remove self from old parent
+        if parent is self._parent:  # run only if the parents are different
+            return
+
+        if self._parent is not None and self in self._parent.children:
+            self._parent.children.remove(self)  # remove self from old parent
+        self._detach()
+
+        if parent is not None:
             self._parent = parent
+            self._local = self._local - parent.position
             if self not in parent.children:
                 parent.children.append(self)  # add self to new parent
 
@@ -99,8 +300,12 @@ class Component(ScriptableObject, Nameable):
         Returns:
             Vector: the world position of this component
         """
-
-        return GameObject.position.fget(self)  # type: ignore
+        if self._dirty:
+            parent = self._parent
+            self._pos = (self._local if parent is None
+                         else parent.position + self._local)
+            self._dirty = False
+        return self._pos
 
     @position.setter  # type: ignore
     def position(self, position: tuple):
@@ -108,17 +313,14 @@ class Component(ScriptableObject, Nameable):
         Overrides `GameObject.position` setter method
 
         Args:
-            position (tuple): the new position of this component
+            position (tuple): the new world position of this component
         """
-
-        a: Vector = self.position
-        b: Vector = Vector(position)
-
-        diff = b - a
-
-        GameObject.position.fset(self, b)  # type: ignore
-        for child in self.children:
-            child.position += diff
+        parent = self._parent
+        if parent is None:
+            self._local = Vector(position)
+        else:
+            self._local = Vector(position) - parent.position
+        self._invalidate()
 
     @property
     def local_position(self) -> Vector:
@@ -130,22 +332,23 @@ class Component(ScriptableObject, Nameable):
         Otherwise, it will be with respect to the parent of this component
         (local).
         """
-        if self.parent is None:
-            return self.position
-        else:
-            a = self.position
-            b = self.root.position
-            return Vector(a.x - b.x, a.y - b.y)
+        return self._local
+
+    @local_position.setter
+    def local_position(self, position: tuple):
+        self._local = Vector(position)
+        self._invalidate()
 
     @property
     def root(self) -> Component:
         """
         Retrieve the top-most parent in the component heirarchy.
         """
-        if self.parent is None:
-            return self
-        else:
-            return self.parent.root
+        root = self._root
+        if root is None:
+            parent = self._parent
+            root = self._root = self if parent is None else parent.root
+        return root
 
     # -------------------------------------------------------------------------
     # Events (to be overridden by subclasses)
@@ -173,6 +376,9 @@ class GameComponent(Component):
 
         self._is_visible = True
 
+        # true if the scene hides this component because it is off-screen
+        self._culled = False
+
     @property
     def is_visible(self) -> bool:
         return self._is_visible
@@ -181,14 +387,32 @@ class GameComponent(Component):
     def is_visible(self, visible: bool):
         if visible != self._is_visible:
             self._is_visible = visible
-            if visible:
-                self.on_set_visible()
-            else:
-                self.on_set_hidden()
+            if not self._culled:
+                if visible:
+                    self.on_set_visible()
+                else:
+                    self.on_set_hidden()
 
             for child in self.children:
                 child.is_visible = visible
 
+    @property
+    def is_culled(self) -> bool:
+        """
+        True if this component is hidden by its scene for being outside
+        of the camera's view. This is independent of `is_visible`.
+        """
+        return self._culled
+
+    def _set_culled(self, culled: bool):
+        if culled != self._culled:
+            self._culled = culled
+            if self._is_visible:
+                if culled:
+                    self.on_set_hidden()
+                else:
+                    self.on_set_visible()
+
     def on_set_visible(self):
         """
         Called when this component has become visible.
@@ -226,7 +450,18 @@ class BatchComponent(GameComponent, BatchRenderable):
     """
     A BatchComponent is a Component that is rendered using
     a batched render call from a Scene.
+
+    Pooled batch components (`pooled = True`) must override both
+    `on_release()` and `on_acquire()`: the defaults would leave them drawn
+    while pooled, and allocate new vertex lists on every reuse.
     """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.pooled and (cls.on_acquire is Scriptable.on_acquire
+                           or cls.on_release is Scriptable.on_release):
+            raise ValueError(f'the class { cls.__name__ } is pooled, so it '
+                             'must override on_acquire and on_release.')
+
     def __init__(self, *args, pos: tuple, name: str = None,
                  parent: Component = None, scene: Scene, **kwargs):
         """
@@ -242,6 +477,27 @@ class BatchComponent(GameComponent, BatchRenderable):
             pos=pos, name=name, parent=parent, scene=scene
         )
 
+    @property
+    def bounds(self) -> Optional[tuple]:
+        """
+        The (x0, y0, x1, y1) world-space box drawn by this component, used
+        to cull it when it is off-screen (see `Scene.use_culling`).
+
+        Components without bounds (the default) are never culled.
+        """
+        return None
+
+    def update_bounds(self):
+        """
+        Tell the scene that the bounds of this component changed.
+
+        Moving a component updates its bounds automatically; call this after
+        resizing it.
+        """
+        scene = self._owner_scene
+        if scene is not None and scene.use_culling:
+            scene._update_bounds(self)
+
     def create_component(self, cmp_class: Type[konkyo.T], pos: tuple, *args,
                          name: str = None,
                          **kwargs) -> konkyo.T:
@@ -34,6 +34,13 @@ class Entity(ScriptableObject, Nameable):
         # the root Component of this entity
         self.root_component: Component = Component(pos=pos, name='Root')
 
+    def _reuse(self, pos: tuple, name: str = None):
+        """
+        Prepare a pooled entity to be spawned again.
+        """
+        self.name = type(self).__name__ if name is None else name
+        self.root_component._reuse(pos, 'Root')
+
     def create_component(self, cmp_class: Type[konkyo.T],
                          pos: tuple = (0, 0), *args, **kwargs) -> konkyo.T:
         kwargs['scene'] = self.scene  # manually add scene
@@ -71,4 +78,5 @@ class Entity(ScriptableObject, Nameable):
             line_number: the line number to set
             message: the message to set that line to.
         """
-        self.scene.game.console.line(line_number, message)
+        if self.scene.game.console is not None:
+            self.scene.game.console.line(line_number, message)
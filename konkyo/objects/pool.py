@@ -0,0 +1,102 @@
+"""
+Contains a pool that recycles destroyed components and entities.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
+
+if TYPE_CHECKING:
+    from konkyo.mixins.scriptable import Scriptable
+
+
+class ObjectPool:
+    """
+    Keeps destroyed objects of pooled classes so they can be reused.
+
+    Only classes with `pooled = True` are kept. When such an object is
+    destroyed, its `on_release()` method is called instead of
+    `on_destroy()`, and the next spawn of the same class reuses it by
+    calling `on_acquire()` instead of `on_spawn()`. Pooled classes should
+    hide themselves on release and keep their resources (such as vertex
+    lists) to reconfigure on acquire.
+
+    Every scene has its own pool (see `Scene.pool`).
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Create an object pool.
+
+        Args:
+            max_size (int, optional): the maximum amount of objects kept
+                per class; objects destroyed past this are freed as usual.
+                Defaults to 1024.
+        """
+        self.max_size = max_size
+
+        # released objects, by class
+        self._free: Dict[type, List[Scriptable]] = {}
+
+    def acquire(self, cls: Type[Scriptable]) -> Optional[Scriptable]:
+        """
+        Take a released object of a class out of the pool.
+
+        The caller must reset the object and call its `on_acquire()`.
+
+        Args:
+            cls (Type[Scriptable]): the class of the object
+
+        Returns:
+            Scriptable: a released object, or None if there are none
+        """
+        free = self._free.get(cls)
+        if free:
+            return free.pop()
+        return None
+
+    def release(self, obj: Scriptable) -> bool:
+        """
+        Put an object into the pool, calling its `on_release()`.
+
+        Args:
+            obj (Scriptable): the object being destroyed
+
+        Returns:
+            bool: false if the object was not pooled, in which case it must
+                be destroyed as usual
+        """
+        cls = type(obj)
+        if not cls.pooled:
+            return False
+
+        free = self._free.setdefault(cls, [])
+        if len(free) >= self.max_size:
+            return False
+
+        obj.on_release()
+        free.append(obj)
+        return True
+
+    def count(self, cls: Type[Scriptable]) -> int:
+        """
+        Return the amount of released objects of a class.
+
+        Args:
+            cls (Type[Scriptable]): the class of the objects
+        """
+        return len(self._free.get(cls, ()))
+
+    def clear(self):
+        """
+        Destroy every object in the pool.
+        """
+        for free in self._free.values():
+            for obj in free:
+                on_destroy = getattr(obj, 'on_destroy', None)
+                if on_destroy is not None:
+                    on_destroy()
+        self._free.clear()
+
+    def __len__(self) -> int:
+        return sum(len(free) for free in self._free.values())
@@ -0,0 +1,280 @@
+"""
+Contains a profiler that measures where the time of every frame goes.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+
+class Profiler:
+    """
+    Records how long each part of every frame takes.
+
+    Timings are grouped by section name (such as `'events'` or
+    `'update: Scene'`), summed over each frame, and kept for the last
+    `history` frames so that rolling percentiles can be computed; frames in
+    which a known section did not run count as 0. The `on_update()` time of
+    every class (named `module.QualifiedName`) is recorded as well, along
+    with how many objects were updated.
+
+    Pass `profile=True` to `Game` to enable it; it is then available as
+    `game.profiler`.
+
+    Example:
+        stats = game.profiler.stats('frame')
+        print('p99 frame time: {:.2f} ms'.format(stats['p99'] * 1000))
+        game.profiler.export_chrome_trace('trace.json')
+    """
+
+    def __init__(self, history: int = 600, max_events: int = 100000):
+        """
+        Create a profiler.
+
+        Args:
+            history (int, optional): the amount of frames to compute
+                percentiles over. Defaults to 600.
+            max_events (int, optional): the maximum amount of trace events
+                kept; older events are dropped. Defaults to 100000.
+        """
+        assert history > 0, 'history must be higher than 0'
+
+        self.history = history
+
+        # the time all trace timestamps are relative to
+        self._origin: float = time.perf_counter()
+
+        # the time spent in every section during the current frame
+        self._frame: Dict[str, float] = {}
+
+        # the time and amount of calls of every class during the current
+        # frame
+        self._frame_classes: Dict[str, List[float]] = {}
+
+        # the per-frame time of every section, for the last frames
+        self._sections: Dict[str, Deque[float]] = {}
+
+        # the per-frame (time, calls) of every class, for the last frames
+        self._classes: Dict[str, Deque[Tuple[float, int]]] = {}
+
+        # the start of the current frame (None outside of a frame)
+        self._frame_start = None
+
+        # complete events for the Chrome trace: (name, category, start, end)
+        self._events: Deque[tuple] = deque(maxlen=max_events)
+
+        # the amount of frames recorded
+        self.frame_count: int = 0
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def begin_frame(self):
+        """
+        Start recording a frame.
+        """
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Stop recording a frame, storing its timings.
+        """
+        start = self._frame_start
+        if start is None:
+            return
+        self._frame_start = None
+        self.record('frame', start, time.perf_counter(), 'frame')
+
+        # sections that did not run this frame (such as updates on frames
+        # without a fixed tick) took no time, rather than being skipped
+        frame = self._frame
+        for name, frames in self._sections.items():
+            frames.append(frame.pop(name, 0.0))
+        for name, duration in frame.items():
+            self._sections[name] = deque((duration,), maxlen=self.history)
+        frame.clear()
+
+        frame_classes = self._frame_classes
+        for name, frames in self._classes.items():
+            duration, calls = frame_classes.pop(name, (0.0, 0))
+            frames.append((duration, int(calls)))
+        for name, (duration, calls) in frame_classes.items():
+            self._classes[name] = deque(((duration, int(calls)),),
+                                        maxlen=self.history)
+        frame_classes.clear()
+
+        self.frame_count += 1
+
+    def record(self, name: str, start: float, end: float,
+               category: str = 'section'):
+        """
+        Add the time spent in a section.
+
+        Args:
+            name (str): the name of the section
+            start (float): the `time.perf_counter()` at the start
+            end (float): the `time.perf_counter()` at the end
+            category (str, optional): the category shown in the trace
+        """
+        self._frame[name] = self._frame.get(name, 0.0) + (end - start)
+        self._events.append((name, category, start, end))
+
+    def record_update(self, cls: type, start: float, end: float,
+                      calls: int):
+        """
+        Add the time spent updating objects of a class.
+
+        Args:
+            cls (type): the class of the objects
+            start (float): the `time.perf_counter()` at the start
+            end (float): the `time.perf_counter()` at the end
+            calls (int): the amount of objects updated
+        """
+        # qualified, so that classes with the same name are kept apart
+        name = '{}.{}'.format(cls.__module__, cls.__qualname__)
+        bucket = self._frame_classes.get(name)
+        if bucket is None:
+            bucket = self._frame_classes[name] = [0.0, 0]
+        bucket[0] += end - start
+        bucket[1] += calls
+        self._events.append((name, 'on_update', start, end))
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        Time the code run inside this context.
+
+        Args:
+            name (str): the name of the section
+
+        Example:
+            with game.profiler.section('pathfinding'):
+                find_paths()
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    @property
+    def sections(self) -> List[str]:
+        """ The names of every recorded section. """
+        return list(self._sections)
+
+    def stats(self, name: str) -> Dict[str, float]:
+        """
+        Return statistics (in seconds) of a section's per-frame time over
+        the last frames.
+
+        Args:
+            name (str): the name of the section, or `'frame'` for the whole
+                frame
+
+        Returns:
+            Dict[str, float]: the `mean`, `max`, `p50`, `p95` and `p99`
+        """
+        frames = self._sections.get(name)
+        if not frames:
+            raise KeyError('no timings were recorded for "{}"'.format(name))
+        return _summarize(np.fromiter(frames, dtype=np.float64))
+
+    def class_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return statistics of the `on_update()` time of every class over the
+        last frames, slowest first.
+
+        Returns:
+            Dict[str, Dict[str, float]]: the statistics of `stats()` for
+                each class name, plus `calls`, the mean amount of objects
+                updated per frame
+        """
+        result = {}
+        for name, frames in self._classes.items():
+            times = np.fromiter((duration for duration, _ in frames),
+                                dtype=np.float64)
+            stats = _summarize(times)
+            stats['calls'] = sum(calls for _, calls in frames) / len(frames)
+            result[name] = stats
+        return dict(sorted(result.items(), key=lambda item: -item[1]['mean']))
+
+    def report(self) -> str:
+        """
+        Return a table of every section and class, in milliseconds.
+        """
+        lines = ['{:<32}{:>9}{:>9}{:>9}{:>9}'.format(
+            'section', 'mean', 'p50', 'p95', 'p99')]
+        rows = [(name, self.stats(name)) for name in self._sections]
+        rows += list(self.class_stats().items())
+        for name, stats in rows:
+            lines.append('{:<32}{:>9.3f}{:>9.3f}{:>9.3f}{:>9.3f}'.format(
+                name[-31:], *(stats[key] * 1000
+                              for key in ('mean', 'p50', 'p95', 'p99'))))
+        return '\n'.join(lines)
+
+    def reset(self):
+        """
+        Forget every timing and trace event.
+        """
+        self._frame.clear()
+        self._frame_classes.clear()
+        self._sections.clear()
+        self._classes.clear()
+        self._events.clear()
+        self.frame_count = 0
+
+    # -------------------------------------------------------------------------
+    # Trace
+    # -------------------------------------------------------------------------
+
+    def chrome_trace(self) -> dict:
+        """
+        Return the recorded events in the Chrome trace event format, which
+        can be opened with chrome://tracing or Perfetto.
+        """
+        origin = self._origin
+        events = [
+            {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': 0,
+                'tid': 0,
+            }
+            for name, category, start, end in self._events
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str):
+        """
+        Write the recorded events to a Chrome trace JSON file.
+
+        Args:
+            path (str): the path of the file
+        """
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
+
+
+def _summarize(times: np.ndarray) -> Dict[str, float]:
+    p50, p95, p99 = np.percentile(times, (50, 95, 99))
+    return {
+        'mean': float(times.mean()),
+        'max': float(times.max()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+    }
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Type, TypeVar, Union
+import time
+from contextlib import contextmanager
+from typing import (TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Set, Tuple, Type, TypeVar, Union)
 import pyglet
 
 import konkyo
 import konkyo.utils
 from konkyo.camera import OrthoCamera
 from konkyo.graphics import BatchRenderer
+from konkyo.graphics.null import NullBatchRenderer
+from konkyo.objects.pool import ObjectPool
+from konkyo.scene.spatial import SpatialHash
+from konkyo.structs.ordered_set import OrderedSet
 from konkyo.structs.vector import Vector
 from konkyo.mixins.nameable import Nameable
-from konkyo.mixins.renderable import Renderable
+from konkyo.mixins.renderable import Renderable, BatchRenderable
 from konkyo.mixins.scriptable import Scriptable
 from konkyo.objects.component import (Component, BatchComponent,
                                       RenderedComponent)
@@ -20,6 +27,14 @@ if TYPE_CHECKING:
     from konkyo.camera import Camera
     from konkyo.game import Game
     from konkyo.objects.entity import Entity
+    from konkyo.profiler import Profiler
+
+
+# the bucket of an updatable object: (phase, priority, group, class)
+_UpdateKey = Tuple[int, int, Optional[str], type]
+
+# the class of the objects in a bucket, and their bound `on_update()` methods
+_UpdateBucket = Tuple[type, Dict[Scriptable, Callable]]
 
 
 class Scene(Nameable):
@@ -29,7 +44,35 @@ class Scene(Nameable):
     A Scene manages a list of components and is responsible for rendering them.
     Internally, this uses a Batch provided by Pyglet. This reduces the amount
     of draw calls for all components in this Scene to one.
+
+    Set `use_instancing` to true in a subclass to draw sprites as instances
+    of a single quad instead (see `konkyo.graphics.instancing`).
+
+    Use `spatial` to find entities (but not components) near a position.
+
+    `entities` and `components` are ordered sets (see `OrderedSet`), not
+    lists: they keep the order objects were spawned in and can be indexed,
+    but cannot be sorted or changed in place. Use `sorted()` or `list()` to
+    get a list.
+
+    Set `use_culling` to true in a subclass to hide batched components that
+    are outside of the camera's view (see `BatchComponent.bounds`).
     """
+    # if true, sprites are drawn with instancing
+    use_instancing: bool = False
+
+    # the cell size of the spatial hash (see `spatial`)
+    spatial_cell_size: float = 64
+
+    # if true, batched components outside of the camera's view are hidden
+    use_culling: bool = False
+
+    # how far (in world units) outside of the camera's view components are
+    # still drawn
+    cull_margin: float = 64
+
+    # the cell size of the spatial hash of component bounds
+    cull_cell_size: float = 256
 
     def __init__(self, game: Game, name: str = None):
         """Construct a scene.
@@ -40,23 +83,77 @@ class Scene(Nameable):
 
         self.game: Game = game
 
-        # the batch to use to minimize draw calls
-        self.batch: BatchRenderer = BatchRenderer(self, 10)  # 10 layers
+        # the batch to use to minimize draw calls (10 layers)
+        batch_class = NullBatchRenderer if game.headless else BatchRenderer
+        self.batch: BatchRenderer = batch_class(
+            self, 10, instancing=self.use_instancing)
 
         # the camera to use to render this scene
         self.camera: Camera = None
 
-        # a list of entities
-        self.entities: List[Entity] = []
+        # the entities in the scene
+        self.entities: OrderedSet[Entity] = OrderedSet()
+
+        # all components in the scene
+        self.components: OrderedSet[Component] = OrderedSet()
+
+        # objects that need draw calls
+        self._renderable_components: OrderedSet[Renderable] = OrderedSet()
+
+        # objects that need a call before the batch is drawn
+        self._pre_render_components: OrderedSet[BatchRenderable] = \
+            OrderedSet()
+
+        # the bound `on_update()` methods of objects that need update calls,
+        # bucketed by phase, priority, update group and class
+        self._update_buckets: Dict[_UpdateKey, Dict[Scriptable, Callable]] = {}
 
-        # a list of all components in the scene
-        self.components: List[Component] = []
+        # the bucket of every updatable object
+        self._update_keys: Dict[Scriptable, _UpdateKey] = {}
 
-        # a list of objects that need draw calls
-        self._renderable_components: List[Renderable] = []
+        # the (class, bucket) of enabled groups, in update order (None if
+        # outdated)
+        self._update_order: Optional[List[_UpdateBucket]] = None
 
-        # a list of objects that need update calls
-        self._updatable_objects: List[Scriptable] = []
+        # the update groups that are paused
+        self._disabled_groups: Set[str] = set()
+
+        # destroyed objects of pooled classes, kept for reuse
+        self.pool: ObjectPool = ObjectPool()
+
+        # while above 0, spawns and destroys are queued (see `deferred()`)
+        self._defer_depth: int = 0
+
+        # entities and components spawned while deferring
+        self._spawned_entities: List[Entity] = []
+        self._spawned_components: List[Component] = []
+
+        # entities and components destroyed while deferring
+        self._destroyed_entities: OrderedSet[Entity] = OrderedSet()
+        self._destroyed_components: OrderedSet[Component] = OrderedSet()
+
+        # components that moved since the last call to resolve_transforms()
+        self._dirty_transforms: List[Component] = []
+
+        # the positions of entities (None until `spatial` is first used)
+        self._spatial: Optional[SpatialHash] = None
+
+        # the entities indexed by `_spatial`, by root component
+        self._spatial_roots: Dict[Component, Entity] = {}
+
+        # the bounds of every cullable component (None without culling)
+        self._cull_hash: Optional[SpatialHash] = None
+        if self.use_culling:
+            self._cull_hash = SpatialHash(self.cull_cell_size)
+
+        # the cullable components that are not culled
+        self._cull_shown: Set[BatchComponent] = set()
+
+        # the rectangle components were last culled against
+        self._cull_rect: Optional[tuple] = None
+
+        # components whose bounds changed since they were last culled
+        self._cull_moved: List[BatchComponent] = []
 
     def use_camera(self, camera: Camera):
         """
@@ -81,6 +178,13 @@ class Scene(Nameable):
                            the last frame
 
         """
+        self.resolve_transforms()
+        if self._cull_hash is not None:
+            self.cull()
+
+        for component in self._pre_render_components:
+            component.on_pre_render()
+
         self.camera.arm()  # set openGL coordinates
         self.batch.render()  # render everything in the batch
 
@@ -89,19 +193,275 @@ class Scene(Nameable):
         # for component in self._renderable_components:
         #     component.render()
 
+    def resolve_transforms(self):
+        """
+        Notify every component that moved since the last call.
+
+        Moving a component only marks its transform (and those of its
+        children) as dirty. This calls `on_position_change()` once for each
+        of them, so components that moved several times (or whose parents
+        did) only update their vertex data once. It is called before
+        rendering.
+        """
+        dirty = self._dirty_transforms
+        if not dirty:
+            return
+        self._dirty_transforms = []
+
+        spatial = self._spatial
+        roots = self._spatial_roots
+        cull_hash = self._cull_hash
+
+        for component in dirty:
+            if component._pending and component._owner_scene is self:
+                component._pending = False
+                component.on_position_change()
+
+                if spatial is not None:
+                    entity = roots.get(component)
+                    if entity is not None:
+                        spatial.update(entity, component.position)
+
+                if cull_hash is not None and component in cull_hash:
+                    self._update_bounds(component)
+
+    def cull(self):
+        """
+        Hide the batched components that are outside of the camera's view,
+        and show those that came back into it.
+
+        Only components that moved are checked, unless the camera moved.
+        It is called before rendering if `use_culling` is true.
+        """
+        rect = self.camera.rect
+        if rect is None:
+            return
+
+        margin = self.cull_margin
+        x0, y0, x1, y1 = (rect[0] - margin, rect[1] - margin,
+                          rect[2] + margin, rect[3] + margin)
+        moved = self._cull_moved
+        self._cull_moved = []
+
+        shown = self._cull_shown
+        if (x0, y0, x1, y1) != self._cull_rect:
+            self._cull_rect = (x0, y0, x1, y1)
+            visible = set(self._cull_hash.query_rect(x0, y0, x1, y1))
+            for component in shown - visible:
+                component._set_culled(True)
+            for component in moved:
+                if component not in visible and component in self._cull_hash:
+                    component._set_culled(True)
+            for component in visible - shown:
+                component._set_culled(False)
+            self._cull_shown = visible
+            return
+
+        get_box = self._cull_hash.get_box
+        for component in moved:
+            if component not in self._cull_hash:
+                continue
+            box = get_box(component)
+            if box[0] <= x1 and box[2] >= x0 and box[1] <= y1 and box[3] >= y0:
+                shown.add(component)
+                component._set_culled(False)
+            else:
+                shown.discard(component)
+                component._set_culled(True)
+
+    def _update_bounds(self, component: BatchComponent):
+        """
+        Store the bounds of a component, to be culled on the next frame.
+
+        Args:
+            component (BatchComponent): the component
+        """
+        bounds = component.bounds
+        if bounds is None:
+            self._cull_hash.remove(component)
+            self._cull_shown.discard(component)
+            component._set_culled(False)
+            return
+
+        x0, y0, x1, y1 = bounds
+        self._cull_hash.update(component, (x0, y0), (x1 - x0, y1 - y0))
+        self._cull_moved.append(component)
+
+    @property
+    def spatial(self) -> SpatialHash:
+        """
+        A spatial hash of the positions of every entity in this scene.
+
+        Only entities are indexed, as points at the position of their root
+        component; child components (and components without an entity)
+        cannot be queried directly. Find nearby entities, then look at their
+        components.
+
+        It is created (and kept up to date from then on) the first time it
+        is used. Positions are updated by `resolve_transforms()`, so during
+        an update they are those of the end of the last frame.
+
+        Example:
+            for npc in scene.spatial.query_radius(player.position, 100):
+                npc.notice(player)
+        """
+        if self._spatial is None:
+            self._spatial = SpatialHash(self.spatial_cell_size)
+            self._track_entities(self.entities)
+        return self._spatial
+
+    def _track_entities(self, entities: Iterable[Entity]):
+        """
+        Add entities to the spatial hash.
+
+        Args:
+            entities (Iterable[Entity]): the entities to add
+        """
+        spatial = self._spatial
+        for entity in entities:
+            root = entity.root_component
+            self._spatial_roots[root] = entity
+            spatial.update(entity, root.position)
+
     def update(self, delta: float):
         """Update this scene.
 
         This method will call every component's on_update() methods.
 
+        Objects are updated phase by phase (see `UpdatePhase`), by
+        descending priority within a phase. Paused update groups are
+        skipped.
+
         Args:
             delta (float): the time (in seconds) that passed since
                            the last tick
         """
-        self.on_update(delta)
+        with self.deferred():
+            self.on_update(delta)
 
-        for obj in self._updatable_objects:
-            obj.on_update(delta)
+            order = self._update_order
+            if order is None:
+                order = self._sort_updates()
+
+            profiler = self.game.profiler
+            if profiler is not None:
+                self._update_profiled(delta, order, profiler)
+                return
+
+            for _, bucket in order:
+                for on_update in bucket.values():
+                    on_update(delta)
+
+    def _update_profiled(self, delta: float, order: List[_UpdateBucket],
+                         profiler: Profiler):
+        """
+        Update every bucket, timing the updates of each class.
+        """
+        clock = time.perf_counter
+        for cls, bucket in order:
+            start = clock()
+            for on_update in bucket.values():
+                on_update(delta)
+            profiler.record_update(cls, start, clock(), len(bucket))
+
+    def _sort_updates(self) -> List[_UpdateBucket]:
+        """
+        Put the buckets of enabled update groups in update order.
+
+        Buckets run by phase, then by descending priority, then in the
+        order they were created.
+        """
+        disabled = self._disabled_groups
+        self._update_order = [(key[3], self._update_buckets[key])
+                              for key in self._sorted_update_keys()
+                              if key[2] not in disabled]
+        return self._update_order
+
+    def _sorted_update_keys(self) -> List[_UpdateKey]:
+        return sorted(self._update_buckets,
+                      key=lambda key: (key[0], -key[1]))
+
+    def set_group_enabled(self, group: str, enabled: bool):
+        """
+        Pause or resume the updates of every object in an update group.
+
+        Paused groups are skipped as a whole without iterating over their
+        objects.
+
+        Args:
+            group (str): the name of the update group (see
+                `Scriptable.update_group`)
+            enabled (bool): false to pause the group
+        """
+        if enabled:
+            self._disabled_groups.discard(group)
+        else:
+            self._disabled_groups.add(group)
+        self._update_order = None
+
+    def is_group_enabled(self, group: str) -> bool:
+        """
+        Return true unless an update group was paused.
+
+        Args:
+            group (str): the name of the update group
+        """
+        return group not in self._disabled_groups
+
+    @contextmanager
+    def deferred(self) -> Iterator[Scene]:
+        """
+        Queue spawns and destroys instead of applying them immediately.
+
+        Updates run inside this context, so objects can spawn and destroy
+        others while the scene iterates over them. Queued commands are
+        applied by `flush_commands()`, which the game calls after each tick
+        and after dispatching input events. Spawned objects are created
+        (and returned) immediately, but are only updated once flushed.
+
+        Example:
+            with scene.deferred():
+                scene.destroy_entity(enemy)
+            scene.flush_commands()
+        """
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+
+    def flush_commands(self):
+        """
+        Apply every spawn and destroy queued while deferring.
+
+        Spawned objects are registered in one batch, then destroyed objects
+        are removed.
+        """
+        assert self._defer_depth == 0, 'cannot flush while deferring'
+
+        if self._spawned_components:
+            components = self._spawned_components
+            self._spawned_components = []
+            self._register_components(components)
+
+        if self._spawned_entities:
+            entities = self._spawned_entities
+            self._spawned_entities = []
+            self._add_entities(entities)
+
+        if self._destroyed_entities:
+            entities = self._destroyed_entities
+            self._destroyed_entities = OrderedSet()
+            for entity in entities:
+                if entity in self.entities:
+                    self.destroy_entity(entity)
+
+        if self._destroyed_components:
+            components = self._destroyed_components
+            self._destroyed_components = OrderedSet()
+            for component in components:
+                if component in self.components:
+                    self.destroy_component(component)
 
     def spawn_component(self, cmp_class: Type[konkyo.T], pos: tuple, *args,
                         name: str = None, parent: Component = None,
@@ -118,7 +478,7 @@ class Scene(Nameable):
         component = konkyo.create_component(cmp_class, pos, name=name,
                                             parent=parent,
                                             *args, **kwargs)
-        self._register_components(konkyo.collect_components(component))
+        self._register_components(component.flatten())
 
         return component
 
@@ -129,10 +489,19 @@ class Scene(Nameable):
         Args:
             components: a component or list of components
         """
-        children = konkyo.collect_components(component, False)
-        all_components = children + [component]
+        if self._defer_depth:
+            self._destroyed_components.add(component)
+            return
+
+        all_components = component.flatten()
+
+        parent = component.parent
+        if parent is not None and component in parent.children:
+            parent.children.remove(component)
 
-        for comp in set(all_components):
+        for comp in all_components:
+            if self.pool.release(comp):
+                continue
             try:
                 comp.on_destroy()
             except AssertionError as e:
@@ -151,13 +520,13 @@ class Scene(Nameable):
         """
         entity = konkyo.create_entity(ent_class, pos, *args, **kwargs,
                                       scene=self)
-        components = konkyo.collect_components(entity)
+        components = entity.root_component.flatten()
 
-        self.entities.append(entity)
         self._register_components(components)
-
-        if konkyo.utils.is_function_defined(entity.on_update):
-            self._updatable_objects.append(entity)
+        if self._defer_depth:
+            self._spawned_entities.append(entity)
+        else:
+            self._add_entities([entity])
 
         print('spawned entity {} ({} components)'
               .format(entity.name, len(components)))
@@ -174,28 +543,112 @@ class Scene(Nameable):
         Args:
             entity (Entity): the entity to delete
         """
+        if self._defer_depth:
+            self._destroyed_entities.add(entity)
+            return
+
         self.entities.remove(entity)
-        components = konkyo.collect_components(entity)
-        for component in components:
-            self.destroy_component(component)
-        self._unregister_components(components)
+        self._remove_updatable(entity)
+        if self._spatial is not None:
+            self._spatial.remove(entity)
+            del self._spatial_roots[entity.root_component]
+
+        # destroys every component of the entity
+        self.destroy_component(entity.root_component)
+        self.pool.release(entity)
+
+    def destroy_entities(self, entities: Iterable[Entity]):
+        """
+        Delete several Entities from the Scene.
+
+        Args:
+            entities (Iterable[Entity]): the entities to delete
+        """
+        for entity in tuple(entities):
+            self.destroy_entity(entity)
+
+    def _add_entities(self, entities: List[Entity]):
+        """
+        Register entities as part of this scene.
+
+        Args:
+            entities (List[Entity]): a list of entities
+        """
+        self.entities.update(entities)
+        for entity in entities:
+            if entity.updates:
+                self._add_updatable(entity)
+        if self._spatial is not None:
+            self._track_entities(entities)
+
+    def _add_updatable(self, obj: Scriptable):
+        """
+        Call `on_update()` on an object every tick.
 
-        if konkyo.utils.is_function_defined(entity.on_update):
-            self._updatable_objects.remove(entity)
+        The update phase, priority and group of the object are read once,
+        so they must be set before it is registered (e.g. in `on_spawn()`).
+
+        Args:
+            obj (Scriptable): the object to update
+        """
+        key = (obj.update_phase, obj.update_priority, obj.update_group,
+               type(obj))
+        bucket = self._update_buckets.get(key)
+        if bucket is None:
+            bucket = self._update_buckets[key] = {}
+            self._update_order = None
+        bucket[obj] = obj.on_update
+        self._update_keys[obj] = key
+
+    def _remove_updatable(self, obj: Scriptable):
+        """
+        Stop updating an object.
+
+        Args:
+            obj (Scriptable): the object to stop updating
+        """
+        key = self._update_keys.pop(obj, None)
+        if key is None:
+            return
+
+        bucket = self._update_buckets[key]
+        del bucket[obj]
+        if not bucket:
+            del self._update_buckets[key]
+            self._update_order = None
+
+    @property
+    def updatable_objects(self) -> Iterator[Scriptable]:
+        """Iterate over the objects updated every tick, in update order."""
+        for key in self._sorted_update_keys():
+            yield from self._update_buckets[key]
 
     def _register_components(self, components: List[Component]):
         """
         Register components as part of this scene.
 
+        While deferring, the components are registered on the next flush.
+
         Args:
             components (List[Component]): a list of components
         """
+        if self._defer_depth:
+            self._spawned_components.extend(components)
+            return
+
         for component in components:
-            self.components.append(component)
+            component._owner_scene = self
+            self.components.add(component)
             if isinstance(component, Renderable):
-                self._renderable_components.append(component)
-            if konkyo.utils.is_function_defined(component.on_update):
-                self._updatable_objects.append(component)
+                self._renderable_components.add(component)
+            if (isinstance(component, BatchRenderable)
+                    and component.pre_renders):
+                self._pre_render_components.add(component)
+            if (self._cull_hash is not None
+                    and isinstance(component, BatchComponent)):
+                self._update_bounds(component)
+            if component.updates:
+                self._add_updatable(component)
 
     def _unregister_components(self, components: List[Component]):
         """
@@ -205,11 +658,17 @@ class Scene(Nameable):
             components (List[Component]): a list of components
         """
         for component in components:
+            component._owner_scene = None
+            component._pending = False
             self.components.remove(component)
-            if isinstance(component, Renderable):
-                self._renderable_components.remove(component)
-            if konkyo.utils.is_function_defined(component.on_update):
-                self._updatable_objects.remove(component)
+            self._renderable_components.discard(component)
+            self._pre_render_components.discard(component)
+            self._remove_updatable(component)
+            if self._cull_hash is not None:
+                self._cull_hash.remove(component)
+                self._cull_shown.discard(component)
+                if isinstance(component, BatchComponent):
+                    component._culled = False
 
     @property
     def component_count(self) -> int:
@@ -224,6 +683,9 @@ class Scene(Nameable):
         """This method is called when this scene is loaded.
 
         Overriding this method eliminates the need to override __init__().
+
+        Assets can be loaded here without blocking the game loop by using
+        `self.game.loader`; its futures resolve on a later frame.
         """
         pass
 
@@ -0,0 +1,291 @@
+"""Contains a spatial hash used to find objects near a position."""
+
+from __future__ import annotations
+
+from math import floor, inf
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# the (x, y) coordinates of a cell
+Cell = Tuple[int, int]
+
+# an axis-aligned box: (x0, y0, x1, y1)
+Box = Tuple[float, float, float, float]
+
+
+class SpatialHash:
+    """
+    Indexes objects by position on a uniform grid of square cells.
+
+    Every object is a point or an axis-aligned box, stored in every cell it
+    overlaps, so queries only look at the objects of nearby cells. Objects
+    must be hashable; their positions are only known to the hash through
+    `update()`.
+    """
+
+    def __init__(self, cell_size: float = 64):
+        """
+        Create a spatial hash.
+
+        Args:
+            cell_size (float, optional): the width and height of a cell.
+                Queries are fastest when this is about the size of a typical
+                query. Defaults to 64.
+        """
+        assert cell_size > 0, 'cell size must be higher than 0'
+
+        self.cell_size: float = cell_size
+
+        # the objects in each occupied cell
+        self._cells: Dict[Cell, Dict[Hashable, None]] = {}
+
+        # the box of every object, and the range of cells it overlaps
+        self._boxes: Dict[Hashable, Box] = {}
+        self._ranges: Dict[Hashable, Tuple[int, int, int, int]] = {}
+
+        # the range of cells that were ever occupied (never shrinks)
+        self._extent: Optional[List[int]] = None
+
+    def _cell_range(self, box: Box) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (floor(box[0] / size), floor(box[1] / size),
+                floor(box[2] / size), floor(box[3] / size))
+
+    def update(self, obj: Hashable, position: tuple, size: tuple = (0, 0)):
+        """
+        Insert an object, or move an object that was already inserted.
+
+        Args:
+            obj (Hashable): the object
+            position (tuple): the (x, y) position of the object, which is
+                the bottom-left corner of its box
+            size (tuple, optional): the (width, height) of the object's box.
+                Defaults to a point.
+        """
+        x, y = position
+        w, h = size
+        box = (x, y, x + w, y + h)
+        self._boxes[obj] = box
+
+        new = self._cell_range(box)
+        old = self._ranges.get(obj)
+        if new == old:
+            return
+        if old is not None:
+            self._unlink(obj, old)
+        self._ranges[obj] = new
+
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = new
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cell = cells[(cx, cy)] = {}
+                cell[obj] = None
+
+        extent = self._extent
+        if extent is None:
+            self._extent = list(new)
+        else:
+            extent[0] = min(extent[0], cx0)
+            extent[1] = min(extent[1], cy0)
+            extent[2] = max(extent[2], cx1)
+            extent[3] = max(extent[3], cy1)
+
+    def remove(self, obj: Hashable):
+        """
+        Remove an object. Does nothing if the object was not inserted.
+
+        Args:
+            obj (Hashable): the object
+        """
+        cell_range = self._ranges.pop(obj, None)
+        if cell_range is None:
+            return
+        del self._boxes[obj]
+        self._unlink(obj, cell_range)
+
+    def _unlink(self, obj: Hashable, cell_range: Tuple[int, int, int, int]):
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells[(cx, cy)]
+                del cell[obj]
+                if not cell:
+                    del cells[(cx, cy)]
+
+    def clear(self):
+        """
+        Remove every object.
+        """
+        self._cells.clear()
+        self._boxes.clear()
+        self._ranges.clear()
+        self._extent = None
+
+    def get_box(self, obj: Hashable) -> Box:
+        """
+        Return the (x0, y0, x1, y1) box of an object.
+
+        Args:
+            obj (Hashable): the object
+        """
+        return self._boxes[obj]
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def query_rect(self, x0: float, y0: float,
+                   x1: float, y1: float) -> List[Any]:
+        """
+        Return every object that overlaps a rectangle.
+
+        Args:
+            x0 (float): the left edge of the rectangle
+            y0 (float): the bottom edge of the rectangle
+            x1 (float): the right edge of the rectangle
+            y1 (float): the top edge of the rectangle
+        """
+        cells = self._cells
+        boxes = self._boxes
+        found: Dict[Hashable, None] = {}
+
+        cx0, cy0, cx1, cy1 = self._cell_range((x0, y0, x1, y1))
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    continue
+                for obj in cell:
+                    box = boxes[obj]
+                    if (box[0] <= x1 and box[2] >= x0
+                            and box[1] <= y1 and box[3] >= y0):
+                        found[obj] = None
+
+        return list(found)
+
+    def query_radius(self, center: tuple, radius: float) -> List[Any]:
+        """
+        Return every object within a distance of a position.
+
+        Args:
+            center (tuple): the (x, y) position
+            radius (float): the maximum distance
+        """
+        x, y = center
+        cells = self._cells
+        boxes = self._boxes
+        found: Dict[Hashable, None] = {}
+        radius_sq = radius * radius
+
+        cx0, cy0, cx1, cy1 = self._cell_range(
+            (x - radius, y - radius, x + radius, y + radius))
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    continue
+                for obj in cell:
+                    if _distance_sq(boxes[obj], x, y) <= radius_sq:
+                        found[obj] = None
+
+        return list(found)
+
+    def nearest(self, position: tuple, max_distance: float = None,
+                exclude: Hashable = None) -> Optional[Any]:
+        """
+        Return the object closest to a position.
+
+        Cells are searched in growing rings around the position, stopping
+        as soon as no farther ring can hold a closer object.
+
+        Args:
+            position (tuple): the (x, y) position
+            max_distance (float, optional): ignore objects farther than
+                this. Defaults to no limit.
+            exclude (Hashable, optional): an object to ignore, such as the
+                one searching for its neighbour
+
+        Returns:
+            the closest object, or None if there is none
+        """
+        if self._extent is None:
+            return None
+
+        x, y = position
+        size = self.cell_size
+        cx, cy = floor(x / size), floor(y / size)
+
+        ex0, ey0, ex1, ey1 = self._extent
+        last_ring = max(cx - ex0, ex1 - cx, cy - ey0, ey1 - cy, 0)
+        if max_distance is not None:
+            last_ring = min(last_ring, floor(max_distance / size) + 1)
+
+        cells = self._cells
+        boxes = self._boxes
+        best = None
+        best_sq = inf
+
+        for ring in range(last_ring + 1):
+
+            # scanning a large ring costs more than checking every object
+            if 8 * ring > len(boxes):
+                for obj, box in boxes.items():
+                    if obj is not exclude:
+                        dist_sq = _distance_sq(box, x, y)
+                        if dist_sq < best_sq:
+                            best, best_sq = obj, dist_sq
+                break
+
+            for cell_pos in _ring(cx, cy, ring):
+                cell = cells.get(cell_pos)
+                if cell is None:
+                    continue
+                for obj in cell:
+                    if obj is exclude:
+                        continue
+                    dist_sq = _distance_sq(boxes[obj], x, y)
+                    if dist_sq < best_sq:
+                        best, best_sq = obj, dist_sq
+
+            # objects in the next ring are at least this far away
+            reach = ring * size
+            if best_sq <= reach * reach:
+                break
+
+        if max_distance is not None and best_sq > max_distance * max_distance:
+            return None
+        return best
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, obj: Hashable) -> bool:
+        return obj in self._boxes
+
+
+def _distance_sq(box: Box, x: float, y: float) -> float:
+    """
+    Return the squared distance from a position to the closest point of a
+    box.
+    """
+    dx = max(box[0] - x, 0, x - box[2])
+    dy = max(box[1] - y, 0, y - box[3])
+    return dx * dx + dy * dy
+
+
+def _ring(cx: int, cy: int, ring: int):
+    """
+    Iterate over the cells at a Chebyshev distance from a cell.
+    """
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for x in range(cx - ring, cx + ring + 1):
+        yield (x, cy - ring)
+        yield (x, cy + ring)
+    for y in range(cy - ring + 1, cy + ring):
+        yield (cx - ring, y)
+        yield (cx + ring, y)
@@ -0,0 +1,110 @@
+"""
+Contains an insertion-ordered set.
+"""
+
+from itertools import islice
+from typing import Dict, Generic, Iterable, Iterator, List, TypeVar, Union
+
+T = TypeVar('T')
+
+
+class OrderedSet(Generic[T]):
+    """
+    A set that remembers the order items were added in.
+
+    Adding, removing and checking for an item are O(1), and iterating yields
+    items in insertion order. Like a dict, the set must not be changed while
+    it is being iterated over; iterate over a copy (`tuple(s)`) instead.
+
+    Items can also be read by position, like a list, but this is O(n).
+    """
+    __slots__ = ('_items',)
+
+    def __init__(self, items: Iterable[T] = ()):
+        """
+        Create an ordered set.
+
+        Args:
+            items (Iterable, optional): the initial items
+        """
+        self._items: Dict[T, None] = dict.fromkeys(items)
+
+    def add(self, item: T):
+        """
+        Add an item to the end of the set, if it is not already in it.
+
+        Args:
+            item: the item to add
+        """
+        self._items[item] = None
+
+    def update(self, items: Iterable[T]):
+        """
+        Add several items to the end of the set.
+
+        Args:
+            items (Iterable): the items to add
+        """
+        self._items.update(dict.fromkeys(items))
+
+    def remove(self, item: T):
+        """
+        Remove an item, raising KeyError if it is not in the set.
+
+        Args:
+            item: the item to remove
+        """
+        del self._items[item]
+
+    def discard(self, item: T):
+        """
+        Remove an item if it is in the set.
+
+        Args:
+            item: the item to remove
+        """
+        self._items.pop(item, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        """
+        Return the item at a position, or a list of the items in a slice.
+
+        Args:
+            index (Union[int, slice]): the position (negative positions
+                count from the end) or slice
+        """
+        items = self._items
+        if isinstance(index, slice):
+            return list(items)[index]
+
+        length = len(items)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('ordered set index out of range')
+
+        # walk from whichever end is closer
+        if index < length // 2:
+            return next(islice(items, index, None))
+        return next(islice(reversed(items), length - 1 - index, None))
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __repr__(self) -> str:
+        return 'OrderedSet({})'.format(list(self._items))
@@ -1,160 +1,456 @@
-
-from __future__ import annotations
-from typing import Union, Optional, cast
-from dataclasses import dataclass
-from numbers import Number
-
-import math
-import konkyo.utils.math
-
-
-@dataclass(init=False, order=False, frozen=True)
-class Vector:
-    """
-    Represents a 2D point in space.
-    """
-    x: Number
-    y: Number = 0
-
-    def __init__(self, x: Union[Vector, Number, tuple], y: Number = 0):
-        """
-        Create a 2D vector.
-
-        Args:
-            x (Union[Vector, Number, tuple]):
-            y (Number, optional): the y component. Defaults to 0.
-        """
-        if isinstance(x, Number) and isinstance(y, Number):
-
-            super().__setattr__('x', x)
-            super().__setattr__('y', y)
-
-        elif isinstance(x, tuple):
-
-            vec_x, vec_y = x
-            assert isinstance(vec_x, Number) and isinstance(vec_y, Number), (
-                'values in tuple are not numbers')
-
-            super().__setattr__('x', vec_x)
-            super().__setattr__('y', vec_y)
-
-        elif isinstance(x, Vector):
-
-            super().__setattr__('x', x.x)
-            super().__setattr__('y', x.y)
-
-        else:
-
-            raise ValueError('unable to construct point from value: {}'
-                             .format(x))
-
-    @property
-    def is_zero(self) -> bool:
-        """
-        Return True if all components of this vector are 0.
-        """
-        return self.x is 0 and self.y is 0
-
-    def lerp(self, other: Vector, t: float) -> Vector:
-        """
-        Lerp between this vector and another vector.
-
-        Args:
-            other (Vector): the other vector
-            t (float): the time variable (between 0 and 1)
-
-        Returns:
-            Vector: the resultant vector
-        """
-        x = konkyo.utils.math.lerp(self.x, other.x, t)
-        y = konkyo.utils.math.lerp(self.y, other.y, t)
-        return Vector(x, y)
-
-    def ceil(self) -> Vector:
-        """
-        Perform ceil rounding on this vector's components and
-        return a new vector.
-
-        Returns:
-            Vector: the resultant vector
-        """
-        return Vector(math.ceil(self.x), math.ceil(self.y))
-
-    def __iadd__(self, other):
-        """ += operator """
-        x, y = self.x, self.y
-
-        if type(other) is tuple:
-            return Vector(x + other[0], y + other[1])
-        elif type(other) is Vector:
-            return Vector(x + other.x, y + other.y)
-
-        raise ValueError(f'unable to add 2D point to value { other }')
-
-    def __add__(self, other):
-        """ + operator """
-        x, y = self.x, self.y
-
-        if type(other) is tuple:
-            return Vector(x + other[0], y + other[1])
-        elif type(other) is Vector:
-            return Vector(x + other.x, y + other.y)
-
-        raise ValueError(f'unable to add 2D point to value { other }')
-
-    def __sub__(self, other):
-        """ - operator """
-        x, y = self.x, self.y
-
-        if type(other) is tuple:
-            return Vector(x - other[0], y - other[1])
-        elif type(other) is Vector:
-            return Vector(x - other.x, y - other.y)
-
-        raise ValueError(f'unable to subtract 2D point to value { other }')
-
-    def __mul__(self, other):
-        """
-        * operator
-        """
-        assert isinstance(other, (int, float)), ('unable to multiply value'
-                                                 'by {}'.format(other))
-
-        return Vector(self.x * other, self.y * other)
-
-    def __floordiv__(self, other):
-        """
-        // operator
-        """
-        assert isinstance(other, (int, float)), ('unable to multiply value'
-                                                 'by {}'.format(other))
-
-        return Vector(self.x // other, self.y // other)
-
-    def __iter__(self):
-        """Convert this Vector into an Iterable."""
-        yield self.x
-        yield self.y
-
-    def __repr__(self):
-        """
-        Represent this vector as a string.
-        """
-        return '(X={},Y={})'.format(self.x, self.y)
-
-
-class Transform(Vector):
-    """
-    Represents a 2D box in space.
-    """
-
-    def __init__(self, x: float, y: float, w: float, h: float):
-
-        super().__init__(x, y)
-        self.w = w
-        self.h = h
-
-    @property
-    def point(self):
-        """ Retrieves this transform as a point. """
-        return Vector(self.x, self.y)
+
+from __future__ import annotations
+from typing import Iterator, Union, Optional, cast
+from numbers import Number
+
+import ctypes
+import math
+
+import numpy as np
+
+import konkyo.utils.math
+
+
+class Vector:
+    """
+    Represents a 2D point in space.
+
+    Vectors compare (and hash) equal to tuples with the same components,
+    so `Vector(1, 2) == (1, 2)`. They are immutable: assigning a component
+    raises an AttributeError.
+    """
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x: Union[Vector, Number, tuple] = 0, y: Number = 0):
+        """
+        Create a 2D vector.
+
+        Use `Vector.of(x, y)` when both components are known to be numbers.
+
+        Args:
+            x (Union[Vector, Number, tuple]):
+            y (Number, optional): the y component. Defaults to 0.
+        """
+        cls = type(x)
+        if (cls is int or cls is float) and (type(y) is int
+                                              or type(y) is float):
+
+            _set_x(self, x)
+            _set_y(self, y)
+
+        elif cls is Vector or isinstance(x, Vector):
+
+            _set_x(self, x.x)
+            _set_y(self, x.y)
+
+        elif cls is tuple:
+
+            vec_x, vec_y = x
+            if not (_is_number(vec_x) and _is_number(vec_y)):
+                raise ValueError('values in tuple are not numbers: {}'
+                                 .format(x))
+
+            _set_x(self, vec_x)
+            _set_y(self, vec_y)
+
+        elif isinstance(x, Number) and isinstance(y, Number):
+
+            _set_x(self, x)
+            _set_y(self, y)
+
+        else:
+
+            raise ValueError('unable to construct point from value: {}'
+                             .format(x))
+
+    @classmethod
+    def of(cls, x: Number, y: Number) -> Vector:
+        """
+        Create a vector from its components without checking their types.
+
+        Args:
+            x (Number): the x component
+            y (Number): the y component
+
+        Returns:
+            Vector: the new vector
+        """
+        vec = _new(cls)
+        _set_x(vec, x)
+        _set_y(vec, y)
+        return vec
+
+    @property
+    def is_zero(self) -> bool:
+        """
+        Return True if all components of this vector are 0.
+        """
+        return self.x == 0 and self.y == 0
+
+    @property
+    def length(self) -> float:
+        """
+        The length (magnitude) of this vector.
+        """
+        return math.hypot(self.x, self.y)
+
+    def dot(self, other: Union[Vector, tuple]) -> Number:
+        """
+        Return the dot product of this vector and another vector.
+
+        Args:
+            other (Union[Vector, tuple]): the other vector
+        """
+        ox, oy = other
+        return self.x * ox + self.y * oy
+
+    def lerp(self, other: Vector, t: float) -> Vector:
+        """
+        Lerp between this vector and another vector.
+
+        Args:
+            other (Vector): the other vector
+            t (float): the time variable (between 0 and 1)
+
+        Returns:
+            Vector: the resultant vector
+        """
+        x = konkyo.utils.math.lerp(self.x, other.x, t)
+        y = konkyo.utils.math.lerp(self.y, other.y, t)
+        return _of(x, y)
+
+    def ceil(self) -> Vector:
+        """
+        Perform ceil rounding on this vector's components and
+        return a new vector.
+
+        Returns:
+            Vector: the resultant vector
+        """
+        return _of(math.ceil(self.x), math.ceil(self.y))
+
+    def __add__(self, other):
+        """ + operator """
+        if isinstance(other, Vector):
+            return _of(self.x + other.x, self.y + other.y)
+        elif type(other) is tuple:
+            return _of(self.x + other[0], self.y + other[1])
+
+        raise ValueError(f'unable to add 2D point to value { other }')
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """ - operator """
+        if isinstance(other, Vector):
+            return _of(self.x - other.x, self.y - other.y)
+        elif type(other) is tuple:
+            return _of(self.x - other[0], self.y - other[1])
+
+        raise ValueError(f'unable to subtract 2D point to value { other }')
+
+    def __rsub__(self, other):
+        """ - operator (with a tuple on the left) """
+        if type(other) is tuple:
+            return _of(other[0] - self.x, other[1] - self.y)
+
+        raise ValueError(f'unable to subtract 2D point from value { other }')
+
+    def __mul__(self, other):
+        """
+        * operator
+        """
+        assert isinstance(other, (int, float)), ('unable to multiply value'
+                                                 'by {}'.format(other))
+
+        return _of(self.x * other, self.y * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """
+        / operator
+        """
+        assert isinstance(other, (int, float)), ('unable to divide value'
+                                                 'by {}'.format(other))
+
+        return _of(self.x / other, self.y / other)
+
+    def __floordiv__(self, other):
+        """
+        // operator
+        """
+        assert isinstance(other, (int, float)), ('unable to divide value'
+                                                 'by {}'.format(other))
+
+        return _of(self.x // other, self.y // other)
+
+    def __neg__(self):
+        """ unary - operator """
+        return _of(-self.x, -self.y)
+
+    def __eq__(self, other):
+        """ == operator (vectors and tuples of two numbers) """
+        if isinstance(other, Vector):
+            return self.x == other.x and self.y == other.y
+        elif type(other) is tuple:
+            return len(other) == 2 and self.x == other[0] \
+                and self.y == other[1]
+        return NotImplemented
+
+    def __setattr__(self, name, value):
+        raise AttributeError('vectors are immutable')
+
+    def __hash__(self):
+        """ Hash this vector the same as the equivalent tuple. """
+        return hash((self.x, self.y))
+
+    def __getitem__(self, index):
+        """ Access components by index, like a tuple. """
+        return (self.x, self.y)[index]
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        """Convert this Vector into an Iterable."""
+        return iter((self.x, self.y))
+
+    def __repr__(self):
+        """
+        Represent this vector as a string.
+        """
+        return '(X={},Y={})'.format(self.x, self.y)
+
+
+_new = object.__new__
+
+# the slot setters, which bypass `Vector.__setattr__`
+_set_x = Vector.x.__set__
+_set_y = Vector.y.__set__
+
+
+def _is_number(value) -> bool:
+    cls = type(value)
+    return cls is int or cls is float or isinstance(value, Number)
+
+
+def _of(x: Number, y: Number) -> Vector:
+    """
+    Create a vector without any type checks (used by the operators).
+    """
+    vec = _new(Vector)
+    _set_x(vec, x)
+    _set_y(vec, y)
+    return vec
+
+
+class Transform(Vector):
+    """
+    Represents a 2D box in space.
+    """
+    __slots__ = ('w', 'h')
+
+    def __init__(self, x: float, y: float, w: float, h: float):
+
+        super().__init__(x, y)
+        object.__setattr__(self, 'w', w)
+        object.__setattr__(self, 'h', h)
+
+    @property
+    def point(self):
+        """ Retrieves this transform as a point. """
+        return Vector(self.x, self.y)
+
+
+class VectorArray:
+    """
+    Represents many 2D points in space, stored in a contiguous float32 array
+    of shape (N, 2).
+
+    Arithmetic is vectorized: adding a Vector (or tuple) moves every point,
+    while adding another VectorArray (or array) of the same length moves
+    each point separately. The in-place operators (`+=`, `-=`, `*=`) never
+    reallocate, so views (see `flat`) handed to vertex buffers stay valid.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, values: Union[int, np.ndarray, list] = 0):
+        """
+        Create an array of vectors.
+
+        Args:
+            values (Union[int, ndarray, list], optional): the amount of
+                vectors (all set to zero), or an iterable of (x, y) pairs.
+                Defaults to an empty array.
+        """
+        if isinstance(values, int):
+            self.data: np.ndarray = np.zeros((values, 2), dtype=np.float32)
+        else:
+            data = np.array(values, dtype=np.float32).reshape(-1, 2)
+            self.data = np.ascontiguousarray(data)
+
+    @classmethod
+    def wrap(cls, data: np.ndarray) -> VectorArray:
+        """
+        Create a vector array that shares memory with an existing array.
+
+        Args:
+            data (ndarray): a float32 array of shape (N, 2)
+        """
+        assert data.dtype == np.float32 and data.ndim == 2 \
+            and data.shape[1] == 2, 'data must be a float32 (N, 2) array'
+        array = object.__new__(cls)
+        array.data = data
+        return array
+
+    # -------------------------------------------------------------------------
+    # Views
+    # -------------------------------------------------------------------------
+
+    @property
+    def x(self) -> np.ndarray:
+        """ A view of the x components. """
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """ A view of the y components. """
+        return self.data[:, 1]
+
+    @property
+    def flat(self) -> np.ndarray:
+        """
+        A 1D view of the components (x0, y0, x1, y1, ...).
+
+        This can be assigned directly to a vertex list attribute.
+        """
+        return self.data.reshape(-1)
+
+    def as_ctypes(self) -> ctypes.Array:
+        """
+        Return a ctypes float array sharing memory with this array, which can
+        be uploaded to a GL buffer without copying.
+        """
+        return (ctypes.c_float * self.data.size).from_buffer(self.data)
+
+    # -------------------------------------------------------------------------
+    # Operations
+    # -------------------------------------------------------------------------
+
+    def lerp(self, other: Union[VectorArray, Vector, tuple],
+             t: Union[float, np.ndarray]) -> VectorArray:
+        """
+        Lerp between these vectors and other vectors.
+
+        Args:
+            other (Union[VectorArray, Vector, tuple]): the other vectors
+            t (Union[float, ndarray]): the time variable (between 0 and 1),
+                or one per vector
+
+        Returns:
+            VectorArray: the resultant vectors
+        """
+        t = np.asarray(t, dtype=np.float32)
+        if t.ndim == 1:
+            t = t[:, None]
+        data = self.data
+        return VectorArray.wrap(data + (_operand(other) - data) * t)
+
+    def ceil(self) -> VectorArray:
+        """
+        Perform ceil rounding on every component and return new vectors.
+
+        Returns:
+            VectorArray: the resultant vectors
+        """
+        return VectorArray.wrap(np.ceil(self.data))
+
+    def copy(self) -> VectorArray:
+        """ Return a copy of these vectors. """
+        return VectorArray.wrap(self.data.copy())
+
+    def __add__(self, other):
+        """ + operator """
+        return VectorArray.wrap(self.data + _operand(other))
+
+    def __sub__(self, other):
+        """ - operator """
+        return VectorArray.wrap(self.data - _operand(other))
+
+    def __mul__(self, other):
+        """ * operator (scale by a number, or one number per vector) """
+        return VectorArray.wrap(self.data * _scale(other))
+
+    def __iadd__(self, other):
+        """ += operator (in place) """
+        self.data += _operand(other)
+        return self
+
+    def __isub__(self, other):
+        """ -= operator (in place) """
+        self.data -= _operand(other)
+        return self
+
+    def __imul__(self, other):
+        """ *= operator (in place) """
+        self.data *= _scale(other)
+        return self
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        """ unary - operator """
+        return VectorArray.wrap(-self.data)
+
+    # -------------------------------------------------------------------------
+    # Container Methods
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """
+        Retrieve a vector by index, or a view of several vectors.
+        """
+        if isinstance(index, (int, np.integer)):
+            x, y = self.data[index].tolist()
+            return _of(x, y)
+        return VectorArray.wrap(self.data[index])
+
+    def __setitem__(self, index, value):
+        self.data[index] = _operand(value)
+
+    def __iter__(self) -> Iterator[Vector]:
+        for x, y in self.data.tolist():
+            yield _of(x, y)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def __repr__(self):
+        return 'VectorArray({})'.format(self.data.tolist())
+
+
+def _operand(other) -> np.ndarray:
+    """
+    Convert the right-hand side of an operation into something numpy can
+    broadcast against an (N, 2) array.
+    """
+    if isinstance(other, VectorArray):
+        return other.data
+    if isinstance(other, Vector):
+        return np.array((other.x, other.y), dtype=np.float32)
+    return np.asarray(other, dtype=np.float32)
+
+
+def _scale(other) -> Union[float, np.ndarray]:
+    """
+    Convert a scale factor (a number, or one per vector) for broadcasting.
+    """
+    if isinstance(other, (int, float)):
+        return other
+    scale = np.asarray(other, dtype=np.float32)
+    return scale[:, None] if scale.ndim == 1 else scale
@@ -16,6 +16,19 @@ def _co_code(fn) -> str:
     return fn.__code__.co_code
 
 
+def _empty_fn():
+    pass
+
+
+def _empty_fn_doc():
+    """docstring"""
+    pass
+
+
+# the co_code of functions defined as `pass`
+_EMPTY_CO_CODES = frozenset((_co_code(_empty_fn), _co_code(_empty_fn_doc)))
+
+
 def is_function_defined(fn):
     """
     Return false if the function is defined as `pass`,
@@ -24,16 +37,8 @@ def is_function_defined(fn):
     Args:
         fn (function): the function to test
     """
-    def empty_fn():
-        pass
-
-    def empty_fn_doc():
-        """docstring"""
-        pass
-
     # return false if the co_code of our fn matches either empty fn
-    return not (_co_code(fn) == _co_code(empty_fn)
-                or _co_code(fn) == _co_code(empty_fn_doc))
+    return _co_code(fn) not in _EMPTY_CO_CODES
 
 
 def autoargs(cls_or_fn=None):
@@ -34,6 +34,20 @@ def gl_set_uniform_mat4(program: int, name: str, value):
     _set_uniform_mat4(loc, value)
 
 
+def copy_array(target, data):
+    """
+    Copy a numpy array into a vertex list attribute in a single write.
+
+    Args:
+        target: the attribute (such as `vertex_list.position`)
+        data (numpy.ndarray): a contiguous array of the attribute's type
+    """
+    if isinstance(target, Array):
+        memmove(target, data.ctypes.data, data.nbytes)
+    else:
+        target[:] = data.ravel().tolist()
+
+
 class GLDefinedBuffer:
     """
     This class references both a GL buffer object and a target,
@@ -71,6 +85,36 @@ class GLUniformBuffer(GLDefinedBuffer):
     def __init__(self, id: int = None):
         super().__init__(GL_UNIFORM_BUFFER, id)
 
+    @classmethod
+    def create(cls, size: int, usage: int = GL_DYNAMIC_DRAW
+               ) -> GLUniformBuffer:
+        """
+        Create a new buffer object.
+
+        Args:
+            size (int): the size (in bytes) of the buffer
+            usage (int, optional): the usage hint of the buffer. Defaults to
+                GL_DYNAMIC_DRAW.
+        """
+        id = GLuint()
+        glGenBuffers(1, byref(id))
+        buffer = cls(id.value)
+        buffer.allocate(size, usage)
+        return buffer
+
+    def allocate(self, size: int, usage: int = GL_DYNAMIC_DRAW):
+        """
+        Allocate (or reallocate) the storage of this buffer, discarding its
+        data.
+
+        Args:
+            size (int): the size (in bytes) of the buffer
+            usage (int, optional): the usage hint of the buffer. Defaults to
+                GL_DYNAMIC_DRAW.
+        """
+        with self:
+            glBufferData(self.target, size, None, usage)
+
     def sub_data(self, offset: int, data):
         """
         Set the data of a specific range in this buffer.
@@ -94,6 +138,18 @@ class GLUniformBuffer(GLDefinedBuffer):
         """
         glBindBufferBase(self.target, binding_point, self.id)
 
+    def bind_range(self, binding_point: int, offset: int, size: int):
+        """
+        Bind a range of this buffer to a binding point.
+
+        Args:
+            binding_point (int): the binding point
+            offset (int): the offset (in bytes) of the range, which must be a
+                multiple of GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT
+            size (int): the size (in bytes) of the range
+        """
+        glBindBufferRange(self.target, binding_point, self.id, offset, size)
+
     def __enter__(self) -> GLUniformBuffer:
         self.bind()
         return self
@@ -102,3 +158,71 @@ class GLUniformBuffer(GLDefinedBuffer):
         self.unbind()
 
 
+class GLUniformSlots:
+    """
+    A uniform buffer split into equally sized slots, each holding one copy
+    of a uniform block.
+
+    Every user (such as a camera) keeps its data in its own slot, so
+    switching between users only binds another range of the buffer instead
+    of uploading data again.
+    """
+
+    def __init__(self, block_size: int, capacity: int = 8):
+        """
+        Create a buffer of uniform slots.
+
+        Args:
+            block_size (int): the size (in bytes) of the uniform block
+            capacity (int, optional): the initial amount of slots; the buffer
+                grows when more are needed. Defaults to 8.
+        """
+        alignment = GLint()
+        glGetIntegerv(GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT, byref(alignment))
+
+        self.block_size: int = block_size
+
+        # the distance (in bytes) between slots
+        self.stride: int = -(-block_size // alignment.value) * alignment.value
+
+        self.capacity: int = capacity
+        self.buffer: GLUniformBuffer = GLUniformBuffer.create(
+            self.stride * capacity)
+
+        # the amount of slots handed out
+        self._count: int = 0
+
+        # increases whenever the buffer is reallocated, losing its data
+        self.generation: int = 0
+
+    def acquire(self) -> int:
+        """
+        Return a new slot, growing the buffer if it is full.
+        """
+        if self._count == self.capacity:
+            self.capacity *= 2
+            self.buffer.allocate(self.stride * self.capacity)
+            self.generation += 1
+
+        self._count += 1
+        return self._count - 1
+
+    def offset(self, slot: int) -> int:
+        """
+        Return the offset (in bytes) of a slot.
+
+        Args:
+            slot (int): the slot
+        """
+        return slot * self.stride
+
+    def bind(self, slot: int, binding_point: int):
+        """
+        Bind a slot to a binding point.
+
+        Args:
+            slot (int): the slot
+            binding_point (int): the binding point of the uniform block
+        """
+        self.buffer.bind_range(binding_point, slot * self.stride,
+                               self.block_size)
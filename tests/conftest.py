@@ -0,0 +1,5 @@
+
+import pyglet
+
+# tests run without a display, so never create pyglet's shadow window
+pyglet.options['shadow_window'] = False
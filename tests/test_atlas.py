@@ -0,0 +1,60 @@
+import pyglet
+import pytest
+from pyglet.image import ImageData, Texture
+
+import konkyo.asset.atlas as atlas_module
+from konkyo.asset.atlas import TextureAtlasBuilder
+from konkyo.asset.image import ImageAsset
+from konkyo.asset.tileset import TilesetAsset
+
+
+@pytest.fixture
+def fake_gl(monkeypatch):
+    # packing only needs GL to create and fill textures, so textures are
+    # created without a context and never filled
+    def create(cls, width, height, *args, **kwargs):
+        return cls(width, height, pyglet.gl.GL_TEXTURE_2D, 1)
+
+    monkeypatch.setattr(pyglet.image, 'get_max_texture_size', lambda: 4096)
+    monkeypatch.setattr(Texture, 'create', classmethod(create))
+    monkeypatch.setattr(Texture, 'blit_into', lambda *args: None)
+    for name in ('glBindTexture', 'glTexParameteri'):
+        monkeypatch.setattr(atlas_module, name, lambda *args: None)
+        monkeypatch.setattr(pyglet.gl, name, lambda *args: None)
+
+
+def blank(width, height):
+    return ImageData(width, height, 'RGBA', bytes(width * height * 4))
+
+
+def test_atlas_packs_images_and_tilesets(fake_gl):
+
+    image = ImageAsset(blank(16, 16))
+    tileset = TilesetAsset(blank(32, 16), 8)
+    too_big = ImageAsset(blank(300, 10))
+
+    builder = TextureAtlasBuilder(width=128, height=128, border=1)
+    builder.add(image, tileset, too_big, image)
+    textures = builder.build()
+
+    assert len(textures) == 1
+    atlas = textures[0]
+    assert image.pyglet_image.owner is atlas
+    assert tileset.pyglet_image.owner is atlas
+    assert isinstance(too_big.pyglet_image, ImageData)
+
+    # regions keep their size, and their UV rects match their position
+    region = image.pyglet_image
+    assert (region.width, region.height) == (16, 16)
+    assert image.uv_rect == pytest.approx(
+        (region.x / 128, region.y / 128,
+         (region.x + 16) / 128, (region.y + 16) / 128))
+
+    # tiles are sliced from the tileset's region of the atlas; tile 4 is
+    # the first tile of the bottom row of the sheet
+    sheet = tileset.pyglet_image
+    tile = tileset[4]
+    assert tile.pyglet_image.owner is atlas
+    assert tile.uv_rect == pytest.approx(
+        (sheet.x / 128, sheet.y / 128,
+         (sheet.x + 8) / 128, (sheet.y + 8) / 128))
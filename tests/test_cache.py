@@ -0,0 +1,41 @@
+import os
+
+from pyglet.image import ImageData
+
+from konkyo.asset.cache import TilesetCache
+
+
+def test_cache_roundtrip(tmp_path):
+
+    path = str(tmp_path / 'tiles.png')
+    pixels = bytes(range(256)) * (32 * 16 * 4 // 256)
+    ImageData(32, 16, 'RGBA', pixels).save(path)
+
+    cache = TilesetCache(str(tmp_path / 'cache'))
+    first = cache.load(path, 8)
+    cache_path = cache.get_cache_path(path, 8, 8)
+    assert os.path.exists(cache_path)
+
+    second = cache.load(path, 8)
+    assert second.length == first.length == 8
+    assert list(second._regions) == list(first._regions)
+
+    image = second.pyglet_image
+    assert (image.width, image.height) == (32, 16)
+    assert bytes(image.get_data('RGBA', 32 * 4)) == \
+        first.pyglet_image.get_data('RGBA', 32 * 4)
+
+
+def test_cache_key_changes(tmp_path):
+
+    path = str(tmp_path / 'tiles.png')
+    ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4)).save(path)
+
+    cache = TilesetCache(str(tmp_path / 'cache'))
+    key = cache.get_cache_path(path, 8, 8)
+
+    assert cache.get_cache_path(path, 4, 4) != key
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert cache.get_cache_path(path, 8, 8) != key
@@ -0,0 +1,19 @@
+from konkyo.camera import HUDCamera, OrthoCamera
+from konkyo.game import Game
+
+
+def test_camera_version_tracks_changes():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene(camera=OrthoCamera())
+    camera = scene.camera
+    version = camera.version
+
+    camera.focus = (10, 0)
+    assert camera.version == version + 1
+    assert camera.rect == (-40, -50, 60, 50)
+
+    hud = HUDCamera(zoom=2.0)
+    assert hud.version == 0 and hud.rect is None
+    scene.use_camera(hud)
+    assert hud.version == 1 and hud.rect == (0, 0, 50, 50)
@@ -0,0 +1,51 @@
+from konkyo.game import Game
+from konkyo.scene import Scene
+from konkyo.objects.component import BatchComponent
+
+
+class CulledScene(Scene):
+    use_culling = True
+    cull_margin = 10
+
+
+class Marker(BatchComponent):
+
+    def on_spawn(self):
+        self.shown = True
+
+    @property
+    def bounds(self):
+        x, y = self.position
+        return (x, y, x + 10, y + 10)
+
+    def on_set_visible(self):
+        self.shown = True
+
+    def on_set_hidden(self):
+        self.shown = False
+
+
+def test_components_outside_the_camera_are_culled():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene(CulledScene)
+    inside = scene.spawn_component(Marker, (0, 0))
+    edge = scene.spawn_component(Marker, (55, 0))
+    outside = scene.spawn_component(Marker, (200, 0))
+
+    scene.cull()
+    assert inside.shown and edge.shown and not outside.shown
+    assert outside.is_visible and outside.is_culled
+
+    # hiding a culled component does not show it again
+    outside.is_visible = False
+    outside.position = (0, 20)
+    scene.resolve_transforms()
+    scene.cull()
+    assert not outside.shown and not outside.is_culled
+    outside.is_visible = True
+    assert outside.shown
+
+    scene.camera.focus = (300, 0)
+    scene.cull()
+    assert not inside.shown and not edge.shown and not outside.shown
@@ -0,0 +1,39 @@
+
+from konkyo.game import Game
+from konkyo.objects.component import Component
+from konkyo.objects.entity import Entity
+from konkyo.components.shapes import Box2D
+from konkyo.components.text import Text
+
+
+class Counter(Entity):
+
+    def on_spawn(self, limit: int):
+        self.limit = limit
+        self.ticks = 0
+        self.box = self.create_component(Box2D, (0, 0), (4, 4))
+        self.label = self.create_component(Text, (0, 0), 'hi')
+
+    def on_update(self, delta: float):
+        self.ticks += 1
+        self.position += (1, 0)
+        if self.ticks >= self.limit:
+            self.scene.game.stop()
+
+
+def test_headless_game_runs_fixed_ticks():
+
+    game = Game(width=100, height=100, headless=True, tick_rate=60)
+    scene = game.create_scene()
+    counter = scene.spawn_entity(Counter, (0, 0), 10)
+
+    deltas = []
+    game.event_listener(deltas.append)
+    game.start()
+
+    assert game.window is None
+    assert counter.ticks == 10
+    assert deltas == [1 / 60] * 10
+    assert tuple(counter.position) == (10, 0)
+    assert counter.label.pyglet_text.x == 10
+    assert counter.box.vertex_list.vertices[:2] == [10, 0]
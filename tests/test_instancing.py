@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import konkyo.graphics.instancing as instancing
+from konkyo.graphics.instancing import (INSTANCE_DTYPE, INSTANCE_LAYOUT,
+                                        InstanceBuffer, InstancedRenderer)
+
+
+def test_instance_layout():
+
+    assert INSTANCE_DTYPE.itemsize == 56
+    assert sum(size for _, size in INSTANCE_LAYOUT) == 14
+
+    offsets = [INSTANCE_DTYPE.fields[name][1] for name, _ in INSTANCE_LAYOUT]
+    assert offsets == [0, 8, 16, 20, 36, 52]
+
+
+def test_instance_buffer_packs_records():
+
+    buffer = InstanceBuffer(capacity=2)
+    a = buffer.add()
+    b = buffer.add(((1, 2), (16, 16), 90, (0, 0, .5, .5), (1, 0, 0, 1), 3))
+    c = buffer.add()
+    assert buffer.capacity == 4 and len(buffer) == 3
+
+    # the raw floats are laid out field after field, record after record
+    floats = buffer.records.view(np.float32).reshape(3, 14)
+    assert floats[1].tolist() == [1, 2, 16, 16, 90, 0, 0, .5, .5,
+                                  1, 0, 0, 1, 3]
+    assert floats[0].tolist() == [0, 0, 1, 1, 0, 0, 0, 1, 1,
+                                  1, 1, 1, 1, -1]
+
+    # removing a record moves the last one into its place
+    buffer.dirty = False
+    buffer.remove(a)
+    assert len(buffer) == 2 and buffer.dirty
+    assert buffer.get(b)['rotation'] == 90
+    assert buffer.records[0]['palette_row'] == -1  # record c
+    buffer.remove(c)
+    assert buffer.records['translate'].tolist() == [[1, 2]]
+
+
+# the batches drawn by the last render
+drawn = []
+
+
+class FakeBatch:
+
+    def __init__(self, texture, palette=None, layer=0):
+        self.texture = texture
+        self.palette = palette
+        self.layer = layer
+        self.buffer = InstanceBuffer()
+
+    def draw(self):
+        drawn.append(self)
+
+
+def test_instanced_layers_and_palette_rows(monkeypatch):
+
+    monkeypatch.setattr(instancing, 'InstanceBatch', FakeBatch)
+    texture = SimpleNamespace(id=1, width=8, height=8)
+    texture.get_texture = lambda: texture
+    palette = SimpleNamespace(id=SimpleNamespace(value=2))
+
+    renderer = InstancedRenderer()
+    top = renderer.sprite(texture, layer=2)
+    bottom = renderer.sprite(texture, palette, palette_row=3)
+    assert top._batch is not bottom._batch
+    assert bottom._batch.buffer.get(bottom._id)['palette_row'] == 3
+    assert top._batch.buffer.get(top._id)['palette_row'] == -1
+
+    # batches are drawn from the lowest layer to the highest
+    drawn.clear()
+    renderer.render()
+    assert [batch.layer for batch in drawn] == [0, 2]
+
+    # changing layers moves the record to the batch of the new layer
+    old_batch = top._batch
+    top.layer = 0
+    assert len(old_batch.buffer) == 0
+    assert top._batch.layer == 0
+
+    bottom.palette_row = 1
+    assert bottom._batch.buffer.get(bottom._id)['palette_row'] == 1
@@ -0,0 +1,85 @@
+import time
+
+from pyglet.image import ImageData
+
+from konkyo.asset.loader import AssetLoader
+from konkyo.asset.managers.tileset import TilesetManager
+
+
+def wait(loader: AssetLoader):
+    while loader.pending:
+        loader.update()
+        time.sleep(0.001)
+
+
+def test_loader_resolves_on_update(tmp_path):
+
+    path = str(tmp_path / 'tiles.png')
+    ImageData(32, 16, 'RGBA', bytes(32 * 16 * 4)).save(path)
+
+    loader = AssetLoader(upload=False)
+    loaded = []
+    future = loader.load_tileset(path, 8, callback=loaded.append)
+
+    wait(loader)
+
+    assert future.result().length == 8
+    assert loaded == [future]
+    loader.shutdown()
+
+
+def test_manager_load_async(tmp_path):
+
+    ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4)).save(
+        str(tmp_path / 'tiles.png'))
+
+    loader = AssetLoader(upload=False)
+    manager = TilesetManager(loader=loader)
+    manager._get_path = lambda name: str(tmp_path / '{}.png'.format(name))
+
+    future = manager.load_async('tiles', 8)
+    assert manager.load_async('tiles', 8) is future
+    assert 'tiles' not in manager
+
+    wait(loader)
+
+    assert 'tiles' in manager
+    assert manager.load_async('tiles').result() is future.result()
+    loader.shutdown()
+
+
+def test_manager_load_waits_for_async_load(tmp_path):
+
+    ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4)).save(
+        str(tmp_path / 'tiles.png'))
+
+    loader = AssetLoader(upload=False)
+    manager = TilesetManager(loader=loader)
+    manager._get_path = lambda name: str(tmp_path / '{}.png'.format(name))
+
+    # loading a tileset that is still loading in the background finishes
+    # that load instead of storing the tileset twice
+    future = manager.load_async('tiles', 8)
+    tileset = manager.load('tiles', 8)
+    assert future.result() is tileset
+    assert manager.memory_used == tileset.memory_size
+    assert not loader.pending
+
+    wait(loader)
+    assert manager.load('tiles') is tileset
+    assert manager.memory_used == tileset.memory_size
+    loader.shutdown()
+
+
+def test_loader_reports_errors(tmp_path):
+
+    loader = AssetLoader(upload=False)
+    failed = []
+    future = loader.load_image(str(tmp_path / 'missing.png'),
+                               callback=failed.append)
+
+    wait(loader)
+
+    assert future.exception() is not None
+    assert failed == [future]
+    loader.shutdown()
@@ -0,0 +1,76 @@
+import pytest
+from pyglet.image import ImageData
+
+from konkyo.asset.image import ImageAsset
+from konkyo.components.shapes import Box2D
+from konkyo.components.sprite import AnimatedSprite, Sprite
+from konkyo.game import Game
+from konkyo.objects.entity import Entity
+
+image = ImageAsset(ImageData(4, 4, 'RGBA', bytes(4 * 4 * 4)))
+
+
+class Bullet(Sprite):
+    pooled = True
+
+
+class Ship(Entity):
+    pooled = True
+
+    def on_spawn(self, speed: int):
+        self.speed = speed
+        self.sprite = self.create_component(Bullet, self.position, image)
+
+
+def test_components_are_reused():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+
+    bullet = scene.spawn_component(Bullet, (1, 1), image)
+    pyglet_sprite = bullet._sprite
+    scene.destroy_component(bullet)
+
+    assert bullet not in scene.components
+    assert not bullet.is_visible
+    assert scene.pool.count(Bullet) == 1
+
+    again = scene.spawn_component(Bullet, (5, 6), image, scale=2)
+    assert again is bullet and again._sprite is pyglet_sprite
+    assert again.is_visible and tuple(again.position) == (5, 6)
+    assert again in scene.components
+    assert scene.pool.count(Bullet) == 0
+
+
+def test_entities_are_reused():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+
+    ship = scene.spawn_entity(Ship, (0, 0), 1)
+    sprite = ship.sprite
+    scene.destroy_entity(ship)
+    assert len(scene.pool) == 2
+
+    again = scene.spawn_entity(Ship, (3, 3), 2)
+    assert again is ship and again.speed == 2
+    assert again.sprite is sprite
+    assert tuple(again.sprite.position) == (3, 3)
+    assert scene.component_count == 2 and len(scene.pool) == 0
+
+    scene.destroy_entity(again)
+    scene.pool.clear()
+    assert len(scene.pool) == 0
+
+
+def test_pooled_batch_components_need_hooks():
+
+    # the default hooks would keep a pooled box drawn and leak its vertices
+    with pytest.raises(ValueError):
+        class PooledBox(Box2D):
+            pooled = True
+
+    class PooledAnimation(AnimatedSprite):
+        pooled = True
+
+    assert PooledAnimation.pooled
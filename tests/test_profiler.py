@@ -0,0 +1,91 @@
+import json
+
+from konkyo.game import Game
+from konkyo.objects.entity import Entity
+
+
+class Walker(Entity):
+
+    def on_update(self, delta: float):
+        self.position += (delta, 0)
+
+
+def test_profiler_records_frames_and_classes(tmp_path):
+
+    game = Game(width=100, height=100, headless=True, profile=True)
+    scene = game.create_scene(name='World')
+    for _ in range(10):
+        scene.spawn_entity(Walker, (0, 0))
+
+    profiler = game.profiler
+    for _ in range(20):
+        profiler.begin_frame()
+        game.update_all_scenes(0.1)
+        profiler.end_frame()
+
+    assert profiler.frame_count == 20
+    assert set(profiler.sections) == {'frame', 'update: World'}
+    stats = profiler.stats('update: World')
+    assert 0 < stats['p50'] <= stats['p95'] <= stats['p99'] <= stats['max']
+
+    name = Walker.__module__ + '.Walker'
+    walker = profiler.class_stats()[name]
+    assert walker['calls'] == 10 and walker['mean'] > 0
+    assert 'Walker' in profiler.report()
+
+    path = tmp_path / 'trace.json'
+    profiler.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert len(events) == 20 * 3
+    assert {event['name'] for event in events} == {
+        'frame', 'update: World', name}
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+
+def test_frames_without_a_section_count_as_zero():
+
+    game = Game(width=100, height=100, headless=True, tick_rate=8,
+                profile=True)
+    scene = game.create_scene(name='World')
+    scene.spawn_entity(Walker, (0, 0))
+
+    # a tick every fourth frame, from the fourth frame on
+    profiler = game.profiler
+    for _ in range(12):
+        profiler.begin_frame()
+        game.tick(1 / 32)
+        profiler.end_frame()
+
+    frames = list(profiler._sections['update: World'])
+    assert len(frames) == 9 and frames.count(0) == 6
+    assert profiler.stats('update: World')['p50'] == 0
+    walker = profiler.class_stats()[Walker.__module__ + '.Walker']
+    assert walker['calls'] == 3 / 9
+
+
+class Other:
+
+    class Walker(Walker):
+        pass
+
+
+def test_classes_with_the_same_name_are_kept_apart():
+
+    game = Game(width=100, height=100, headless=True, profile=True)
+    scene = game.create_scene(name='World')
+    scene.spawn_entity(Walker, (0, 0))
+    scene.spawn_entity(Other.Walker, (0, 0))
+
+    game.profiler.begin_frame()
+    game.update_all_scenes(0.1)
+    game.profiler.end_frame()
+
+    module = Walker.__module__
+    assert set(game.profiler.class_stats()) == {
+        module + '.Walker', module + '.Other.Walker'}
+
+
+def test_games_do_not_profile_by_default():
+
+    game = Game(width=100, height=100, headless=True)
+    assert game.profiler is None
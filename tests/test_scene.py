@@ -0,0 +1,137 @@
+import pytest
+
+from konkyo.game import Game
+from konkyo.objects.entity import Entity
+from konkyo.components.shapes import Box2D
+from konkyo.mixins.scriptable import UpdatePhase
+from konkyo.structs.ordered_set import OrderedSet
+
+
+class Bullet(Entity):
+
+    def on_spawn(self):
+        self.box = self.create_component(Box2D, (0, 0), (1, 1))
+
+    def on_update(self, delta: float):
+        self.position += (1, 0)
+
+
+def test_ordered_set():
+
+    items = OrderedSet([3, 1, 2])
+    items.add(1)
+    items.add(0)
+    items.discard(5)
+    items.remove(3)
+    assert list(items) == [1, 2, 0]
+    assert 2 in items and len(items) == 3
+
+    # items can be read by position, like the lists scenes used to have
+    assert (items[0], items[1], items[-1], items[-3]) == (1, 2, 0, 1)
+    assert items[1:] == [2, 0]
+    with pytest.raises(IndexError):
+        items[3]
+
+
+def test_destroy_entities():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    bullets = [scene.spawn_entity(Bullet, (i, 0)) for i in range(10)]
+    count = scene.component_count
+
+    scene.destroy_entity(bullets[0])
+    scene.destroy_entities(bullets[1:5])
+
+    assert list(scene.entities) == bullets[5:]
+    assert list(scene.updatable_objects) == bullets[5:]
+    assert scene.component_count == count - 5 * 2
+    assert bullets[1].box not in scene.components
+
+    scene.destroy_entities(scene.entities)
+    assert not scene.entities and scene.component_count == 0
+
+
+class Spawner(Entity):
+
+    def on_spawn(self):
+        self.spawned = []
+
+    def on_update(self, delta: float):
+        # spawn a bullet and destroy the previous one every tick
+        if self.spawned:
+            self.scene.destroy_entity(self.spawned[-1])
+        self.spawned.append(self.scene.spawn_entity(Bullet, (0, 0)))
+
+
+def test_commands_are_deferred_during_update():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    spawner = scene.spawn_entity(Spawner)
+
+    with scene.deferred():
+        spawner.on_update(0)
+        assert spawner.spawned[0] not in scene.entities
+    scene.flush_commands()
+    assert spawner.spawned[0] in scene.entities
+
+    game.tick(1 / 60)
+    game.tick(1 / 60)
+
+    first, second, third = spawner.spawned
+    assert list(scene.entities) == [spawner, third]
+    assert first.box not in scene.components
+    assert third.box in scene.components
+
+
+def test_updates_are_grouped_by_class():
+
+    assert Bullet.updates and Spawner.updates
+    assert not Entity.updates and not Box2D.updates
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    a = scene.spawn_entity(Bullet, (0, 0))
+    spawner = scene.spawn_entity(Spawner, (0, 0))
+    b = scene.spawn_entity(Bullet, (0, 0))
+    scene.spawn_entity(Entity, (0, 0))
+
+    assert list(scene.updatable_objects) == [a, b, spawner]
+
+    scene.destroy_entity(spawner)
+    assert list(scene.updatable_objects) == [a, b]
+
+
+class Recorder(Entity):
+
+    def on_spawn(self, log, tag, phase=UpdatePhase.UPDATE, priority=0,
+                 group=None):
+        self.log = log
+        self.tag = tag
+        self.update_phase = phase
+        self.update_priority = priority
+        self.update_group = group
+
+    def on_update(self, delta: float):
+        self.log.append(self.tag)
+
+
+def test_update_phases_priorities_and_groups():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    log = []
+    scene.spawn_entity(Recorder, (0, 0), log, 'late', UpdatePhase.LATE_UPDATE)
+    scene.spawn_entity(Recorder, (0, 0), log, 'ai', group='ai')
+    scene.spawn_entity(Recorder, (0, 0), log, 'first', priority=10)
+    scene.spawn_entity(Recorder, (0, 0), log, 'pre', UpdatePhase.PRE_UPDATE)
+
+    game.update_all_scenes(0.1)
+    assert log == ['pre', 'first', 'ai', 'late']
+
+    log.clear()
+    scene.set_group_enabled('ai', False)
+    game.update_all_scenes(0.1)
+    assert log == ['pre', 'first', 'late']
+    assert not scene.is_group_enabled('ai')
@@ -0,0 +1,35 @@
+import konkyo.graphics.shaders as shaders
+import konkyo.components.sprite._shaders as sprite_shaders
+
+
+class FakeShader:
+
+    def __init__(self, source, shader_type):
+        self.source = source
+
+
+class FakeProgram:
+
+    def __init__(self, *shaders):
+        self.shaders = shaders
+
+
+def test_programs_are_shared(monkeypatch):
+
+    # linking needs a GL context, so only the registry itself is tested
+    monkeypatch.setattr(shaders, 'Shader', FakeShader)
+    monkeypatch.setattr(shaders, 'ShaderProgram', FakeProgram)
+    monkeypatch.setattr(shaders, '_shaders', {})
+    monkeypatch.setattr(shaders, '_programs', {})
+    monkeypatch.setattr(sprite_shaders, '_program', None)
+
+    first = shaders.get_program()
+    assert shaders.get_program() is first
+    assert shaders.program_count() == 1
+
+    sprite_program = sprite_shaders.make_program()
+    assert sprite_shaders.make_program() is sprite_program
+    assert shaders.get_program(sprite_shaders.vertex_source,
+                               sprite_shaders.fragment_source) \
+        is sprite_program
+    assert shaders.program_count() == 2
@@ -0,0 +1,66 @@
+import random
+
+from konkyo.game import Game
+from konkyo.objects.entity import Entity
+from konkyo.scene.spatial import SpatialHash
+
+
+def test_queries_match_brute_force():
+
+    rng = random.Random(3)
+    points = {i: (rng.uniform(-500, 500), rng.uniform(-500, 500))
+              for i in range(300)}
+    spatial = SpatialHash(cell_size=40)
+    for i, pos in points.items():
+        spatial.update(i, pos)
+
+    def dist_sq(pos, other):
+        return (pos[0] - other[0]) ** 2 + (pos[1] - other[1]) ** 2
+
+    in_rect = {i for i, (x, y) in points.items()
+               if -100 <= x <= 50 and 0 <= y <= 120}
+    assert set(spatial.query_rect(-100, 0, 50, 120)) == in_rect
+
+    in_radius = {i for i, pos in points.items()
+                 if dist_sq(pos, (30, -20)) <= 90 ** 2}
+    assert set(spatial.query_radius((30, -20), 90)) == in_radius
+
+    for query in [(0, 0), (480, 480), (-2000, 10)]:
+        nearest = min(points, key=lambda i: dist_sq(points[i], query))
+        assert spatial.nearest(query) == nearest
+    assert spatial.nearest(points[7], exclude=7) != 7
+    assert spatial.nearest((5000, 5000), max_distance=100) is None
+
+    spatial.update(7, (1000, 1000))
+    spatial.remove(8)
+    assert spatial.query_radius((1000, 1000), 1) == [7]
+    assert 8 not in spatial and len(spatial) == 299
+
+
+def test_boxes_overlap_several_cells():
+
+    spatial = SpatialHash(cell_size=10)
+    spatial.update('wall', (0, 0), (100, 5))
+
+    assert spatial.query_rect(95, 0, 99, 1) == ['wall']
+    assert spatial.query_radius((50, 10), 5) == ['wall']
+    assert spatial.nearest((50, 30)) == 'wall'
+
+
+def test_scene_tracks_entity_positions():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    near = scene.spawn_entity(Entity, (10, 10))
+    far = scene.spawn_entity(Entity, (500, 500))
+
+    assert scene.spatial.query_radius((0, 0), 20) == [near]
+
+    far.position = (5, 5)
+    scene.resolve_transforms()
+    assert set(scene.spatial.query_radius((0, 0), 20)) == {near, far}
+    assert scene.spatial.nearest((0, 0)) is far
+
+    scene.destroy_entity(near)
+    late = scene.spawn_entity(Entity, (-5, 0))
+    assert set(scene.spatial.query_radius((0, 0), 20)) == {far, late}
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import konkyo.utils.gl as gl
+import konkyo.components.sprite._sprite as sprite_module
+from konkyo.components.sprite._sprite import _SpriteGroup
+from konkyo.graphics import BatchRenderer
+
+
+class FakeImage:
+
+    def __init__(self, texture_id):
+        texture = SimpleNamespace(id=texture_id, target=gl.GL_TEXTURE_2D)
+        self.pyglet_image = SimpleNamespace(get_texture=lambda: texture)
+
+
+def _patch_gl(monkeypatch, calls):
+    # groups make GL calls, which need a context; record them instead
+    for name in ('glBindTexture', 'glTexParameteri', 'glActiveTexture',
+                 'glEnable', 'glDisable'):
+        monkeypatch.setattr(gl, name, lambda *args: None)
+    monkeypatch.setattr(gl, 'glBlendFunc', lambda *args: calls.append(args))
+    program = SimpleNamespace(use_program=lambda: None,
+                              stop_program=lambda: None)
+    monkeypatch.setattr(sprite_module, 'make_program', lambda: program)
+
+
+def test_sprite_groups_are_interned(monkeypatch):
+
+    blend_calls = []
+    _patch_gl(monkeypatch, blend_calls)
+    palette = SimpleNamespace(id=SimpleNamespace(value=7))
+    image = FakeImage(1)
+
+    groups = [_SpriteGroup.get(image, palette) for _ in range(50)]
+    assert all(group is groups[0] for group in groups)
+    assert _SpriteGroup.get(FakeImage(2), palette) is not groups[0]
+
+    additive = _SpriteGroup.get(image, palette, blend_dest=gl.GL_ONE)
+    assert additive is not groups[0]
+
+    groups[0].set_state()
+    additive.set_state()
+    assert blend_calls == [(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA),
+                           (gl.GL_SRC_ALPHA, gl.GL_ONE)]
+
+
+def test_state_changes_are_counted_from_the_draw_list():
+
+    def set_state():
+        pass
+
+    def draw():
+        pass
+
+    # a batch where 50 sprites share one group draws it with one state change
+    batch = SimpleNamespace(draw=lambda: None,
+                            _draw_list=[set_state] + [draw] * 50)
+    renderer = BatchRenderer.__new__(BatchRenderer)
+    renderer.pyglet_batch = batch
+    renderer.instancing = None
+    renderer.state_changes = 0
+    renderer._counted_draw_list = None
+
+    renderer.render()
+    assert renderer.state_changes == 1
+
+    batch._draw_list = [set_state, draw] * 3
+    renderer.render()
+    assert renderer.state_changes == 3
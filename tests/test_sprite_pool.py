@@ -0,0 +1,57 @@
+import pytest
+from pyglet.image import ImageData
+
+from konkyo.asset.image import ImageAsset
+from konkyo.components.sprite import SpritePool
+from konkyo.game import Game
+
+
+def test_sprite_pool_handles():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    image = ImageAsset(ImageData(8, 8, 'RGBA', bytes(8 * 8 * 4)))
+    pool = scene.spawn_component(SpritePool, (0, 0), image, 2)
+
+    a = pool.spawn((1, 2), scale=2)
+    b = pool.spawn((3, 4), color=(1, 0, 0))
+    assert pool.count == 2
+    assert a.position == (1, 2) and a.scale == (2, 2)
+    assert b.color == (1, 0, 0, 1)
+
+    with pytest.raises(IndexError):
+        pool.spawn()
+
+    pool.positions += (10, 0)
+    assert b.position == (13, 4)
+
+    a.release()
+    assert pool.count == 1
+    assert pool.spawn().index == a.index
+
+
+def test_sprite_pool_vertex_layout():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    image = ImageAsset(ImageData(8, 4, 'RGBA', bytes(8 * 4 * 4)))
+    pool = scene.spawn_component(SpritePool, (100, 0), image, 3)
+
+    a = pool.spawn((1, 2), scale=2, color=(1, 0, 0))
+    b = pool.spawn((3, 4))
+    b.visible = False
+    pool.on_pre_render()
+
+    # every sprite is 4 vertices, counter-clockwise from the bottom-left
+    positions = pool._vertex_list.position
+    assert len(positions) == 3 * 4 * 3
+    assert positions[:12] == [101, 2, 0, 117, 2, 0, 117, 10, 0, 101, 10, 0]
+
+    # hidden (and never spawned) sprites collapse into empty quads
+    assert positions[12:24] == [103, 4, 0] * 4
+    assert positions[24:] == [100, 0, 0] * 4
+
+    colors = pool._vertex_list.color
+    assert colors[:16] == [1, 0, 0, 1] * 4
+    assert pool._vertex_list.uv[:8] == [0, 0, 1, 0, 1, 1, 0, 1]
+    assert a.index == 0
@@ -0,0 +1,93 @@
+from pyglet.image import ImageData
+
+from konkyo.asset.tileset import TilesetAsset
+from konkyo.components.tilemap import EMPTY, TileMap
+from konkyo.game import Game
+
+
+def test_tilemap_chunks():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    scene.camera.focus = (50, 50)
+    tileset = TilesetAsset(ImageData(32, 16, 'RGBA', bytes(32 * 16 * 4)), 8)
+
+    tiles = [[(row + column) % 8 for column in range(100)]
+             for row in range(40)]
+    tilemap = scene.spawn_component(TileMap, (0, 0), tileset, tiles,
+                                    chunk_size=4)
+    assert tilemap.chunk_count == (25, 10)
+    assert tileset.ref_count == 1
+
+    # the camera shows (0, 0) to (100, 100), which is 4 chunks of 32 pixels
+    # in each direction
+    tilemap.on_pre_render()
+    assert set(tilemap._chunks) == {(x, y) for x in range(4)
+                                    for y in range(4)}
+
+    tilemap.set_tile(5, 1, EMPTY)
+    assert tilemap._dirty_chunks == {(1, 0)}
+    vertices, uvs = tilemap.build_chunk((1, 0))
+    assert vertices[0, 2, :2].tolist() == [40, 8]
+    assert vertices[5, 2, :2].tolist() == vertices[5, 0, :2].tolist()
+
+    # tile 4 is the first tile of the bottom row of the sheet
+    assert uvs[0].tolist() == [[0, 0], [0.25, 0], [0.25, 0.5], [0, 0.5]]
+
+    scene.camera.focus = (500, 50)
+    tilemap.on_pre_render()
+    assert min(tilemap._chunks) == (14, 0)
+
+    # the changed chunk left the view, so it is rebuilt once shown again
+    assert tilemap._dirty_chunks == {(1, 0)}
+
+    scene.destroy_component(tilemap)
+    assert tileset.ref_count == 0
+
+
+def test_tilemap_reuses_hidden_chunks():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    scene.camera.focus = (50, 50)
+    tileset = TilesetAsset(ImageData(32, 16, 'RGBA', bytes(32 * 16 * 4)), 8)
+    tilemap = scene.spawn_component(TileMap, (0, 0), tileset,
+                                    [[0] * 100] * 40, chunk_size=4,
+                                    cache_size=20)
+
+    written = []
+    write_chunk = tilemap._write_chunk
+    tilemap._write_chunk = lambda key: (written.append(key),
+                                        write_chunk(key))
+
+    tilemap.on_pre_render()
+    assert len(written) == 16
+    chunk = tilemap._chunks[(0, 0)]
+    assert chunk.position[:3] == [0, 0, 0]
+    assert chunk.position[3:5] == [8, 0]
+
+    # chunks out of view are collapsed and kept
+    scene.camera.focus = (500, 50)
+    written.clear()
+    tilemap.on_pre_render()
+    assert len(written) == 16
+    assert tilemap._hidden_chunks[(0, 0)] is chunk
+    assert set(chunk.position) == {0}
+
+    # scrolling back reuses them without rebuilding unchanged chunks
+    tilemap.set_tile(0, 0, EMPTY)
+    scene.camera.focus = (50, 50)
+    written.clear()
+    tilemap.on_pre_render()
+    assert tilemap._chunks[(0, 0)] is chunk
+    assert written == [(0, 0)]
+    assert tilemap._chunks[(1, 0)].position[3:5] == [40, 0]
+
+    # only the most recently hidden chunks are kept
+    assert len(tilemap._hidden_chunks) == 16
+    scene.camera.focus = (300, 50)
+    tilemap.on_pre_render()
+    assert len(tilemap._hidden_chunks) == 20
+    assert set(list(tilemap._hidden_chunks)[4:]) == {
+        (x, y) for x in range(4) for y in range(4)}
+    assert len(tilemap._vertices) == 36
@@ -0,0 +1,48 @@
+import pyglet
+import pytest
+from pyglet.image import ImageData, Texture
+
+from konkyo.asset.tileset import TilesetAsset
+
+
+@pytest.fixture
+def fake_gl(monkeypatch):
+    # tiles are regions of the sheet's texture, which is created without a
+    # context
+    textures = []
+
+    def get_texture(image, *args, **kwargs):
+        textures.append(Texture(image.width, image.height,
+                                pyglet.gl.GL_TEXTURE_2D, 1))
+        return textures[-1]
+
+    monkeypatch.setattr(ImageData, 'get_texture', get_texture)
+    for name in ('glBindTexture', 'glTexParameteri'):
+        monkeypatch.setattr(pyglet.gl, name, lambda *args: None)
+    return textures
+
+
+def test_tiles_are_sliced_lazily(fake_gl):
+
+    tileset = TilesetAsset(ImageData(32, 16, 'RGBA', bytes(32 * 16 * 4)), 8)
+    assert tileset.length == 8
+    assert tileset._tiles == {}
+    assert fake_gl == []
+
+    tile = tileset[4]
+    assert list(tileset._tiles) == [4]
+    assert len(fake_gl) == 1
+
+    # repeated indexing returns the cached tile and region
+    assert tileset[4] is tile
+    assert tileset[-4] is tile
+    assert tileset.get_tile(4).pyglet_image is tile.pyglet_image
+    assert len(fake_gl) == 1
+
+    # tiles are numbered from the top-left, so tile 4 starts the bottom row
+    assert (tile.pyglet_image.x, tile.pyglet_image.y) == (0, 0)
+    assert tile.uv_rect == pytest.approx((0, 0, 0.25, 0.5))
+    assert tileset[3].uv_rect == pytest.approx((0.75, 0.5, 1, 1))
+
+    with pytest.raises(IndexError):
+        tileset[8]
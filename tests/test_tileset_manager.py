@@ -0,0 +1,102 @@
+import pyglet
+import pytest
+from pyglet.image import ImageData, Texture
+
+import konkyo.asset.managers.tileset as manager_module
+from konkyo.asset.managers.tileset import TilesetManager
+from konkyo.asset.tileset import TilesetAsset
+from konkyo.components.sprite import AnimatedSprite
+from konkyo.game import Game
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    # every tileset is a 16x16 sheet using 1 KiB, so two fit in the budget
+    def load(path, size):
+        return TilesetAsset(ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4)),
+                            size)
+
+    monkeypatch.setattr(manager_module, 'TilesetAsset', load)
+    return TilesetManager(max_bytes=2048)
+
+
+def test_least_recently_used_is_unloaded(manager):
+
+    a = manager.load('a')
+    manager.load('b')
+    assert manager.load('a') is a
+    assert manager.memory_used == 2048
+
+    manager.load('c')
+    assert 'b' not in manager
+    assert 'a' in manager and 'c' in manager
+    assert manager.memory_used == 2048
+
+
+def test_referenced_tilesets_are_pinned(manager):
+
+    a = manager.acquire('a')
+    b = manager.acquire('b')
+    manager.load('c')
+
+    # over budget, but only the unreferenced tileset can go
+    assert manager.memory_used == 3072
+    assert 'a' in manager and 'b' in manager and 'c' in manager
+
+    manager.load('d')
+    assert 'c' not in manager
+    assert manager.memory_used == 3072
+
+    manager.release('a')
+    assert 'a' not in manager
+    assert a.manager is None
+    assert b.manager is manager
+    assert manager.memory_used == 2048
+
+
+def test_direct_release_enforces_budget(manager):
+
+    # sprites acquire and release tilesets directly, not by name
+    a = manager.load('a')
+    a.acquire()
+    a.acquire()
+    manager.load('b')
+    manager.load('c')
+    assert 'b' not in manager
+    assert manager.memory_used == 2048
+
+    manager.acquire('c')
+    manager.load('d')
+    assert manager.memory_used == 3072
+
+    a.release()
+    assert 'a' in manager
+    a.release()
+    assert 'a' not in manager
+    assert manager.memory_used == 2048
+
+
+def test_animations_pin_every_frame(manager, monkeypatch):
+
+    # tiles are regions of a texture created without a context
+    monkeypatch.setattr(ImageData, 'get_texture', lambda image: Texture(
+        image.width, image.height, pyglet.gl.GL_TEXTURE_2D, 1))
+    for name in ('glBindTexture', 'glTexParameteri'):
+        monkeypatch.setattr(pyglet.gl, name, lambda *args: None)
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    a = manager.load('a', 8)
+    animation = scene.spawn_component(AnimatedSprite, (0, 0),
+                                      [(a[0], 0.1), (a[1], 0.1)])
+
+    # the frame not shown must not be evicted either
+    assert a.ref_count == 3
+    manager.load('b')
+    manager.load('c')
+    assert 'a' in manager and 'b' not in manager
+
+    scene.destroy_component(animation)
+    assert a.ref_count == 0
+    manager.load('d')
+    assert 'a' not in manager
@@ -0,0 +1,46 @@
+from konkyo.game import Game, _FixedTimestep
+
+
+def test_advance_splits_whole_ticks():
+
+    timestep = _FixedTimestep(tick_rate=4, max_substeps=5)
+
+    assert timestep.advance(0.125) == 0
+    assert timestep.advance(0.1875) == 1
+    assert timestep.alpha == 0.25
+    assert timestep.advance(0.6875) == 3
+    assert timestep.alpha == 0
+
+
+def test_advance_clamps_and_drops_extra_time():
+
+    timestep = _FixedTimestep(tick_rate=10, max_substeps=3)
+
+    assert timestep.advance(1.05) == 3
+    assert abs(timestep.alpha - 0.5) < 1e-9
+
+    # the dropped time is not simulated later
+    assert timestep.advance(0.0) == 0
+
+
+def test_alpha_stays_below_one():
+
+    timestep = _FixedTimestep(tick_rate=60, max_substeps=4)
+    for delta in [0.001, 0.016, 0.017, 0.1, 0.5, 1 / 60, 0.0333]:
+        timestep.advance(delta)
+        assert 0 <= timestep.alpha < 1
+
+
+def test_game_tick_updates_with_fixed_step():
+
+    game = Game(width=100, height=100, headless=True, tick_rate=8)
+    deltas = []
+    game.update_all_scenes = deltas.append
+
+    game.tick(0.3125)
+    assert deltas == [0.125, 0.125]
+    assert game.last_delta == 0.3125
+    assert game.alpha == 0.5
+
+    game.tick(0.0625)
+    assert deltas == [0.125] * 3
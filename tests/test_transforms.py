@@ -0,0 +1,80 @@
+from konkyo.game import Game
+from konkyo.objects.component import Component
+
+
+class Tracked(Component):
+
+    def on_spawn(self):
+        self.changes = 0
+
+    def on_position_change(self):
+        self.changes += 1
+
+
+def test_world_and_local_positions():
+
+    root = Component(pos=(10, 10), name='root')
+    child = root.create_component(Tracked, (15, 10))
+    leaf = child.create_component(Tracked, (15, 20))
+
+    assert tuple(child.local_position) == (5, 0)
+    assert leaf.root is root
+
+    root.position = (0, 0)
+    assert tuple(child.position) == (5, 0)
+    assert tuple(leaf.position) == (5, 10)
+
+    child.local_position = (1, 1)
+    assert tuple(leaf.position) == (1, 11)
+    assert tuple(leaf.local_position) == (0, 10)
+
+
+def test_reparent_keeps_world_position():
+
+    a = Component(pos=(0, 0), name='a')
+    b = Component(pos=(100, 0), name='b')
+    child = a.create_component(Tracked, (5, 5))
+
+    child.parent = b
+    assert child not in a.children and child in b.children
+    assert tuple(child.position) == (5, 5)
+    assert tuple(child.local_position) == (-95, 5)
+    assert child.root is b
+
+
+def test_scene_coalesces_position_changes():
+
+    game = Game(width=100, height=100, headless=True)
+    scene = game.create_scene()
+    root = scene.spawn_component(Tracked, (0, 0))
+    child = root.create_component(Tracked, (0, 0))
+    scene._register_components([child])
+
+    for i in range(5):
+        root.position += (1, 0)
+
+    assert root.changes == child.changes == 0
+    scene.resolve_transforms()
+    assert root.changes == child.changes == 1
+    assert tuple(child.position) == (5, 0)
+
+
+def test_hierarchy_order_is_cached_until_changed():
+
+    root = Component(pos=(0, 0), name='root')
+    a = root.create_component(Tracked, name='a')
+    b = root.create_component(Tracked, name='b')
+    a1 = a.create_component(Tracked, name='a1')
+
+    assert root.flatten() == (root, a, a1, b)
+    assert list(root.iter_breadth_first()) == [root, a, b, a1]
+    assert list(root.iter_depth_first(False)) == [a, a1, b]
+    assert root.flatten() is root.flatten()
+
+    # changing a grandchild invalidates every ancestor's order
+    b1 = b.create_component(Tracked, name='b1')
+    assert root.flatten() == (root, a, a1, b, b1)
+
+    a1.parent = b
+    assert root.flatten() == (root, a, b, b1, a1)
+    assert a.flatten() == (a,)
@@ -1,5 +1,6 @@
+import pytest
 
-from konkyo.structs.vector import Vector
+from konkyo.structs.vector import Vector, VectorArray, Transform
 
 vec = Vector(0, 0)
 
@@ -8,11 +9,76 @@ def test_comparisons():
 
     assert vec == (0, 0)
     assert vec == Vector(0, 0)
+    assert vec != (0, 1)
+    assert vec != (0, 0, 0)
+    assert hash(Vector(1, 2)) == hash((1, 2))
+    assert {Vector(1, 2): 'a'}[(1, 2)] == 'a'
+
+
+def test_construction():
+
+    assert Vector((1, 2)) == Vector.of(1, 2) == Vector(Vector(1, 2))
+    assert Vector(5) == (5, 0)
+    assert tuple(Transform(1, 2, 3, 4)) == (1, 2)
+
+    with pytest.raises(ValueError):
+        Vector('a')
+    with pytest.raises(ValueError):
+        Vector(('a', 1))
+    with pytest.raises(ValueError):
+        Vector(1, 'a')
+
+
+def test_immutable():
+
+    point = Vector(1, 2)
+    with pytest.raises(AttributeError):
+        point.x = 3
+    with pytest.raises(AttributeError):
+        Vector.of(1, 2).y = 3
+    assert point == (1, 2)
+    assert {point: 'a'}[Vector(1, 2)] == 'a'
 
 
 def test_operations():
 
     assert vec + (1, 1) == (1, 1)
     assert vec + Vector(1, 1) == (1, 1)
+    assert (1, 1) + vec == (1, 1)
+    assert (3, 3) - Vector(1, 2) == (2, 1)
 
     assert Vector(1, 1) * 2 == (2, 2)
+    assert 2 * Vector(1, 1) == (2, 2)
+    assert Vector(3, 4) / 2 == (1.5, 2)
+    assert Vector(3, 4) // 2 == (1, 2)
+    assert -Vector(1, -1) == (-1, 1)
+
+
+def test_products():
+
+    assert Vector(3, 4).length == 5
+    assert Vector(1, 2).dot((3, 4)) == 11
+    assert Vector(0.0, 0).is_zero
+    assert Vector(1, 2)[1] == 2
+
+
+def test_vector_array():
+
+    points = VectorArray([(0, 0), (1, 2), (3, 4)])
+    flat = points.flat
+
+    points += (1, 1)
+    points *= 2
+    assert list(flat) == [2, 2, 4, 6, 8, 10]
+    assert points[1] == (4, 6)
+
+    points -= VectorArray([(2, 2), (0, 0), (0, 0)])
+    assert points[0] == (0, 0)
+
+    halfway = points.lerp(Vector(0, 0), 0.5)
+    assert list(halfway) == [(0, 0), (2, 3), (4, 5)]
+    assert (VectorArray([(0.5, 1.2)]).ceil()[0]) == (1, 2)
+
+    points[2] = Vector(7, 7)
+    assert tuple(points.as_ctypes())[4:] == (7, 7)
+    assert len(points[1:]) == 2